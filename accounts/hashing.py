@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import cache
+
+from common.cache import increment
+
+logger = logging.getLogger(__name__)
+
+STATS_KEYS = {
+    "hashed": "password_hashing:hashed",
+    "shed": "password_hashing:shed",
+    "wait_ms": "password_hashing:wait_ms",
+    "hash_ms": "password_hashing:hash_ms",
+}
+
+_gate = None
+_gate_lock = threading.Lock()
+
+
+class PasswordHashingOverloaded(Exception):
+    """Every hashing slot of this process is taken, so the request is shed"""
+
+
+class HashingGate:
+    """
+    Lets at most `concurrency` password hashes run at once, on the request
+    threads themselves. Up to `max_pending` more callers wait for a turn;
+    anyone beyond that is refused at once. Hashing is not moved off the
+    request path: the point is shedding, so an auth storm holds at most
+    concurrency + max_pending request workers and the rest stay free for
+    other pages.
+    """
+
+    def __init__(self, concurrency: int, max_pending: int):
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.running = threading.BoundedSemaphore(concurrency)
+        self.slots = threading.BoundedSemaphore(concurrency + max_pending)
+
+    def run(self, func, *args):
+        if not self.slots.acquire(blocking=False):
+            count({"shed": 1})
+            raise PasswordHashingOverloaded
+        try:
+            queued_at = time.perf_counter()
+            with self.running:
+                started = time.perf_counter()
+                result = func(*args)
+            finished = time.perf_counter()
+        finally:
+            self.slots.release()
+        record(started - queued_at, finished - started)
+        return result
+
+
+def count(deltas: dict[str, int]) -> None:
+    """Add to the shared stats. They are best effort: a cache outage must not fail a login"""
+    try:
+        for name, delta in deltas.items():
+            increment(STATS_KEYS[name], delta)
+    except Exception:
+        logger.warning("Password hashing stats were not recorded", exc_info=True)
+
+
+def record(waited: float, took: float) -> None:
+    count({"hashed": 1, "wait_ms": round(waited * 1000), "hash_ms": round(took * 1000)})
+
+
+def get_gate() -> HashingGate | None:
+    """
+    This process's gate, rebuilt when the settings change. None when
+    PASSWORD_HASHING_CONCURRENCY is 0 and hashing is not limited.
+    """
+    global _gate
+    concurrency, max_pending = settings.PASSWORD_HASHING_CONCURRENCY, settings.PASSWORD_HASHING_MAX_PENDING
+    if not concurrency:
+        return None
+    with _gate_lock:
+        if _gate is None or (_gate.concurrency, _gate.max_pending) != (concurrency, max_pending):
+            _gate = HashingGate(concurrency, max_pending)
+        return _gate
+
+
+def run_hashing(func, *args):
+    gate = get_gate()
+    if gate is None:
+        started = time.perf_counter()
+        result = func(*args)
+        record(0, time.perf_counter() - started)
+        return result
+    return gate.run(func, *args)
+
+
+class LimitedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2PasswordHasher whose key derivation goes through the hashing gate.
+    It keeps the pbkdf2_sha256 algorithm name, so existing hashes verify as
+    before. verify() and harden_runtime() go through encode() too, which
+    covers logins, the dummy hash for unknown emails and password changes.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        return run_hashing(super().encode, password, salt, iterations)
+
+
+def hashing_stats() -> dict:
+    """Hashes run and shed, and mean queue wait and hashing time, across processes"""
+    stats = {name: cache.get(key, 0) for name, key in STATS_KEYS.items()}
+    hashed = stats["hashed"]
+    return {
+        "hashed": hashed,
+        "shed": stats["shed"],
+        "mean_wait_ms": round(stats["wait_ms"] / hashed, 1) if hashed else None,
+        "mean_hash_ms": round(stats["hash_ms"] / hashed, 1) if hashed else None,
+    }
@@ -1,7 +1,24 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import models
 
 
-class CustomUserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        """update() sends no post_save, so the snapshots of the updated users are dropped here"""
+        from .user_cache import SNAPSHOT_FIELDS, forget_snapshots
+
+        # The password is in the snapshot as the session auth hash
+        if not {*SNAPSHOT_FIELDS, "password"}.intersection(kwargs):
+            return super().update(**kwargs)
+        # Read first: the update may change which users the filter selects
+        user_ids = list(self.values_list("pk", flat=True))
+        updated = super().update(**kwargs)
+        forget_snapshots(user_ids)
+        return updated
+
+
+class CustomUserManager(BaseUserManager.from_queryset(UserQuerySet)):
     """
     Custom user model manager where email is the unique identifier
     """
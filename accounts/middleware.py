@@ -0,0 +1,65 @@
+from functools import partial
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+from .hashing import PasswordHashingOverloaded
+from .user_cache import aget_user, get_user
+
+# Forms shown again, with an error, when their password could not be hashed
+OVERLOADED_FORM_TEMPLATES = {
+    "login": "login.html",
+    "register": "register.html",
+    "set_new_password": "set_new_password_using_reset_token.html",
+}
+
+
+async def auser(request):
+    if not hasattr(request, "_acached_user"):
+        request._acached_user = await aget_user(request)
+    return request._acached_user
+
+
+def lazy_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = get_user(request)
+    return request._cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware that resolves request.user from a cached
+    snapshot of the user, so role checks need no query on a warm cache.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: lazy_user(request))
+        request.auser = partial(auser, request)
+
+
+class PasswordHashingOverloadedMiddleware(MiddlewareMixin):
+    """
+    Answer 503 with Retry-After when a view is shed by the password hashing
+    gate, showing its form again where there is one, instead of waiting
+    behind the gate.
+    """
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, PasswordHashingOverloaded):
+            return None
+        message = "We are handling a lot of sign-ins right now. Please try again in a moment."
+        template_name = OVERLOADED_FORM_TEMPLATES.get(getattr(request.resolver_match, "url_name", None))
+        if template_name is None:
+            response = HttpResponse(message, status=503)
+        else:
+            messages.error(request, message)
+            context = {"email": request.POST.get("email", ""), "token": request.POST.get("token", "")}
+            response = render(request, template_name, context, status=503)
+        response["Retry-After"] = str(settings.PASSWORD_HASHING_RETRY_AFTER)
+        return response
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.4 on 2026-10-18 19:03
+
+import hashlib
+from datetime import timedelta
+
+import accounts.models
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+TOKEN_LIFESPAN = timedelta(minutes=20)
+
+
+def hash_outstanding_tokens(apps, schema_editor):
+    """
+    Expired tokens are dropped; the few still valid are hashed so reset
+    links sent before the deploy keep working until they expire.
+    """
+    Token = apps.get_model("accounts", "Token")
+    Token.objects.filter(created_at__lte=timezone.now() - TOKEN_LIFESPAN).delete()
+    Token.objects.update(expires_at=F("created_at") + TOKEN_LIFESPAN)
+    for token in Token.objects.only("pk", "token"):
+        token.token = hashlib.sha256(token.token.encode()).hexdigest()
+        token.save(update_fields=["token"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='token',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, default=accounts.models.token_expiry),
+        ),
+        migrations.RunPython(hash_outstanding_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='token',
+            name='token',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='pendinguser',
+            index=models.Index(fields=['email', 'verification_code'], name='pendinguser_code_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pendinguser',
+            index=models.Index(fields=['created_at'], name='pendinguser_created_idx'),
+        ),
+    ]
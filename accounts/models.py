@@ -1,18 +1,34 @@
+import hashlib
 import uuid
-from datetime import datetime, timezone
+from datetime import timedelta
 
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
+from django.utils import timezone
+from django.utils.crypto import get_random_string
 
 from common.models import BaseModel
 
 from .manager import CustomUserManager
 
 
+TOKEN_LIFESPAN = timedelta(minutes=20)
+PENDING_USER_LIFESPAN = timedelta(minutes=20)
+
+
 class TokenType(models.TextChoices):
     PASSWORD_RESET = ("PASSWORD_RESET", "PASSWORD_RESET")
 
 
+def hash_token(raw_token: str) -> str:
+    """Tokens are stored as digests so a leaked table cannot be used to reset passwords"""
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+def token_expiry():
+    return timezone.now() + TOKEN_LIFESPAN
+
+
 class User(BaseModel, AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(unique=True)
     password = models.CharField(max_length=255)
@@ -32,6 +48,15 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
 
 
 
+class PendingUserQuerySet(models.QuerySet):
+
+    def valid(self):
+        return self.filter(created_at__gt=timezone.now() - PENDING_USER_LIFESPAN)
+
+    def expired(self):
+        return self.filter(created_at__lte=timezone.now() - PENDING_USER_LIFESPAN)
+
+
 class PendingUser(BaseModel):
     email = models.EmailField()
     password = models.CharField(max_length=255)
@@ -39,34 +64,66 @@ class PendingUser(BaseModel):
     created_at = models.DateTimeField(auto_now_add=True)
     role = models.CharField(max_length=20, choices=User.ROLE_CHOICES, null=True, blank=True)  # Add this
 
+    objects = PendingUserQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["email", "verification_code"], name="pendinguser_code_idx"),
+            # purge_expired_tokens deletes the oldest rows
+            models.Index(fields=["created_at"], name="pendinguser_created_idx"),
+        ]
+
     def is_valid(self) -> bool:
-        lifespan_in_seconds = 20 * 60
-        now = datetime.now(timezone.utc)
-        timediff = now - self.created_at
-        timediff = timediff.total_seconds()
-        if timediff > lifespan_in_seconds:
-            return False
-        return True
+        return timezone.now() - self.created_at < PENDING_USER_LIFESPAN
+
+
+class TokenQuerySet(models.QuerySet):
+
+    def valid(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
+
+    def find_valid(self, raw_token: str, token_type: str, email: str):
+        """The unexpired token matching raw_token and email, found through the digest index"""
+        if not raw_token:
+            return None
+        return (
+            self.valid()
+            .filter(token=hash_token(raw_token), token_type=token_type, user__email=email)
+            .select_related("user")
+            .first()
+        )
 
 
 class Token(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    token = models.CharField(max_length=255)
+    # SHA-256 digest of the token sent to the user, see hash_token
+    token = models.CharField(max_length=64, unique=True)
     token_type = models.CharField(max_length=100, choices=TokenType.choices)
     created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(default=token_expiry, db_index=True)
+
+    objects = TokenQuerySet.as_manager()
 
     def __str__(self):
-        return f"{self.user}  {self.token}"
+        return f"{self.user}  {self.token_type}"
+
+    @classmethod
+    def issue(cls, user: User, token_type: str) -> str:
+        """Replace the user's token of this type and return the raw token to send them"""
+        raw_token = get_random_string(32)
+        cls.objects.update_or_create(
+            user=user,
+            token_type=token_type,
+            defaults={"token": hash_token(raw_token), "created_at": timezone.now(), "expires_at": token_expiry()},
+        )
+        return raw_token
 
     def is_valid(self) -> bool:
-        lifespan_in_seconds = 20 * 60  # 20 mins
-        now = datetime.now(timezone.utc)
-        timediff = now - self.created_at
-        timediff = timediff.total_seconds()
-        if timediff > lifespan_in_seconds:
-            return False
-        return True
+        return self.expires_at > timezone.now()
 
     def reset_user_password(self, raw_password: str):
         self.user: User
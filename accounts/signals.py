@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User
+from .user_cache import forget_snapshot
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_snapshot(sender, instance: User, **kwargs):
+    """A password, role or is_active change must reach the next request"""
+    forget_snapshot(instance.pk)
@@ -0,0 +1,26 @@
+import logging
+
+from celery import shared_task
+
+from .models import PendingUser, Token
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def purge_expired_tokens(batch_size: int = 1000) -> int:
+    """
+    Delete expired tokens and pending users, batch_size rows per statement
+    so the purge never holds long locks. Returns the number of rows deleted.
+    """
+    purged = 0
+    for expired in (Token.objects.expired(), PendingUser.objects.expired()):
+        while True:
+            ids = list(expired.values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            purged += expired.model.objects.filter(pk__in=ids).delete()[0]
+
+    if purged:
+        logger.info("Purged %s expired tokens and pending users", purged)
+    return purged
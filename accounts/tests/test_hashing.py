@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, get_hasher, make_password
+from django.contrib.messages import get_messages
+from django.core.cache import caches
+from django.test.client import Client
+from django.urls import reverse
+from redis.exceptions import ConnectionError
+
+from accounts import hashing
+from accounts.hashing import LimitedPBKDF2PasswordHasher, PasswordHashingOverloaded, get_gate, hashing_stats
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def one_slot(settings):
+    """A gate letting one hash run and none wait, whose turn is kept busy"""
+    settings.PASSWORD_HASHING_CONCURRENCY = 1
+    settings.PASSWORD_HASHING_MAX_PENDING = 0
+    release, started = threading.Event(), threading.Event()
+
+    def busy():
+        started.set()
+        release.wait(5)
+
+    holder = threading.Thread(target=get_gate().run, args=(busy,))
+    holder.start()
+    started.wait(5)
+    yield
+    release.set()
+    holder.join()
+
+
+def test_passwords_are_hashed_on_the_request_thread(settings):
+    settings.PASSWORD_HASHING_CONCURRENCY = 2
+    threads = []
+    hasher = get_hasher()
+    encode = super(LimitedPBKDF2PasswordHasher, hasher).encode
+
+    def spy(*args):
+        threads.append(threading.current_thread())
+        return encode(*args)
+
+    encoded = hashing.run_hashing(spy, "secret", hasher.salt(), 1000)
+
+    assert isinstance(hasher, LimitedPBKDF2PasswordHasher)
+    assert threads == [threading.current_thread()]
+    assert encoded.startswith("pbkdf2_sha256$1000$")
+    assert check_password("secret", make_password("secret"))
+    assert hashing_stats()["hashed"] == 3
+
+
+def test_hashing_is_not_limited_without_concurrency(settings):
+    settings.PASSWORD_HASHING_CONCURRENCY = 0
+
+    assert get_gate() is None
+    assert check_password("secret", make_password("secret"))
+    assert hashing_stats()["hashed"] == 2
+
+
+def test_existing_hashes_still_verify():
+    encoded = PBKDF2PasswordHasher().encode("secret", "salt", 1000)
+
+    assert check_password("secret", encoded)
+    assert not check_password("wrong", encoded)
+
+
+@pytest.mark.parametrize("concurrency", [0, 2])
+def test_hashing_works_while_the_cache_is_down(settings, monkeypatch, concurrency):
+    settings.PASSWORD_HASHING_CONCURRENCY = concurrency
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("Redis is down")
+
+    for method in ("incr", "add"):
+        monkeypatch.setattr(caches["default"], method, unavailable)
+
+    assert check_password("secret", make_password("secret"))
+
+
+def test_overflow_is_shed(one_slot):
+    with pytest.raises(PasswordHashingOverloaded):
+        make_password("secret")
+
+    assert hashing_stats()["shed"] == 1
+
+
+def test_login_is_shed_with_503(client: Client, user_instance, one_slot):
+    response = client.post(reverse("login"), {"email": user_instance.email, "password": "abcd"})
+
+    assert response.status_code == 503
+    assert response["Retry-After"] == "5"
+    assert "_auth_user_id" not in client.session
+    messages = list(get_messages(response.wsgi_request))
+    assert "try again in a moment" in str(messages[0])
+
+
+def test_shed_views_without_a_form_get_a_plain_503(client: Client, user_instance, one_slot):
+    user_instance.is_staff = True
+    user_instance.save()
+    client.force_login(user_instance)
+
+    response = client.post(reverse("admin:password_change"), {"old_password": "abcd"})
+
+    assert response.status_code == 503
+    assert response["Retry-After"] == "5"
+
+
+def test_login_through_the_gate(client: Client, user_instance, auth_user_password):
+    response = client.post(reverse("login"), {"email": user_instance.email, "password": auth_user_password})
+
+    assert response.status_code == 302
+    assert client.session["_auth_user_id"] == str(user_instance.pk)
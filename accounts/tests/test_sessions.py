@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.test.client import Client
+from django.urls import reverse
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import ConnectionError
+
+from common.sessions import SessionStore
+from common.tasks import clear_expired_sessions
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def redis_down(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("Redis is down")
+
+    for method in ("get", "set", "delete", "has_key"):
+        monkeypatch.setattr(caches["sessions"], method, unavailable)
+
+
+def test_sessions_are_written_to_redis_and_the_database(authenticate_user_client):
+    client, user = authenticate_user_client
+    session_key = client.cookies["sessionid"].value
+
+    assert get_redis_connection("sessions").exists(f"sessions:1:{SessionStore.cache_key_prefix}{session_key}")
+    assert Session.objects.get(session_key=session_key).get_decoded()["_auth_user_id"] == str(user.pk)
+
+
+def test_sessions_are_read_from_redis(authenticate_user_client):
+    client, _ = authenticate_user_client
+    client.get(reverse("create_advert"))
+    Session.objects.all().delete()
+
+    response = client.get(reverse("create_advert"))
+
+    assert response.wsgi_request.user.is_authenticated
+
+
+def test_database_serves_sessions_while_redis_is_down(authenticate_user_client, redis_down):
+    client, user = authenticate_user_client
+
+    response = client.get(reverse("create_advert"))
+
+    assert response.wsgi_request.user == user
+
+
+def test_login_while_redis_is_down(client: Client, user_instance, auth_user_password, redis_down):
+    client.post(reverse("login"), {"email": user_instance.email, "password": auth_user_password})
+
+    assert Session.objects.get().get_decoded()["_auth_user_id"] == str(user_instance.pk)
+
+
+def test_expired_sessions_are_swept_in_batches(django_assert_num_queries):
+    now = timezone.now()
+    Session.objects.bulk_create(
+        Session(session_key=f"expired{n}", session_data="", expire_date=now - timedelta(minutes=n + 1))
+        for n in range(5)
+    )
+    Session.objects.create(session_key="live", session_data="", expire_date=now + timedelta(days=1))
+
+    # A select and a delete for each of three batches, and a final empty select
+    with django_assert_num_queries(7):
+        assert SessionStore.clear_expired(batch_size=2) == 5
+
+    assert list(Session.objects.values_list("session_key", flat=True)) == ["live"]
+    assert clear_expired_sessions() == 0
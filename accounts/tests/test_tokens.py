@@ -0,0 +1,70 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.test.client import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import PendingUser, Token, TokenType, hash_token
+from accounts.tasks import purge_expired_tokens
+
+pytestmark = pytest.mark.django_db
+
+
+def test_reset_tokens_are_stored_hashed(client: Client, user_instance, settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    client.post(reverse("reset_password_via_email"), {"email": user_instance.email})
+
+    raw_token = re.search(r"token=(\w+)", mail.outbox[0].alternatives[0][0]).group(1)
+    token = Token.objects.get(user=user_instance)
+    assert token.token == hash_token(raw_token) != raw_token
+    assert token.expires_at > timezone.now()
+
+    response = client.get(reverse("verify_password_reset_link"), {"email": user_instance.email, "token": raw_token})
+    assert response.status_code == 200
+
+
+def test_reset_link_is_one_indexed_lookup(client: Client, user_instance, django_assert_num_queries):
+    raw_token = Token.issue(user_instance, TokenType.PASSWORD_RESET)
+    Token.objects.bulk_create(
+        Token(user=user_instance, token=hash_token(f"other-{n}"), token_type=TokenType.PASSWORD_RESET)
+        for n in range(50)
+    )
+
+    with django_assert_num_queries(1):
+        token = Token.objects.find_valid(raw_token, TokenType.PASSWORD_RESET, user_instance.email)
+    assert token.user == user_instance
+
+
+def test_expired_reset_token_is_rejected(client: Client, user_instance):
+    raw_token = Token.issue(user_instance, TokenType.PASSWORD_RESET)
+    Token.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+    response = client.get(reverse("verify_password_reset_link"), {"email": user_instance.email, "token": raw_token})
+    assert response.status_code == 302
+    assert response.url == reverse("reset_password_via_email")
+
+
+def test_reset_token_must_match_the_email(user_instance):
+    raw_token = Token.issue(user_instance, TokenType.PASSWORD_RESET)
+
+    assert Token.objects.find_valid(raw_token, TokenType.PASSWORD_RESET, "someone@example.com") is None
+    assert Token.objects.find_valid("", TokenType.PASSWORD_RESET, user_instance.email) is None
+
+
+def test_purge_expired_tokens(user_instance):
+    Token.issue(user_instance, TokenType.PASSWORD_RESET)
+    Token.objects.bulk_create(
+        Token(user=user_instance, token=hash_token(f"old-{n}"), token_type=TokenType.PASSWORD_RESET,
+              expires_at=timezone.now() - timedelta(minutes=1))
+        for n in range(5)
+    )
+    fresh = PendingUser.objects.create(email="new@example.com", verification_code="1", password="x")
+    stale = PendingUser.objects.create(email="old@example.com", verification_code="2", password="x")
+    PendingUser.objects.filter(pk=stale.pk).update(created_at=timezone.now() - timedelta(hours=1))
+
+    assert purge_expired_tokens(batch_size=2) == 6
+    assert Token.objects.count() == 1
+    assert list(PendingUser.objects.all()) == [fresh]
@@ -0,0 +1,96 @@
+import pytest
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache, caches
+from django.test.client import Client
+from django.urls import reverse
+from redis.exceptions import ConnectionError
+
+from accounts.models import User
+from accounts.user_cache import snapshot_key, store_snapshot, user_from_snapshot
+
+pytestmark = pytest.mark.django_db
+
+
+def test_role_check_needs_no_queries_when_warm(authenticate_user_client, django_assert_num_queries):
+    client, user = authenticate_user_client
+    client.get(reverse("create_advert"))
+
+    with django_assert_num_queries(0):
+        response = client.get(reverse("create_advert"))
+
+    # A user without a role is turned away by employer_required
+    assert response.status_code == 302
+    assert response.wsgi_request.user == user
+
+
+def test_role_change_reaches_the_next_request(authenticate_user_client):
+    client, user = authenticate_user_client
+    assert client.get(reverse("create_advert")).status_code == 302
+
+    user.role = "employer"
+    user.save()
+
+    assert client.get(reverse("create_advert")).status_code == 200
+
+
+def test_password_change_ends_other_sessions(authenticate_user_client):
+    client, user = authenticate_user_client
+    client.get(reverse("create_advert"))
+
+    user.set_password("a new password")
+    user.save()
+
+    response = client.get(reverse("create_advert"))
+    assert not response.wsgi_request.user.is_authenticated
+    assert cache.get(snapshot_key(user.pk)) is None
+
+
+def test_deactivated_user_is_logged_out(employer_client: tuple[Client, User]):
+    client, employer = employer_client
+    assert client.get(reverse("create_advert")).status_code == 200
+
+    employer.is_active = False
+    employer.save()
+
+    assert not client.get(reverse("create_advert")).wsgi_request.user.is_authenticated
+
+
+def test_queryset_updates_reach_the_next_request(employer_client: tuple[Client, User]):
+    client, employer = employer_client
+    assert client.get(reverse("create_advert")).status_code == 200
+
+    User.objects.filter(pk=employer.pk).update(role="jobseeker")
+
+    assert client.get(reverse("create_advert")).status_code == 302
+
+
+def test_users_are_loaded_from_the_database_while_the_cache_is_down(employer_client: tuple[Client, User],
+                                                                  monkeypatch):
+    client, employer = employer_client
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("Redis is down")
+
+    for method in ("get", "set", "delete", "delete_many"):
+        monkeypatch.setattr(caches["default"], method, unavailable)
+
+    response = client.get(reverse("create_advert"))
+
+    assert response.status_code == 200
+    assert response.wsgi_request.user == employer
+    employer.role = "jobseeker"
+    employer.save()
+    assert client.get(reverse("create_advert")).status_code == 302
+
+
+def test_saving_a_snapshot_user_keeps_the_other_fields(user_instance, auth_user_password):
+    store_snapshot(user_instance)
+    user = user_from_snapshot(cache.get(snapshot_key(user_instance.pk)))
+    assert user.get_deferred_fields() >= {"password", "created_at"}
+
+    user.role = "jobseeker"
+    user.save()
+
+    user_instance.refresh_from_db()
+    assert user_instance.role == "jobseeker"
+    assert check_password(auth_user_password, user_instance.password)
@@ -5,7 +5,7 @@ from django.contrib.messages import get_messages
 from django.test.client import Client
 from django.urls import reverse
 from django.contrib.auth import get_user
-from accounts.models import PendingUser, Token, User, TokenType
+from accounts.models import PendingUser, Token, User, TokenType, hash_token
 
 pytestmark = pytest.mark.django_db
 
@@ -126,7 +126,7 @@ def test_set_new_password_using_valid_reset_token(client: Client, user_instance)
     reset_token = Token.objects.create(
         user=user_instance,
         token_type=TokenType.PASSWORD_RESET,
-        token="abcd",
+        token=hash_token("abcd"),
         created_at=datetime.now(timezone.utc),
     )
 
@@ -134,7 +134,7 @@ def test_set_new_password_using_valid_reset_token(client: Client, user_instance)
         "password1": "12345",
         "password2": "12345",
         "email": user_instance.email,
-        "token": reset_token.token,
+        "token": "abcd",
     }
 
     response = client.post(url, request_data)
@@ -156,7 +156,7 @@ def test_set_new_password_using_invalid_reset_token(client: Client, user_instanc
     Token.objects.create(
         user=user_instance,
         token_type=TokenType.PASSWORD_RESET,
-        token="abcd",
+        token=hash_token("abcd"),
         created_at=datetime.now(timezone.utc),
     )
 
@@ -0,0 +1,76 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.cache import cache
+from django.db import router
+from django.utils.crypto import constant_time_compare
+
+from common.cache import FailSafeCache
+
+from .models import User
+
+# A snapshot that cannot be read is a miss: the user is loaded from the database
+snapshots = FailSafeCache(cache, "User snapshot", "loading the user from the database")
+
+# Everything the role decorators, login_required and the templates read
+SNAPSHOT_FIELDS = [
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in {"id", "email", "role", "is_active", "is_staff", "is_superuser"}
+]
+
+
+def snapshot_key(user_id) -> str:
+    return f"user:snapshot:{user_id}"
+
+
+def store_snapshot(user: User) -> None:
+    snapshot = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+    snapshot["session_auth_hash"] = user.get_session_auth_hash()
+    snapshots.set(snapshot_key(user.pk), snapshot, settings.USER_SNAPSHOT_TIMEOUT)
+
+
+def forget_snapshot(user_id) -> None:
+    snapshots.delete(snapshot_key(user_id))
+
+
+def forget_snapshots(user_ids) -> None:
+    snapshots.delete_many([snapshot_key(user_id) for user_id in user_ids])
+
+
+def user_from_snapshot(snapshot: dict) -> User:
+    """
+    A User with only the snapshot fields loaded. The other fields are
+    deferred: reading one loads it, and save() only writes loaded fields.
+    """
+    values = [snapshot[field] for field in SNAPSHOT_FIELDS]
+    return User.from_db(router.db_for_read(User), SNAPSHOT_FIELDS, values)
+
+
+def cached_user(request) -> User | None:
+    """
+    The session's user from its snapshot, or None when there is no snapshot
+    or the session no longer matches it; auth.get_user() then decides.
+    """
+    user_id = request.session.get(SESSION_KEY)
+    if user_id is None or request.session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+        return None
+    snapshot = snapshots.get(snapshot_key(user_id))
+    if snapshot is None or not constant_time_compare(request.session.get(HASH_SESSION_KEY, ""),
+                                                     snapshot["session_auth_hash"]):
+        return None
+    return user_from_snapshot(snapshot)
+
+
+def get_user(request):
+    """auth.get_user() that skips the user query on a warm cache"""
+    user = cached_user(request)
+    if user is None:
+        user = auth.get_user(request)
+        if user.is_authenticated:
+            store_snapshot(user)
+    return user
+
+
+async def aget_user(request):
+    return await sync_to_async(get_user)(request)
@@ -1,11 +1,9 @@
-from datetime import datetime, timezone
-
 from django.contrib import auth, messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from django.http import HttpRequest
 from django.shortcuts import redirect, render
-from django.utils.crypto import get_random_string
 
 from common.tasks import send_email
 
@@ -86,9 +84,9 @@ def verify_account(request):
         verification_code = request.POST.get("verification_code", "")
         email = request.POST.get("email", "").lower()
 
-        pending_user = PendingUser.objects.filter(verification_code=verification_code, email=email).first()
+        pending_user = PendingUser.objects.valid().filter(verification_code=verification_code, email=email).first()
 
-        if pending_user and pending_user.is_valid():
+        if pending_user:
             with transaction.atomic():
                 user = User.objects.create(
                     email=pending_user.email,
@@ -116,16 +114,9 @@ def send_password_reset_link(request: HttpRequest):
         user = get_user_model().objects.filter(email=email.lower()).first()
 
         if user:
-            token, _ = Token.objects.update_or_create(
-                user=user,
-                token_type=TokenType.PASSWORD_RESET,
-                defaults={
-                    "token": get_random_string(20),
-                    "created_at": datetime.now(timezone.utc),
-                },
-            )
+            raw_token = Token.issue(user, TokenType.PASSWORD_RESET)
 
-            email_data = {"email": email.lower(), "token": token.token}
+            email_data = {"email": email.lower(), "token": raw_token}
             send_email.delay(
                 "Your Password Reset Link",
                 [email],
@@ -147,11 +138,9 @@ def verify_password_reset_link(request: HttpRequest):
     email = request.GET.get("email")
     reset_token = request.GET.get("token")
 
-    token: Token = Token.objects.filter(
-        user__email=email, token=reset_token, token_type=TokenType.PASSWORD_RESET
-    ).first()
+    token: Token = Token.objects.find_valid(reset_token, TokenType.PASSWORD_RESET, email)
 
-    if not token or not token.is_valid():
+    if not token:
         messages.error(request, "Invalid or expired reset link.")
         return redirect("reset_password_via_email")
 
@@ -179,11 +168,9 @@ def set_new_password_using_reset_link(request: HttpRequest):
                 {"email": email, "token": reset_token},
             )
 
-        token: Token = Token.objects.filter(
-            token=reset_token, token_type=TokenType.PASSWORD_RESET, user__email=email
-        ).first()
+        token: Token = Token.objects.find_valid(reset_token, TokenType.PASSWORD_RESET, email)
 
-        if not token or not token.is_valid():
+        if not token:
             messages.error(request, "Expired or Invalid reset link")
             return redirect("reset_password_via_email")
 
@@ -0,0 +1,119 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .listing_cache import bump_generation
+from .models import ArchivedJobAdvert, ArchivedJobApplication, JobAdvert, JobApplication
+
+ARCHIVE_BATCH_SIZE = 100
+ARCHIVE_COPY_CHUNK_SIZE = 1000
+
+ADVERT_FIELDS = [field.attname for field in ArchivedJobAdvert._meta.concrete_fields if field.name != "archived_at"]
+APPLICATION_FIELDS = [field.attname for field in ArchivedJobApplication._meta.concrete_fields]
+
+
+def archive_cutoff():
+    """Adverts whose deadline is before this date are archived"""
+    return timezone.now().date() - timedelta(days=settings.ARCHIVE_RETENTION_DAYS)
+
+
+def delete_rows(model, field_name: str, values) -> int:
+    """
+    Delete the rows of model whose field_name is in values with a single
+    DELETE, without the delete collector or signals. The rows live on in the
+    archive tables, so their CV references must not be released, and their
+    dependent rows are deleted beforehand, see dependents.
+    """
+    field = model._meta.get_field(field_name)
+    quote_name = connection.ops.quote_name
+    placeholders = ", ".join(["%s"] * len(values))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote_name(model._meta.db_table)} WHERE {quote_name(field.column)} IN ({placeholders})",
+            [field.get_db_prep_value(value, connection) for value in values],
+        )
+        return cursor.rowcount
+
+
+def dependents(model, lookup: str = "pk", archived=(JobApplication,)) -> dict:
+    """
+    The lookups leading to model's primary key from every model whose rows
+    cascade from the rows of model, by dependent model. Models in archived
+    are moved to the archive tables by the caller, so their own dependents
+    are listed instead of them. Derived from the models' relations, so a new
+    foreign key is covered without changes here.
+    """
+    found = defaultdict(list)
+    for relation in model._meta.related_objects:
+        if relation.many_to_many:
+            # Covered by the foreign key of its through model, listed on its own
+            continue
+        if relation.on_delete is not models.CASCADE:
+            raise TypeError(f"Archiving cannot honour {relation.on_delete.__name__} on {relation.field}")
+        path = f"{relation.field.name}__{lookup}"
+        if relation.related_model in archived:
+            for dependent, lookups in dependents(relation.related_model, path, archived).items():
+                found[dependent].extend(lookups)
+        else:
+            found[relation.related_model].append(path)
+    return found
+
+
+def copy_applications(advert_ids) -> int:
+    applications = JobApplication.objects.filter(job_advert_id__in=advert_ids).order_by().values(*APPLICATION_FIELDS)
+    archived, total = [], 0
+    for row in applications.iterator(chunk_size=ARCHIVE_COPY_CHUNK_SIZE):
+        archived.append(ArchivedJobApplication(**row))
+        if len(archived) >= ARCHIVE_COPY_CHUNK_SIZE:
+            total += len(ArchivedJobApplication.objects.bulk_create(archived))
+            archived = []
+    return total + len(ArchivedJobApplication.objects.bulk_create(archived))
+
+
+def archive_batch(cutoff, batch_size: int = ARCHIVE_BATCH_SIZE) -> tuple[int, int]:
+    """
+    Move the oldest batch of adverts expired before cutoff, and their
+    applications, into the archive tables in one transaction. Returns the
+    number of adverts and applications archived.
+    """
+    with transaction.atomic():
+        adverts = list(
+            JobAdvert.objects.filter(deadline__lt=cutoff).order_by("deadline")
+            .select_for_update().values(*ADVERT_FIELDS)[:batch_size]
+        )
+        if not adverts:
+            return 0, 0
+        advert_ids = [advert["id"] for advert in adverts]
+
+        ArchivedJobAdvert.objects.bulk_create(ArchivedJobAdvert(**advert) for advert in adverts)
+        applications = copy_applications(advert_ids)
+
+        for dependent, lookups in dependents(JobAdvert).items():
+            rows = Q(*[(f"{lookup}__in", advert_ids) for lookup in lookups], _connector=Q.OR)
+            dependent.objects.filter(rows).delete()
+        delete_rows(JobApplication, "job_advert", advert_ids)
+        delete_rows(JobAdvert, "id", advert_ids)
+    return len(advert_ids), applications
+
+
+def archive_expired_adverts(batch_size: int = ARCHIVE_BATCH_SIZE) -> tuple[int, int]:
+    """
+    Archive every advert expired for longer than ARCHIVE_RETENTION_DAYS, one
+    short transaction per batch so live traffic is never blocked for long.
+    """
+    cutoff = archive_cutoff()
+    adverts = applications = 0
+    while True:
+        archived_adverts, archived_applications = archive_batch(cutoff, batch_size)
+        if not archived_adverts:
+            break
+        adverts += archived_adverts
+        applications += archived_applications
+
+    if adverts:
+        bump_generation()
+    return adverts, applications
@@ -0,0 +1,174 @@
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from common.cache import increment
+
+from .enums import CVExtractionStatus
+from .models import ApplicantTerm, CVDocument, JobApplication
+from .search import tokenize
+
+try:
+    from pypdf import PdfReader
+    from pypdf.errors import PdfReadError
+except ImportError:  # PDF extraction is optional
+    PdfReader = None
+    PdfReadError = ValueError
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MAX_TERMS = 2000
+WORKERS_KEY = "cv_extraction:workers"
+
+
+class UnsupportedDocument(Exception):
+    pass
+
+
+def extract_docx(path: str) -> str:
+    paragraphs = []
+    with zipfile.ZipFile(path) as archive:
+        with archive.open("word/document.xml") as document:
+            parts = []
+            for _, element in ElementTree.iterparse(document):
+                if element.tag == f"{WORD_NAMESPACE}t" and element.text:
+                    parts.append(element.text)
+                elif element.tag == f"{WORD_NAMESPACE}p":
+                    paragraphs.append("".join(parts))
+                    parts = []
+                    element.clear()
+    return "\n".join(paragraphs)
+
+
+def extract_pdf(path: str) -> str:
+    if PdfReader is None:
+        raise UnsupportedDocument("Install pypdf to extract text from PDF CVs")
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+EXTRACTORS = {
+    ".docx": extract_docx,
+    ".pdf": extract_pdf,
+}
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cv_terms(text: str) -> list[str]:
+    return list(dict.fromkeys(tokenize(text)))[:MAX_TERMS]
+
+
+def extract_cv(path: str) -> tuple[str, list[str]]:
+    """
+    Return the normalized text of a CV and its distinct terms. Only reads the
+    file, so it is safe to run in a pool worker process.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        raise UnsupportedDocument(f"Cannot extract text from {extension or 'extensionless'} files")
+
+    try:
+        text = normalize_text(extractor(path))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError, PdfReadError) as error:
+        raise UnsupportedDocument(f"Unreadable document: {error}") from error
+    return text, cv_terms(text)
+
+
+def store_cv_text(application: JobApplication, text: str = "", terms=(), error: str = "") -> CVDocument:
+    """Save the extracted text of a CV and replace the application's terms"""
+    with transaction.atomic():
+        document, _ = CVDocument.objects.update_or_create(
+            application_id=application.pk,
+            defaults={
+                "status": CVExtractionStatus.FAILED if error else CVExtractionStatus.DONE,
+                "text": text,
+                "error": error[:255],
+                "extracted_at": timezone.now(),
+            },
+        )
+        ApplicantTerm.objects.filter(application_id=application.pk).delete()
+        ApplicantTerm.objects.bulk_create(
+            [ApplicantTerm(job_advert_id=application.job_advert_id, application_id=application.pk, term=term)
+             for term in terms],
+            batch_size=500,
+        )
+    return document
+
+
+def extracted_documents(cv_name: str):
+    """Documents extracted from a stored file, found through jobapplication_cv_idx"""
+    return CVDocument.objects.filter(application__cv=cv_name, status=CVExtractionStatus.DONE)
+
+
+def find_extracted_text(cv_name: str) -> str | None:
+    """
+    Text already extracted from the same file for another application. CVs
+    are stored content-addressed, so resubmitting a CV is free.
+    """
+    return extracted_documents(cv_name).values_list("text", flat=True).first()
+
+
+def extract_application_cv(application: JobApplication) -> CVDocument | None:
+    if not application.cv.name:
+        return None
+
+    text = find_extracted_text(application.cv.name)
+    if text is not None:
+        return store_cv_text(application, text, cv_terms(text))
+
+    try:
+        text, terms = extract_cv(application.cv.path)
+    except (UnsupportedDocument, OSError) as error:
+        return store_cv_text(application, error=str(error))
+    return store_cv_text(application, text, terms)
+
+
+def filter_applicants(advert, applications, keyword: str | None):
+    """
+    Narrow an advert's applications to those whose CV contains every term of
+    keyword. Applications whose CV has not been extracted yet never match.
+    """
+    terms = list(dict.fromkeys(tokenize(keyword)))
+    if not terms:
+        return applications
+
+    matching = (
+        ApplicantTerm.objects.filter(job_advert=advert, term__in=terms)
+        .values("application_id")
+        .annotate(matched=Count("term"))
+        .filter(matched=len(terms))
+        .values("application_id")
+    )
+    return applications.filter(pk__in=matching)
+
+
+def record_throughput(worker: str, documents: int, seconds: float) -> None:
+    workers = cache.get(WORKERS_KEY, [])
+    if worker not in workers:
+        cache.set(WORKERS_KEY, [*workers, worker], timeout=None)
+    increment(f"cv_extraction:{worker}:documents", documents)
+    increment(f"cv_extraction:{worker}:ms", round(seconds * 1000))
+
+
+def extraction_stats() -> list[dict]:
+    """Documents extracted and documents/sec of busy time, per worker"""
+    stats = []
+    for worker in cache.get(WORKERS_KEY, []):
+        documents = cache.get(f"cv_extraction:{worker}:documents", 0)
+        seconds = cache.get(f"cv_extraction:{worker}:ms", 0) / 1000
+        stats.append({
+            "worker": worker,
+            "documents": documents,
+            "seconds": round(seconds, 3),
+            "documents_per_second": round(documents / seconds, 2) if seconds else None,
+        })
+    return stats
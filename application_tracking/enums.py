@@ -24,4 +24,10 @@ LocationTypeChoice = [
 class ApplicationStatus(models.TextChoices):
     APPLIED = ("APPLIED", "APPLIED")
     REJECTED = ("REJECTED", "REJECTED")
-    INTERVIEW = ("INTERVIEW", "INTERVIEW")
\ No newline at end of file
+    INTERVIEW = ("INTERVIEW", "INTERVIEW")
+
+
+class CVExtractionStatus(models.TextChoices):
+    PENDING = ("PENDING", "PENDING")
+    DONE = ("DONE", "DONE")
+    FAILED = ("FAILED", "FAILED")
@@ -0,0 +1,75 @@
+import csv
+import json
+
+from django.db.models import Q
+
+from .models import JobAdvert, JobApplication
+
+EXPORT_FIELDS = ["id", "name", "email", "portfolio_url", "cv", "status", "created_at"]
+EXPORT_CHUNK_SIZE = 2000
+
+# Spreadsheets run cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller"""
+
+    def write(self, value):
+        return value
+
+
+def iter_applications(advert: JobAdvert, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Yield lists of an advert's applications as dicts, newest first. Each
+    chunk is a keyset query on the (job_advert, created_at, id) index, so
+    only one chunk is held in memory whatever the driver does with cursors.
+    """
+    applications = JobApplication.objects.filter(job_advert=advert).order_by("-created_at", "-pk")
+    last = None
+    while True:
+        chunk = applications
+        if last is not None:
+            chunk = chunk.filter(
+                Q(created_at__lte=last["created_at"]),
+                Q(created_at__lt=last["created_at"]) | Q(pk__lt=last["id"]),
+            )
+        rows = list(chunk.values(*EXPORT_FIELDS)[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        last = rows[-1]
+
+
+def csv_cell(value):
+    """Quote applicant-supplied text with ' so a spreadsheet shows it instead of evaluating it"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def export_csv(chunks):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for rows in chunks:
+        yield "".join(
+            writer.writerow([row["created_at"].isoformat() if field == "created_at" else csv_cell(row[field])
+                             for field in EXPORT_FIELDS])
+            for row in rows
+        )
+
+
+def export_ndjson(chunks):
+    for rows in chunks:
+        yield "".join(json.dumps(row, default=str) + "\n" for row in rows)
+
+
+EXPORTERS = {
+    "csv": export_csv,
+    "ndjson": export_ndjson,
+}
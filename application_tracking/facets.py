@@ -0,0 +1,137 @@
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import Count
+from django.urls import reverse
+from django.utils import timezone
+
+from .enums import EmploymentType, ExperienceLevel, LocationTypeChoice
+from .listing_cache import aget_generation, listings, make_digest, normalize
+from .models import JobAdvert
+from .skills import adverts_with_skill, normalize_skill
+
+# Choice fields a listing can be narrowed by; several values of one field are OR-ed
+FACET_FIELDS = {
+    "employment_type": ("Employment type", EmploymentType),
+    "experience_level": ("Experience level", ExperienceLevel),
+    "job_type": ("Job type", LocationTypeChoice),
+}
+# Grouped on together with the choice fields; filtered with the location box
+GROUP_FIELDS = [*FACET_FIELDS, "location"]
+LOCATION_FACET_SIZE = 10
+# Skills are AND-ed: an advert has to list every selected one
+MAX_SKILL_FILTERS = 5
+
+
+def facet_filters(query) -> dict[str, list[str]]:
+    """The known facet values selected in a QueryDict, sorted so equal selections compare equal"""
+    filters = {}
+    for field, (_, choices) in FACET_FIELDS.items():
+        values = sorted(set(query.getlist(field)) & {value for value, _ in choices})
+        if values:
+            filters[field] = values
+    skills = sorted({normalize_skill(name) for name in query.getlist("skill")} - {""})
+    if skills:
+        filters["skill"] = skills[:MAX_SKILL_FILTERS]
+    return filters
+
+
+def filter_adverts(queryset, filters: dict, prefix: str = ""):
+    for field, values in filters.items():
+        if field == "skill":
+            for name in values:
+                queryset = queryset.filter(**{f"{prefix}pk__in": adverts_with_skill(name)})
+        else:
+            queryset = queryset.filter(**{f"{prefix}{field}__in": values})
+    return queryset
+
+
+def facet_query(filters: dict) -> str:
+    return urlencode([(field, value) for field, values in filters.items() for value in values])
+
+
+def facet_cache_key(generation: int, keyword, location, skills=()) -> str:
+    digest = make_digest([normalize(keyword), normalize(location), *skills])
+    return f"facets:{generation}:{timezone.now().date().isoformat()}:{digest}"
+
+
+async def afacet_rows(keyword, location, skills=()) -> list[tuple]:
+    """
+    (employment_type, experience_level, job_type, location, adverts) for
+    every combination among the adverts matching keyword, location and
+    skills, from one grouped query. The choice filters are applied to these
+    rows in Python, so every selection of them shares one cache entry.
+    """
+    generation = await aget_generation()
+    key = facet_cache_key(generation, keyword, location, skills) if generation is not None else None
+    rows = await listings.aget(key) if key else None
+    if rows is None:
+        grouped = (
+            filter_adverts(JobAdvert.objects.matching(keyword, location), {"skill": skills})
+            .order_by().values_list(*GROUP_FIELDS).annotate(adverts=Count("id"))
+        )
+        rows = [row async for row in grouped]
+        if key:
+            await listings.aset(key, rows, getattr(settings, "LISTING_CACHE_TIMEOUT", 5 * 60))
+    return rows
+
+
+def count_facets(rows: list[tuple], filters: dict) -> dict[str, Counter]:
+    """
+    Advert counts per value of each facet field. A field's counts apply the
+    other fields' filters but not its own, so they show what selecting one
+    more value would add.
+    """
+    counts = {field: Counter() for field in GROUP_FIELDS}
+    for row in rows:
+        misses = [field for index, field in enumerate(GROUP_FIELDS)
+                  if field in filters and row[index] not in filters[field]]
+        for index, field in enumerate(GROUP_FIELDS):
+            if not misses or misses == [field]:
+                counts[field][row[index]] += row[-1]
+    return counts
+
+
+async def abuild_facets(request, keyword, location, filters: dict) -> list[dict]:
+    """Facets for the template, each value with its count and a URL that toggles it"""
+    skills = filters.get("skill", [])
+    rows = await afacet_rows(keyword, location, skills)
+    counts = count_facets(rows, filters)
+    facets = []
+    for field, (label, choices) in FACET_FIELDS.items():
+        selected = filters.get(field, [])
+        values = [
+            facet_value(request, field, value, counts[field][value], value in selected, display)
+            for value, display in choices
+            if counts[field][value] or value in selected
+        ]
+        facets.append({"field": field, "label": label, "values": values})
+
+    locations = [(value, count) for value, count in counts["location"].most_common() if value]
+    values = [
+        facet_value(request, "location", value, count, normalize(value) == normalize(location), value)
+        for value, count in locations[:LOCATION_FACET_SIZE]
+    ]
+    facets.append({"field": "location", "label": "Location", "values": values})
+
+    # Only selected skills are listed, as links that drop them again
+    total = sum(counts["location"].values())
+    values = [facet_value(request, "skill", name, total, True, name) for name in skills]
+    facets.append({"field": "skill", "label": "Skills", "values": values})
+    return facets
+
+
+def facet_value(request, field: str, value: str, count: int, selected: bool, display: str) -> dict:
+    query = request.GET.copy()
+    query.pop("page", None)
+    query.pop("cursor", None)
+    if field == "location":
+        query.pop("location", None)
+        if not selected:
+            query["location"] = value
+    else:
+        same = normalize_skill if field == "skill" else str
+        values = [other for other in query.getlist(field) if same(other) != value]
+        query.setlist(field, values if selected else [*values, value])
+    return {"value": display, "count": count, "selected": selected, "url": f"{reverse('search')}?{query.urlencode()}"}
@@ -1,5 +1,9 @@
+import uuid
+
 from django.forms import ModelForm
+from .enums import ApplicationStatus
 from .models import JobAdvert, JobApplication
+from .skills import parse_skills
 from django import forms
 
 
@@ -33,6 +37,14 @@ class JobAdvertForm(ModelForm):
 
         }
 
+    def clean_skills(self):
+        # Stored lowercase and deduplicated; aliases are resolved when the
+        # advert is linked to its Skill rows
+        skills = parse_skills(self.cleaned_data["skills"])
+        if not skills:
+            raise forms.ValidationError("Enter at least one skill.")
+        return ", ".join(skills)
+
 
 class JobApplicationForm(ModelForm):
     class Meta:
@@ -50,3 +62,34 @@ class JobApplicationForm(ModelForm):
             "portfolio_url": forms.URLInput(attrs={"placeholder": "Portfolio link", "class":"form-control"}),
             "cv": forms.FileInput(attrs={"placeholder": "Select your cv", "class":"form-control", "accept":".pdf, .docx, .doc"}),
         }
+
+
+class BulkDecisionForm(forms.Form):
+    status = forms.ChoiceField(
+        choices=[choice for choice in ApplicationStatus.choices if choice[0] != ApplicationStatus.APPLIED]
+    )
+    all_applied = forms.BooleanField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        try:
+            cleaned_data["applications"] = [uuid.UUID(value) for value in self.data.getlist("applications")]
+        except ValueError:
+            raise forms.ValidationError("Invalid application selected.")
+        if not cleaned_data["applications"] and not cleaned_data.get("all_applied"):
+            raise forms.ValidationError("Select at least one application.")
+        return cleaned_data
+
+
+class AdvertImportUploadForm(forms.Form):
+    file = forms.FileField(widget=forms.FileInput(attrs={"class": "form-control", "accept": ".csv, .json"}))
+
+    def clean_file(self):
+        from .imports import InvalidImportFile, detect_format
+
+        upload = self.cleaned_data["file"]
+        try:
+            detect_format(upload.name)
+        except InvalidImportFile as error:
+            raise forms.ValidationError(str(error))
+        return upload
@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+
+from django.db import IntegrityError, transaction
+
+from accounts.models import User
+
+from .forms import JobAdvertForm
+from .listing_cache import bump_generation
+from .models import JobAdvert
+from .search import get_search_backend
+from .skills import sync_advert_skills
+
+IMPORT_FORMATS = ("csv", "json")
+IMPORT_BATCH_SIZE = 500
+
+
+class InvalidImportFile(ValueError):
+    pass
+
+
+class JobAdvertImportForm(JobAdvertForm):
+    """
+    JobAdvertForm for one imported row. Uniqueness is checked for a whole
+    batch with a single query instead of one query per row.
+    """
+
+    def validate_unique(self):
+        pass
+
+
+def detect_format(filename: str) -> str:
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension not in IMPORT_FORMATS:
+        raise InvalidImportFile(f"Unsupported file type .{extension}; upload a .csv or .json file.")
+    return extension
+
+
+def read_rows(content: bytes, import_format: str) -> list[dict]:
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError as error:
+        raise InvalidImportFile("The file must be UTF-8 encoded.") from error
+    if import_format == "csv":
+        return list(csv.DictReader(io.StringIO(text)))
+    try:
+        rows = json.loads(text)
+    except json.JSONDecodeError as error:
+        raise InvalidImportFile(f"Invalid JSON: {error}") from error
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise InvalidImportFile("A JSON feed must be a list of adverts.")
+    return rows
+
+
+def import_adverts(rows: list[dict], owner: User, batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+    """
+    Validate rows with the JobAdvertForm rules and insert the valid ones in
+    batches. Invalid rows are reported by their 1-based position and never
+    abort the rest of the import.
+    """
+    report = {"total": len(rows), "created": 0, "errors": []}
+    seen_descriptions = set()
+    for start in range(0, len(rows), batch_size):
+        adverts = []
+        for number, row in enumerate(rows[start:start + batch_size], start=start + 1):
+            form = JobAdvertImportForm({"is_published": True, **row})
+            if not form.is_valid():
+                report["errors"].append({"row": number, "errors": form.errors.get_json_data()})
+                continue
+            advert = form.save(commit=False)
+            advert.created_by = owner
+            adverts.append((number, advert))
+
+        adverts = drop_duplicate_descriptions(adverts, seen_descriptions, report)
+        created = insert_adverts(adverts, report)
+        report["created"] += len(created)
+        get_search_backend().index_many(created)
+        sync_advert_skills(created, created=True)
+        if created:
+            match_created_adverts([str(advert.pk) for advert in created])
+
+    if report["created"]:
+        bump_generation()
+    report["errors"].sort(key=lambda error: error["row"])
+    return report
+
+
+def match_created_adverts(advert_ids: list[str]) -> None:
+    from .tasks import match_saved_searches
+
+    transaction.on_commit(lambda: match_saved_searches.delay(advert_ids))
+
+
+def description_error(advert: JobAdvert) -> dict:
+    error = advert.unique_error_message(JobAdvert, ["description"])
+    return {"description": [{"message": str(error.message % error.params), "code": "unique"}]}
+
+
+def drop_duplicate_descriptions(adverts, seen_descriptions: set, report: dict) -> list:
+    existing = set(
+        JobAdvert.objects.filter(description__in=[advert.description for _, advert in adverts])
+        .values_list("description", flat=True)
+    )
+    unique = []
+    for number, advert in adverts:
+        if advert.description in existing or advert.description in seen_descriptions:
+            report["errors"].append({"row": number, "errors": description_error(advert)})
+            continue
+        seen_descriptions.add(advert.description)
+        unique.append((number, advert))
+    return unique
+
+
+def insert_adverts(adverts, report: dict) -> list[JobAdvert]:
+    try:
+        with transaction.atomic():
+            return JobAdvert.objects.bulk_create([advert for _, advert in adverts])
+    except IntegrityError:
+        pass
+
+    # A concurrent import took a description between the check and the
+    # insert; fall back to one savepoint per row to find the conflicts.
+    created = []
+    for number, advert in adverts:
+        try:
+            with transaction.atomic():
+                JobAdvert.objects.bulk_create([advert])
+        except IntegrityError:
+            report["errors"].append({"row": number, "errors": description_error(advert)})
+        else:
+            created.append(advert)
+    return created
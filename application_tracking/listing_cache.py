@@ -0,0 +1,129 @@
+import hashlib
+import inspect
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from common.cache import FailSafeCache
+from common.pagination import apaginate
+
+GENERATION_KEY = "listing:generation"
+HITS_KEY = "listing:stats:hits"
+MISSES_KEY = "listing:stats:misses"
+
+# While the cache is down, listings are rendered from the database every time
+listings = FailSafeCache(cache, "Listing", "rendering without the cache")
+
+
+def normalize(value: str | None) -> str:
+    return " ".join((value or "").lower().split())
+
+
+def get_generation() -> int | None:
+    """The current generation, or None while the cache is unavailable"""
+    return listings.get_or_set(GENERATION_KEY, 1, None)
+
+
+async def aget_generation() -> int | None:
+    return await listings.aget_or_set(GENERATION_KEY, 1, None)
+
+
+def bump_generation() -> int | None:
+    """
+    Invalidate every cached listing page. A no-op while the cache is down,
+    so pages cached before an outage may be served until they expire.
+    """
+    return listings.increment(GENERATION_KEY)
+
+
+def listing_cache_key(keyword, location, page, facets: str = "") -> str | None:
+    """
+    Key for one listing page, or None while the cache is unavailable. It
+    embeds the generation counter, bumped when adverts change, and today's
+    date, because active() drops adverts whose deadline passed at the date
+    rollover.
+    """
+    generation = get_generation()
+    if generation is None:
+        return None
+    return make_listing_key(generation, keyword, location, page, facets)
+
+
+async def alisting_cache_key(keyword, location, page, facets: str = "") -> str | None:
+    generation = await aget_generation()
+    if generation is None:
+        return None
+    return make_listing_key(generation, keyword, location, page, facets)
+
+
+def make_digest(parts: list[str]) -> str:
+    return hashlib.md5("|".join(parts).encode()).hexdigest()
+
+
+def make_listing_key(generation: int, keyword, location, page, facets: str = "") -> str:
+    digest = make_digest([normalize(keyword), normalize(location), normalize(page), facets])
+    return f"listing:{generation}:{timezone.now().date().isoformat()}:{digest}"
+
+
+def page_token(request) -> str:
+    """The part of the query string that selects a page, normalized"""
+    if getattr(settings, "PAGINATION_MODE", "offset") == "cursor":
+        return f"cursor:{request.GET.get('cursor') or ''}"
+    try:
+        return f"page:{max(int(request.GET.get('page', 1)), 1)}"
+    except ValueError:
+        return "page:1"
+
+
+async def arender_listing(request, get_adverts, keyword=None, location=None, facets: str = "") -> tuple[str, object]:
+    """
+    Return the rendered advert list for the requested page and, on a cache
+    miss, the page object it was rendered from (None on a hit). The markup
+    does not depend on who is looking, so every visitor shares it.
+    get_adverts may return an awaitable; the page's rows are fetched with
+    the async ORM before rendering. facets is the encoded facet selection,
+    kept in the pagination links.
+    """
+    key = await alisting_cache_key(keyword, location, page_token(request), facets)
+    listing_html = await listings.aget(key) if key else None
+    if listing_html is not None:
+        await listings.aincrement(HITS_KEY)
+        return mark_safe(listing_html), None
+
+    if key:
+        await listings.aincrement(MISSES_KEY)
+    adverts = get_adverts()
+    if inspect.isawaitable(adverts):
+        adverts = await adverts
+    paginated_adverts = await apaginate(request, adverts, 10)
+    context = {"job_adverts": paginated_adverts, "facet_query": facets}
+    listing_html = render_to_string("job_listing.html", context, request=request)
+    if key:
+        await listings.aset(key, listing_html, getattr(settings, "LISTING_CACHE_TIMEOUT", 5 * 60))
+    return listing_html, paginated_adverts
+
+
+def listing_cache_stats() -> dict:
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        "generation": get_generation(),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else None,
+        "evictions": redis_evictions(),
+    }
+
+
+def redis_evictions() -> int | None:
+    """Keys Redis evicted under memory pressure, or None when the cache is not Redis"""
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default").info("stats").get("evicted_keys")
+    except (ImportError, NotImplementedError):
+        return None
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from application_tracking.archive import ARCHIVE_BATCH_SIZE, archive_expired_adverts
+from application_tracking.models import ArchivedJobAdvert, ArchivedJobApplication, JobAdvert, JobApplication
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive adverts past their deadline plus ARCHIVE_RETENTION_DAYS, with "
+        "their applications, and report the size of the hot and archive tables. "
+        "The archive_expired_adverts task does the same every day."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        adverts, applications = archive_expired_adverts(options["batch_size"])
+        self.stdout.write(
+            f"Archived {adverts} adverts and {applications} applications in {time.perf_counter() - started:.1f}s"
+        )
+        for model in (JobAdvert, JobApplication, ArchivedJobAdvert, ArchivedJobApplication):
+            self.stdout.write(f"{model.__name__:<24} {model.objects.count():>10} rows")
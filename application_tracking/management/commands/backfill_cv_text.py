@@ -0,0 +1,96 @@
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+
+from application_tracking.cv_text import (UnsupportedDocument, cv_terms, extract_cv, record_throughput,
+                                          store_cv_text)
+from application_tracking.enums import CVExtractionStatus
+from application_tracking.models import CVDocument, JobApplication
+
+
+def extract_in_worker(path: str):
+    """Runs in a pool process; returns (text, terms, error, pid, seconds)"""
+    started = time.perf_counter()
+    try:
+        text, terms = extract_cv(path)
+    except (UnsupportedDocument, OSError) as error:
+        return "", [], str(error), os.getpid(), time.perf_counter() - started
+    return text, terms, "", os.getpid(), time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract the text of CVs that have not been processed yet. Parsing runs "
+        "in a process pool while this process writes the results, and the "
+        "throughput of every pool worker is reported at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--all", action="store_true", help="Re-extract CVs that were already processed")
+
+    def handle(self, *args, **options):
+        documents = defaultdict(int)
+        busy_seconds = defaultdict(float)
+        failed = 0
+        started = time.perf_counter()
+
+        # The pool workers only parse files, but they import the app modules,
+        # so Django must be set up there as well when processes are spawned.
+        with ProcessPoolExecutor(max_workers=options["workers"], initializer=django.setup) as pool:
+            last_id = None
+            while True:
+                batch = JobApplication.objects.exclude(cv="").order_by("pk").only("pk", "job_advert_id", "cv")
+                if not options["all"]:
+                    batch = batch.filter(cv_document__isnull=True)
+                if last_id is not None:
+                    batch = batch.filter(pk__gt=last_id)
+                batch = list(batch[:options["batch_size"]])
+                if not batch:
+                    break
+                last_id = batch[-1].pk
+
+                # Identical CVs share one content-addressed file; parse each
+                # file once and reuse text extracted in earlier batches
+                extracted = dict(
+                    CVDocument.objects.filter(
+                        application__cv__in={application.cv.name for application in batch},
+                        status=CVExtractionStatus.DONE,
+                    ).values_list("application__cv", "text")
+                )
+                paths = list(dict.fromkeys(
+                    application.cv.path for application in batch if application.cv.name not in extracted
+                ))
+                results = dict(zip(paths, pool.map(extract_in_worker, paths)))
+
+                for path, (_, _, error, pid, seconds) in results.items():
+                    documents[pid] += 1
+                    busy_seconds[pid] += seconds
+                    failed += bool(error)
+
+                for application in batch:
+                    if application.cv.name in extracted:
+                        text = extracted[application.cv.name]
+                        store_cv_text(application, text, cv_terms(text))
+                        continue
+                    text, terms, error, _, _ = results[application.cv.path]
+                    store_cv_text(application, text, terms, error)
+
+        elapsed = time.perf_counter() - started
+        for pid in sorted(documents):
+            record_throughput(f"backfill@{pid}", documents[pid], busy_seconds[pid])
+            rate = documents[pid] / busy_seconds[pid] if busy_seconds[pid] else 0
+            self.stdout.write(f"worker {pid:<8} {documents[pid]:>6} documents {rate:>9.1f} docs/sec")
+
+        total = sum(documents.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Extracted {total} CVs ({failed} failed) in {elapsed:.1f}s, "
+                f"{total / elapsed if elapsed else 0:.1f} docs/sec overall."
+            )
+        )
@@ -0,0 +1,106 @@
+import asyncio
+import random
+import urllib.request
+from collections import Counter
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from django.urls import reverse
+
+from common.benchmark import save_results, summarize
+
+from . import benchmark_servers
+from .benchmark_servers import SERVERS, fetch, free_port, run_load, running_server
+
+
+def csrf_token(port: int) -> str:
+    """The CSRF cookie the login form hands out; one token serves every POST"""
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{reverse('login')}", headers={"Host": "localhost"})
+    with urllib.request.urlopen(request) as response:
+        cookies = SimpleCookie("; ".join(response.headers.get_all("Set-Cookie")))
+    return cookies["csrftoken"].value
+
+
+async def during_storm(load, port: int, token: str, clients: int, pause: float) -> tuple[dict, dict]:
+    """
+    Await the page load while clients keep posting logins with wrong
+    passwords for unknown emails, each still a full PBKDF2 run. Returns the
+    page summary and the login summary with a count per status code.
+    """
+    headers = {"Cookie": f"csrftoken={token}", "Content-Type": "application/x-www-form-urlencoded"}
+    stop = asyncio.Event()
+    statuses, durations = Counter(), []
+
+    async def client(number: int):
+        attempt = 0
+        while not stop.is_set():
+            attempt += 1
+            body = urlencode({"csrfmiddlewaretoken": token, "email": f"storm-{number}-{attempt}@example.com",
+                              "password": "wrong password"}).encode()
+            try:
+                status, duration = await fetch(port, reverse("login"), method="POST", headers=headers, body=body)
+            except OSError:
+                statuses["error"] += 1
+                continue
+            statuses[status] += 1
+            durations.append(duration)
+            await asyncio.sleep(pause)
+
+    storm = [asyncio.create_task(client(number)) for number in range(clients)]
+    try:
+        pages = await load
+    finally:
+        stop.set()
+        await asyncio.gather(*storm)
+
+    logins = summarize(durations) if durations else {"runs": 0}
+    logins["statuses"] = {str(status): count for status, count in sorted(statuses.items(), key=str)}
+    return pages, logins
+
+
+class Command(benchmark_servers.Command):
+    help = (
+        "Measure page latency on one threaded WSGI worker before and during a "
+        "storm of failing logins, once per PASSWORD_HASHING_CONCURRENCY value "
+        "(0 does not limit hashing). Uses the current settings and "
+        "database; run it against a database filled with generate_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hashing-concurrency", nargs="+", type=int, default=[0, 1],
+                            help="PASSWORD_HASHING_CONCURRENCY values to compare")
+        parser.add_argument("--max-pending", type=int, default=2, help="PASSWORD_HASHING_MAX_PENDING")
+        parser.add_argument("--threads", type=int, default=8, help="Threads of the WSGI worker")
+        parser.add_argument("--storm-clients", type=int, default=16, help="Clients posting logins at once")
+        parser.add_argument("--storm-pause-ms", type=float, default=50,
+                            help="Pause of each storm client between its logins")
+        parser.add_argument("--concurrency", type=int, default=4, help="Clients requesting pages at once")
+        parser.add_argument("--requests", type=int, default=200, help="Page requests per phase")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--save", metavar="PATH", help="Write the results to a JSON file")
+
+    def handle(self, *args, **options):
+        paths = self.request_paths(random.Random(options["seed"]))
+        results = {}
+        for concurrency in options["hashing_concurrency"]:
+            port = free_port()
+            command = [part.format(port=port, threads=options["threads"], worker_class="gthread")
+                       for part in SERVERS["wsgi"]]
+            env = {"PASSWORD_HASHING_CONCURRENCY": str(concurrency), "PASSWORD_HASHING_MAX_PENDING": str(options["max_pending"])}
+            with running_server(command, port, env):
+                asyncio.run(run_load(port, paths, options["concurrency"], 50, options["seed"]))  # warm up
+                calm = asyncio.run(run_load(port, paths, options["concurrency"], options["requests"], options["seed"]))
+                pages, logins = asyncio.run(during_storm(
+                    run_load(port, paths, options["concurrency"], options["requests"], options["seed"]),
+                    port, csrf_token(port), options["storm_clients"], options["storm_pause_ms"] / 1000,
+                ))
+            results[concurrency] = {"calm": calm, "storm": pages, "logins": logins}
+            self.stdout.write(
+                f"hashing_concurrency={concurrency:<2} pages calm p50={calm['p50_ms']:>8}ms p95={calm['p95_ms']:>8}ms | "
+                f"storm p50={pages['p50_ms']:>8}ms p95={pages['p95_ms']:>8}ms failures={pages['failures']} | "
+                f"logins {logins['statuses']} p95={logins.get('p95_ms', '-')}ms"
+            )
+
+        if options["save"]:
+            save_results(options["save"], results)
+            self.stdout.write(f"Saved results to {options['save']}")
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from application_tracking.models import JobAdvert
+from common.benchmark import summarize, time_calls
+from common.pagination import CursorPaginator
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare offset and cursor pagination latency from the first to the deepest "
+        "page of the active advert listing. Rows are created inside a transaction "
+        "that is rolled back; run it against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--per-page", type=int, default=10)
+        parser.add_argument("--pages", nargs="+", type=int, default=[1, 10, 100, 1000, 10_000])
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        per_page, pages, repeat = options["per_page"], options["pages"], options["repeat"]
+        size = max(pages) * per_page
+
+        with transaction.atomic():
+            self.populate(size)
+            adverts = JobAdvert.objects.active()
+            cursor_paginator = CursorPaginator(adverts, per_page)
+
+            self.stdout.write(f"{size} active adverts, {per_page} per page, {repeat} runs per page")
+            for number in pages:
+                offset = Paginator(adverts, per_page)
+                offset_summary = summarize(
+                    time_calls(lambda: list(offset.get_page(number).object_list), repeat)
+                )
+
+                cursor = None
+                if number > 1:
+                    # The cursor a visitor would hold after reading the previous page
+                    boundary = adverts.order_by("-created_at", "-pk")[(number - 1) * per_page - 1]
+                    cursor = cursor_paginator.encode_cursor(CursorPaginator.NEXT, boundary)
+                cursor_summary = summarize(
+                    time_calls(lambda: list(cursor_paginator.get_page(cursor)), repeat)
+                )
+
+                self.stdout.write(
+                    f"  page {number:>6}  offset p50={offset_summary['p50_ms']}ms "
+                    f"p95={offset_summary['p95_ms']}ms  cursor p50={cursor_summary['p50_ms']}ms "
+                    f"p95={cursor_summary['p95_ms']}ms"
+                )
+
+            transaction.set_rollback(True)
+
+    def populate(self, size: int, batch_size: int = 5000):
+        owner = User.objects.create(email=f"benchmark-{timezone.now().timestamp()}@example.com",
+                                    role="employer")
+        deadline = timezone.now().date() + timedelta(days=30)
+        first_created_at = timezone.now() - timedelta(seconds=size)
+
+        for start in range(0, size, batch_size):
+            adverts = [
+                JobAdvert(
+                    title=f"Advert {n}",
+                    company_name="Benchmark Ltd",
+                    employment_type="Full Time",
+                    experience_level="Mid Level",
+                    job_type="Remote",
+                    description=f"Benchmark advert {n}",
+                    skills="python",
+                    deadline=deadline,
+                    created_by=owner,
+                )
+                for n in range(start, min(size, start + batch_size))
+            ]
+            JobAdvert.objects.bulk_create(adverts)
+
+            # auto_now_add stamps a whole batch with one instant; spread the
+            # rows out so the (created_at, id) ordering looks like real traffic
+            for n, advert in enumerate(adverts, start=start):
+                advert.created_at = first_created_at + timedelta(seconds=n)
+            JobAdvert.objects.bulk_update(adverts, ["created_at"], batch_size=500)
+
@@ -0,0 +1,67 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from application_tracking.models import JobAdvert
+from application_tracking.recommendations import AdvertMatrix
+from common.benchmark import summarize, time_calls
+
+from .benchmark_search import SKILLS
+from .benchmark_search import Command as SearchBenchmark
+from .benchmark_skill_filter import RARE_SKILLS
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure building the recommendation matrix, scoring a profile against "
+        "every open advert and refreshing it after advert changes. Rows are "
+        "created inside a transaction that is rolled back; run it against a "
+        "scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=[100_000])
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--changes", type=int, default=100, help="Adverts changed before the refresh")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        for size in options["sizes"]:
+            self.run_benchmark(size, options["queries"], options["changes"], options["seed"])
+
+    def run_benchmark(self, size: int, total_queries: int, changes: int, seed: int):
+        rng = random.Random(seed)
+        with transaction.atomic(), override_settings(RECOMMENDATIONS_REFRESH_INTERVAL=0):
+            SearchBenchmark().populate(size, rng, pick_skills=lambda: rng.sample(SKILLS, 2) + rng.sample(RARE_SKILLS, 2))
+            # As if posted long ago, so the refresh below reads only the changes
+            JobAdvert.objects.update(updated_at=timezone.now() - timedelta(days=1))
+            self.stdout.write(f"\n{size} adverts")
+
+            matrix = AdvertMatrix()
+            started = time.perf_counter()
+            matrix.refresh()
+            self.stdout.write(f"  build        {round((time.perf_counter() - started) * 1000, 3)}ms, "
+                              f"{len(matrix.columns)} features")
+
+            features = sorted(matrix.columns, key=str)
+            today = timezone.now().date()
+
+            def recommend():
+                profile = {feature: 1.0 for feature in rng.sample(features, 5)}
+                matrix.top(profile, 10, today)
+
+            self.stdout.write(f"  top-10       {summarize(time_calls(recommend, total_queries))}")
+
+            changed = list(JobAdvert.objects.order_by("?").values_list("pk", flat=True)[:changes])
+            JobAdvert.objects.filter(pk__in=changed).update(title="Staff Engineer", updated_at=timezone.now())
+            started = time.perf_counter()
+            matrix.refresh()
+            self.stdout.write(f"  refresh      {round((time.perf_counter() - started) * 1000, 3)}ms "
+                              f"after {changes} changes")
+
+            transaction.set_rollback(True)
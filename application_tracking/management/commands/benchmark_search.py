@@ -0,0 +1,90 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from application_tracking.models import JobAdvert
+from application_tracking.search import DatabaseSearchBackend, InvertedIndexSearchBackend
+from application_tracking.skills import sync_advert_skills
+from common.benchmark import summarize, time_calls
+
+TITLES = ["Backend", "Frontend", "Data", "Platform", "Mobile", "Security", "QA", "DevOps"]
+ROLES = ["Engineer", "Developer", "Analyst", "Architect", "Lead", "Manager"]
+SKILLS = ["python", "django", "react", "java", "kotlin", "sql", "aws", "docker",
+          "kubernetes", "golang", "rust", "typescript", "spark", "terraform"]
+WORDS = ["build", "scale", "team", "product", "customers", "remote", "growth",
+         "payments", "search", "platform", "reliable", "services", "mentor"]
+LOCATIONS = ["Lagos", "London", "Berlin", "Pune", "Toronto", None]
+# Long tail of rarer terms so posting lists have realistic, uneven lengths
+TOOLS = [f"{prefix}{suffix}" for prefix in ("data", "cloud", "web", "api", "ml", "infra", "edge", "graph")
+         for suffix in ("ops", "flow", "base", "kit", "lab", "stack", "mesh", "grid")]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare keyword search latency of the icontains ORM path and the inverted "
+        "index. Rows are created inside a transaction that is rolled back; run it "
+        "against a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+        parser.add_argument("--queries", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        for size in options["sizes"]:
+            self.run_benchmark(size, options["queries"], options["seed"])
+
+    def run_benchmark(self, size: int, total_queries: int, seed: int):
+        rng = random.Random(seed)
+        with transaction.atomic():
+            self.populate(size, rng)
+            InvertedIndexSearchBackend().rebuild()
+
+            keywords = [rng.choice(SKILLS + WORDS + TOOLS) for _ in range(total_queries)]
+            self.stdout.write(f"\n{size} adverts, {total_queries} keyword searches (count + first page)")
+
+            for name, backend in (
+                ("orm", DatabaseSearchBackend()),
+                ("inverted-index", InvertedIndexSearchBackend()),
+            ):
+                queries = iter(keywords)
+
+                def first_page():
+                    page = Paginator(backend.search(next(queries), None), 10).get_page(1)
+                    list(page.object_list)
+
+                summary = summarize(time_calls(first_page, total_queries))
+                self.stdout.write(f"  {name:<15} {summary}")
+
+            transaction.set_rollback(True)
+
+    def populate(self, size: int, rng: random.Random, batch_size: int = 5000, pick_skills=None):
+        pick_skills = pick_skills or (lambda: rng.sample(SKILLS, 3))
+        owner = User.objects.create(email=f"benchmark-{rng.random()}@example.com", role="employer")
+        deadline = timezone.now().date() + timedelta(days=30)
+
+        for start in range(0, size, batch_size):
+            adverts = []
+            for n in range(start, min(size, start + batch_size)):
+                adverts.append(
+                    JobAdvert(
+                        title=f"{rng.choice(TITLES)} {rng.choice(ROLES)}",
+                        company_name=f"Company {rng.randrange(5000)}",
+                        employment_type="Full Time",
+                        experience_level="Mid Level",
+                        job_type="Remote",
+                        location=rng.choice(LOCATIONS),
+                        description=f"{' '.join(rng.sample(WORDS, 4) + rng.sample(TOOLS, 3))} #{n}",
+                        skills=", ".join(pick_skills()),
+                        deadline=deadline,
+                        created_by=owner,
+                    )
+                )
+            JobAdvert.objects.bulk_create(adverts)
+            sync_advert_skills(adverts, created=True)
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from application_tracking.models import JobAdvert
+from common.benchmark import save_results, summarize
+
+from .benchmark_search import SKILLS, WORDS
+
+# One worker process each, so the comparison is per worker. The WSGI worker
+# is gunicorn's default sync worker, or a threaded one with --threads.
+SERVERS = {
+    "wsgi": [sys.executable, "-m", "gunicorn", "talent_base.wsgi:application", "--workers", "1",
+             "--worker-class", "{worker_class}", "--threads", "{threads}", "--bind", "127.0.0.1:{port}"],
+    "asgi": [sys.executable, "-m", "uvicorn", "talent_base.asgi:application", "--workers", "1",
+             "--host", "127.0.0.1", "--port", "{port}", "--no-access-log"],
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(server: subprocess.Popen, port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise CommandError(f"Server exited before accepting connections:\n{server.stderr.read()}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"Server did not accept connections on port {port} within {timeout}s")
+
+
+@contextmanager
+def running_server(command: list[str], port: int, env: dict | None = None):
+    """Run a server with the current settings and database until the block exits"""
+    server = subprocess.Popen(command, cwd=settings.BASE_DIR, env={**os.environ, **(env or {})},
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    try:
+        wait_for(server, port)
+        yield server
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+async def fetch(port: int, path: str, client_delay: float = 0, method: str = "GET",
+                headers: dict | None = None, body: bytes = b"") -> tuple[int, float]:
+    """
+    Request path on a fresh connection; returns the status code and latency
+    in ms. A client_delay in seconds between the request line and the
+    headers stands in for clients on slow networks.
+    """
+    headers = {"Host": "localhost", "Connection": "close", **(headers or {})}
+    if body:
+        headers["Content-Length"] = str(len(body))
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(f"{method} {path} HTTP/1.1\r\n".encode())
+        if client_delay:
+            await writer.drain()
+            await asyncio.sleep(client_delay)
+        writer.write("".join(f"{name}: {value}\r\n" for name, value in headers.items()).encode() + b"\r\n" + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return int(status_line.split()[1]), (time.perf_counter() - start) * 1000
+
+
+async def run_load(port: int, paths: list[str], concurrency: int, total: int, seed: int,
+                   client_delay: float = 0) -> dict:
+    """Send total requests from concurrency clients at once and summarize them"""
+    rng = random.Random(seed)
+    planned = [rng.choice(paths) for _ in range(total)]
+    durations, failures = [], 0
+
+    async def client():
+        nonlocal failures
+        while planned:
+            path = planned.pop()
+            try:
+                status, duration = await fetch(port, path, client_delay)
+            except OSError:
+                failures += 1
+                continue
+            if status != 200:
+                failures += 1
+            durations.append(duration)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(durations) if durations else {"runs": 0}
+    summary["requests_per_second"] = round(len(durations) / elapsed, 1)
+    summary["failures"] = failures
+    return summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare one WSGI worker (gunicorn) with one ASGI worker "
+        "(uvicorn) serving the read-heavy views at rising concurrency. Both "
+        "servers use the current settings and database; run it against a "
+        "database filled with generate_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--servers", nargs="+", choices=SERVERS, default=list(SERVERS))
+        parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 10, 50, 100])
+        parser.add_argument("--requests", type=int, default=500, help="Requests per concurrency level")
+        parser.add_argument("--threads", type=int, default=1,
+                            help="Threads of the WSGI worker; more than 1 uses gunicorn's gthread worker")
+        parser.add_argument("--client-delay-ms", type=float, default=0,
+                            help="Pause clients this long mid-request, like clients on slow networks")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--save", metavar="PATH", help="Write the results to a JSON file")
+
+    def handle(self, *args, **options):
+        paths = self.request_paths(random.Random(options["seed"]))
+        results = {}
+        for name in options["servers"]:
+            port = free_port()
+            worker_class = "gthread" if options["threads"] > 1 else "sync"
+            command = [part.format(port=port, threads=options["threads"], worker_class=worker_class)
+                       for part in SERVERS[name]]
+            with running_server(command, port):
+                asyncio.run(run_load(port, paths, 5, 50, options["seed"]))  # warm up
+                results[name] = {}
+                for concurrency in options["concurrency"]:
+                    summary = asyncio.run(run_load(port, paths, concurrency, options["requests"], options["seed"],
+                                                   options["client_delay_ms"] / 1000))
+                    results[name][concurrency] = summary
+                    self.stdout.write(
+                        f"{name:<5} c={concurrency:<4} {summary['requests_per_second']:>8} req/s "
+                        f"p50={summary.get('p50_ms', '-'):>9}ms p95={summary.get('p95_ms', '-'):>9}ms "
+                        f"failures={summary['failures']}"
+                    )
+
+        if options["save"]:
+            save_results(options["save"], results)
+            self.stdout.write(f"Saved results to {options['save']}")
+
+    def request_paths(self, rng: random.Random) -> list[str]:
+        """A read mix of listing pages, keyword searches and advert pages"""
+        advert_ids = list(JobAdvert.objects.active().values_list("pk", flat=True)[:200])
+        if not advert_ids:
+            raise CommandError("No active adverts to request; fill the database with generate_data first.")
+
+        paths = [f"{reverse('home')}?page={page}" for page in range(1, 6)]
+        paths += [f"{reverse('search')}?keyword={keyword}" for keyword in rng.sample(SKILLS + WORDS, 10)]
+        paths += [reverse("job_advert", kwargs={"advert_id": advert_id}) for advert_id in advert_ids]
+        return paths
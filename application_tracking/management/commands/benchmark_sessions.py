@@ -0,0 +1,83 @@
+import itertools
+import random
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from common.benchmark import save_results, summarize, time_calls
+from common.query_budget import QueryRecorder
+
+ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "redis": "common.sessions",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the session cost of one request, reading a logged-in session "
+        "and reading then saving it, per session engine. Rows are created in a "
+        "transaction that is rolled back; cached engines use the "
+        "SESSION_CACHE_ALIAS cache of the current settings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+        parser.add_argument("--sessions", type=int, default=1000, help="Sessions to create per engine")
+        parser.add_argument("--repeat", type=int, default=500)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--save", metavar="PATH", help="Write the results to a JSON file")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['sessions']} sessions on {connection.vendor}, cache "
+            f"{settings.CACHES[settings.SESSION_CACHE_ALIAS]['BACKEND']}, {options['repeat']} runs"
+        )
+        results = {}
+        with transaction.atomic():
+            for name in options["engines"]:
+                store_class = import_module(ENGINES[name]).SessionStore
+                keys = self.create_sessions(store_class, options["sessions"])
+                rng = random.Random(options["seed"])
+                counter = itertools.count()
+
+                def read():
+                    store_class(rng.choice(keys)).get("_auth_user_id")
+
+                def write():
+                    store = store_class(rng.choice(keys))
+                    store.get("_auth_user_id")
+                    store["last_seen"] = next(counter)
+                    store.save()
+
+                results[name] = {}
+                for operation, func in (("read", read), ("write", write)):
+                    func()  # warm up
+                    with QueryRecorder() as recorder:
+                        summary = summarize(time_calls(func, options["repeat"]))
+                    summary["queries_per_request"] = round(len(recorder) / options["repeat"], 2)
+                    results[name][operation] = summary
+                    self.stdout.write(
+                        f"{name:<10} {operation:<6} p50={summary['p50_ms']:>8}ms p95={summary['p95_ms']:>8}ms "
+                        f"queries/request={summary['queries_per_request']}"
+                    )
+
+                for key in keys:
+                    store_class().delete(key)
+            transaction.set_rollback(True)
+
+        if options["save"]:
+            save_results(options["save"], results)
+            self.stdout.write(f"Saved results to {options['save']}")
+
+    def create_sessions(self, store_class, count: int) -> list[str]:
+        keys = []
+        for number in range(count):
+            store = store_class()
+            store.update({"_auth_user_id": str(number), "_auth_user_backend": settings.AUTHENTICATION_BACKENDS[0]})
+            store.save()
+            keys.append(store.session_key)
+        return keys
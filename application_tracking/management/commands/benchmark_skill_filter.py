@@ -0,0 +1,57 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import transaction
+
+from application_tracking.facets import filter_adverts
+from application_tracking.models import JobAdvert
+from common.benchmark import summarize, time_calls
+
+from .benchmark_search import SKILLS
+from .benchmark_search import Command as SearchBenchmark
+
+# Every advert lists two common skills and two of a long tail, like real adverts
+RARE_SKILLS = [f"{skill}-{n}" for skill in SKILLS for n in range(50)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare filtering adverts by one skill with icontains on the skills text "
+        "and with the indexed skill table, for common and long-tail skills. Rows "
+        "are created inside a transaction that is rolled back; run it against a "
+        "scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=[100_000])
+        parser.add_argument("--queries", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        for size in options["sizes"]:
+            self.run_benchmark(size, options["queries"], options["seed"])
+
+    def run_benchmark(self, size: int, total_queries: int, seed: int):
+        rng = random.Random(seed)
+        with transaction.atomic():
+            SearchBenchmark().populate(size, rng, pick_skills=lambda: rng.sample(SKILLS, 2) + rng.sample(RARE_SKILLS, 2))
+            self.stdout.write(f"\n{size} adverts, {total_queries} skill filters (count + first page)")
+
+            for kind, vocabulary in (("common", SKILLS), ("long-tail", RARE_SKILLS)):
+                skills = [rng.choice(vocabulary) for _ in range(total_queries)]
+                for name, narrow in (
+                    ("icontains", lambda adverts, skill: adverts.filter(skills__icontains=skill)),
+                    ("skill-table", lambda adverts, skill: filter_adverts(adverts, {"skill": [skill]})),
+                ):
+                    queries = iter(skills)
+
+                    def first_page():
+                        adverts = narrow(JobAdvert.objects.active(), next(queries)).order_by("-created_at")
+                        page = Paginator(adverts, 10).get_page(1)
+                        list(page.object_list)
+
+                    summary = summarize(time_calls(first_page, total_queries))
+                    self.stdout.write(f"  {kind:<10} {name:<12} {summary}")
+
+            transaction.set_rollback(True)
@@ -0,0 +1,196 @@
+import itertools
+import random
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import JobAdvert, JobApplication
+from application_tracking.search import get_search_backend
+from common.benchmark import find_regressions, load_results, save_results, summarize, time_calls
+from common.query_budget import QueryRecorder
+
+from .benchmark_search import LOCATIONS, ROLES, SKILLS, TITLES, TOOLS, WORDS
+
+VIEWS = ["home", "search", "get_advert", "apply", "my_jobs", "my_applications", "advert_applications", "decide"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency percentiles and query counts of every view through the "
+        "full middleware stack. Rows are created inside a transaction that is "
+        "rolled back; run it against a scratch database. Save results as a JSON "
+        "baseline and compare later runs against it to catch regressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=1000, help="Number of job adverts")
+        parser.add_argument("--applications-per-advert", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--views", nargs="+", choices=VIEWS, default=VIEWS)
+        parser.add_argument("--save", metavar="PATH", help="Write the results to a JSON baseline")
+        parser.add_argument("--compare", metavar="PATH", help="Compare the results with a JSON baseline")
+        parser.add_argument("--threshold", type=float, default=0.25,
+                            help="Allowed latency growth before flagging a regression (0.25 = 25%%)")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        with tempfile.TemporaryDirectory() as media_root, override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+            MEDIA_ROOT=media_root,
+        ), transaction.atomic():
+            fixtures = self.populate(options["scale"], options["applications_per_advert"], rng)
+            get_search_backend().rebuild()
+
+            self.stdout.write(
+                f"{options['scale']} adverts on {connection.vendor}, {options['repeat']} runs per view"
+            )
+            results = {}
+            for name in options["views"]:
+                request = getattr(self, f"request_{name}")(fixtures, rng)
+                time_calls(request, options["warmup"])
+                summary = summarize(time_calls(request, options["repeat"]))
+                with QueryRecorder() as recorder:
+                    request()
+                summary["queries"] = len(recorder)
+                results[name] = summary
+                self.stdout.write(
+                    f"  {name:<20} p50={summary['p50_ms']:>8}ms p95={summary['p95_ms']:>8}ms "
+                    f"max={summary['max_ms']:>8}ms queries={summary['queries']}"
+                )
+
+            transaction.set_rollback(True)
+
+        report = {
+            "scale": options["scale"],
+            "applications_per_advert": options["applications_per_advert"],
+            "vendor": connection.vendor,
+            "views": results,
+        }
+        if options["save"]:
+            save_results(options["save"], report)
+            self.stdout.write(f"Saved baseline to {options['save']}")
+        if options["compare"]:
+            self.compare(load_results(options["compare"]), report, options["threshold"])
+
+    def compare(self, baseline: dict, report: dict, threshold: float):
+        if (baseline["scale"], baseline["vendor"]) != (report["scale"], report["vendor"]):
+            self.stderr.write(
+                f"Baseline was measured with {baseline['scale']} adverts on {baseline['vendor']}; "
+                "the comparison is only indicative."
+            )
+        regressions = find_regressions(baseline["views"], report["views"], threshold)
+        if regressions:
+            raise CommandError("Regressions against the baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regressions beyond {threshold:.0%} against the baseline."))
+
+    def populate(self, size: int, applications_per_advert: int, rng: random.Random, batch_size: int = 5000) -> dict:
+        suffix = rng.random()
+        employer = User.objects.create(email=f"benchmark-employer-{suffix}@example.com", role="employer")
+        jobseeker = User.objects.create(email=f"benchmark-jobseeker-{suffix}@example.com", role="jobseeker")
+        others = User.objects.create(email=f"benchmark-others-{suffix}@example.com", role="employer")
+        deadline = timezone.now().date() + timedelta(days=30)
+        owned = max(10, size // 100)
+
+        adverts = []
+        for start in range(0, size, batch_size):
+            batch = [
+                JobAdvert(
+                    title=f"{rng.choice(TITLES)} {rng.choice(ROLES)}",
+                    company_name=f"Company {rng.randrange(5000)}",
+                    employment_type="Full Time",
+                    experience_level="Mid Level",
+                    job_type="Remote",
+                    location=rng.choice(LOCATIONS),
+                    description=f"{' '.join(rng.sample(WORDS, 4) + rng.sample(TOOLS, 3))} #{n}",
+                    skills=", ".join(rng.sample(SKILLS, 3)),
+                    deadline=deadline,
+                    created_by=employer if n < owned else others,
+                )
+                for n in range(start, min(size, start + batch_size))
+            ]
+            adverts.extend(JobAdvert.objects.bulk_create(batch))
+
+        applications = [
+            JobApplication(
+                name=f"Applicant {n}",
+                email=jobseeker.email if n < 20 else f"applicant-{n}@example.com",
+                portfolio_url="https://example.com",
+                cv=f"cv/benchmark-{n % 100}.pdf",
+                job_advert=adverts[n % len(adverts)],
+            )
+            for n in range(size * applications_per_advert)
+        ]
+        JobApplication.objects.bulk_create(applications, batch_size=batch_size)
+
+        return {
+            "employer": employer,
+            "jobseeker": jobseeker,
+            "adverts": adverts,
+            "owned_advert": adverts[0],
+            "application": applications[0],
+        }
+
+    def client_for(self, user: User | None) -> Client:
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        return client
+
+    def request_home(self, fixtures, rng):
+        client = self.client_for(None)
+        return lambda: client.get(reverse("home"))
+
+    def request_search(self, fixtures, rng):
+        client = self.client_for(None)
+        return lambda: client.get(reverse("search"), {"keyword": rng.choice(SKILLS + WORDS + TOOLS)})
+
+    def request_get_advert(self, fixtures, rng):
+        client = self.client_for(None)
+        return lambda: client.get(reverse("job_advert", kwargs={"advert_id": rng.choice(fixtures["adverts"]).pk}))
+
+    def request_apply(self, fixtures, rng):
+        client = self.client_for(fixtures["jobseeker"])
+        emails = (f"benchmark-apply-{n}@example.com" for n in itertools.count())
+
+        def apply():
+            advert = rng.choice(fixtures["adverts"])
+            client.post(reverse("apply_for_job", kwargs={"advert_id": advert.pk}), {
+                "name": "Benchmark applicant",
+                "email": next(emails),
+                "portfolio_url": "https://example.com",
+                "cv": SimpleUploadedFile("cv.pdf", b"%PDF-1.4 benchmark"),
+            })
+
+        return apply
+
+    def request_my_jobs(self, fixtures, rng):
+        client = self.client_for(fixtures["employer"])
+        return lambda: client.get(reverse("my_jobs"))
+
+    def request_my_applications(self, fixtures, rng):
+        client = self.client_for(fixtures["jobseeker"])
+        return lambda: client.get(reverse("my_applications"))
+
+    def request_advert_applications(self, fixtures, rng):
+        client = self.client_for(fixtures["employer"])
+        url = reverse("advert_applications", kwargs={"advert_id": fixtures["owned_advert"].pk})
+        return lambda: client.get(url)
+
+    def request_decide(self, fixtures, rng):
+        client = self.client_for(fixtures["employer"])
+        url = reverse("decide", kwargs={"job_application_id": fixtures["application"].pk})
+        # Alternate between statuses that do not email the applicant
+        statuses = itertools.cycle([ApplicationStatus.INTERVIEW, ApplicationStatus.APPLIED])
+        return lambda: client.post(url, {"status": next(statuses)})
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from application_tracking.cv_text import extraction_stats
+from application_tracking.models import CVDocument
+
+
+class Command(BaseCommand):
+    help = "Show CV text extraction progress and documents/sec per worker"
+
+    def handle(self, *args, **options):
+        for row in CVDocument.objects.values("status").annotate(total=Count("pk")).order_by("status"):
+            self.stdout.write(f"{row['status']:<12} {row['total']}")
+        for stats in extraction_stats():
+            rate = stats["documents_per_second"]
+            self.stdout.write(
+                f"{stats['worker']:<32} {stats['documents']:>8} documents "
+                f"{rate if rate is not None else '-':>9} docs/sec"
+            )
@@ -0,0 +1,81 @@
+import re
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from application_tracking.cv_text import extracted_documents
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import JobAdvert, JobApplication
+
+# Index names and full table scans, as each backend spells them in its plans
+INDEX_PATTERNS = [
+    re.compile(r"USING (?:COVERING )?INDEX (\w+)"),  # SQLite
+    re.compile(r"Index (?:Only )?Scan (?:Backward )?using (\w+)"),  # PostgreSQL
+    re.compile(r'"key": "(\w+)"'),  # MySQL, JSON format
+]
+FULL_SCAN_PATTERNS = [
+    re.compile(r"\bSCAN (\w+)(?!\w| USING)"),
+    re.compile(r"Seq Scan on (\w+)"),
+    re.compile(r'"table_name": "(\w+)",\s*"access_type": "ALL"'),
+]
+
+
+def explain(queryset) -> str:
+    if connection.vendor == "mysql":
+        return queryset.explain(format="JSON")
+    return queryset.explain()
+
+
+def plan_summary(plan: str) -> tuple[list[str], list[str]]:
+    """Indexes the plan uses and tables it scans in full"""
+    indexes = [name for pattern in INDEX_PATTERNS for name in pattern.findall(plan)]
+    full_scans = [name for pattern in FULL_SCAN_PATTERNS for name in pattern.findall(plan)]
+    return list(dict.fromkeys(indexes)), list(dict.fromkeys(full_scans))
+
+
+def view_queries() -> dict:
+    """The queries behind each listing view, built with values from the current data"""
+    advert = JobAdvert.objects.order_by().first()
+    advert_id = advert.pk if advert else uuid.uuid4()
+    owner_id = advert.created_by_id if advert else 0
+    email = JobApplication.objects.order_by().values_list("email", flat=True).first() or "nobody@example.com"
+    cv_name = JobApplication.objects.order_by().values_list("cv", flat=True).first() or "cv/missing.pdf"
+
+    active = JobAdvert.objects.active()
+    applications = JobApplication.objects.filter(job_advert_id=advert_id)
+    return {
+        "home (page)": active[:10],
+        "home (count)": active.values("pk").order_by(),
+        "get_advert": JobAdvert.objects.filter(pk=advert_id),
+        "my_jobs": JobAdvert.objects.filter(created_by_id=owner_id)[:10],
+        "my_applications": JobApplication.objects.filter(email=email).select_related("job_advert")[:10],
+        "advert_applications": applications[:10],
+        "bulk_decide": applications.filter(status=ApplicationStatus.APPLIED).values_list("pk", "name", "email"),
+        "applicant counters": applications.values_list("job_advert_id", "status").order_by(),
+        "cv_extraction": extracted_documents(cv_name).values_list("text")[:1],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the queries behind the listing views and report which "
+        "indexes they use. Run it against a database of realistic size, since "
+        "planners prefer full scans on tiny tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--plans", action="store_true", help="Print the full query plans")
+
+    def handle(self, *args, **options):
+        full_scans = 0
+        for name, queryset in view_queries().items():
+            plan = explain(queryset)
+            indexes, scanned = plan_summary(plan)
+            full_scans += bool(scanned)
+            status = self.style.WARNING("FULL SCAN") if scanned else self.style.SUCCESS("indexed")
+            self.stdout.write(f"{name:<22} {status:<10} {', '.join(indexes) or '-'}")
+            if options["plans"]:
+                self.stdout.write(plan + "\n")
+
+        self.stdout.write(f"{full_scans} queries scan a whole table.")
@@ -0,0 +1,258 @@
+import hashlib
+import io
+import random
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Count
+from django.utils import timezone
+from faker import Faker
+
+from accounts.models import User
+from application_tracking.enums import ApplicationStatus, EmploymentType, ExperienceLevel, LocationTypeChoice
+from application_tracking.listing_cache import bump_generation
+from application_tracking.models import CVBlob, JobAdvert, JobApplication
+from application_tracking.search import get_search_backend
+from application_tracking.skills import sync_all_advert_skills
+from application_tracking.tasks import reconcile_applicant_counters
+
+from .benchmark_search import LOCATIONS, SKILLS, TOOLS, WORDS
+
+PASSWORD = "password"
+STATUS_WEIGHTS = {
+    ApplicationStatus.APPLIED: 80,
+    ApplicationStatus.REJECTED: 15,
+    ApplicationStatus.INTERVIEW: 5,
+}
+
+
+def stable_uuid(seed: int, kind: str, n: int) -> uuid.UUID:
+    """The primary key of the nth generated row of a kind, so chunks can reference each other"""
+    return uuid.UUID(bytes=hashlib.md5(f"{seed}:{kind}:{n}".encode()).digest(), version=4)
+
+
+def chunk_random(seed: int, kind: str, start: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{start}")
+
+
+def build_users(plan: dict, start: int, stop: int) -> list[User]:
+    users = []
+    for n in range(start, stop):
+        employer = n < plan["employers"]
+        users.append(User(
+            id=stable_uuid(plan["seed"], "user", n),
+            email=f"{plan['prefix']}-{'employer' if employer else 'jobseeker'}{n}@example.com",
+            password=plan["password_hash"],
+            role="employer" if employer else "jobseeker",
+        ))
+    return users
+
+
+def build_adverts(plan: dict, start: int, stop: int) -> list[JobAdvert]:
+    rng = chunk_random(plan["seed"], "advert", start)
+    fake = Faker()
+    fake.seed_instance(f"{plan['seed']}:advert:{start}")
+    today = plan["now"].date()
+
+    adverts = []
+    for n in range(start, stop):
+        adverts.append(JobAdvert(
+            id=stable_uuid(plan["seed"], "advert", n),
+            title=fake.job()[:150],
+            company_name=fake.company()[:150],
+            employment_type=rng.choice(EmploymentType)[0],
+            experience_level=rng.choice(ExperienceLevel)[0],
+            job_type=rng.choice(LocationTypeChoice)[0],
+            location=rng.choice(LOCATIONS),
+            description=f"{' '.join(rng.sample(WORDS, 4) + rng.sample(TOOLS, 3))} #{n}",
+            skills=", ".join(rng.sample(SKILLS, 3)),
+            is_published=rng.random() < 0.95,
+            # Most adverts are open, a tail has expired
+            deadline=today + timedelta(days=rng.randint(-90, 60)),
+            created_by_id=stable_uuid(plan["seed"], "user", rng.randrange(plan["employers"])),
+        ))
+    return adverts
+
+
+def build_applications(plan: dict, start: int, stop: int) -> list[JobApplication]:
+    rng = chunk_random(plan["seed"], "application", start)
+    advert_total, jobseekers = plan["adverts"], plan["users"] - plan["employers"]
+    statuses, weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+
+    applications = []
+    for n in range(start, stop):
+        # Walk adverts round robin and shift the jobseeker per round, so every
+        # (advert, email) pair is distinct as the unique constraint requires
+        advert = n % advert_total
+        jobseeker = plan["employers"] + (n // advert_total + advert * 31) % jobseekers
+        cv_names = plan["cv_names"]
+        applications.append(JobApplication(
+            id=stable_uuid(plan["seed"], "application", n),
+            name=f"Applicant {jobseeker}",
+            email=f"{plan['prefix']}-jobseeker{jobseeker}@example.com",
+            portfolio_url=f"https://example.com/portfolio/{jobseeker}",
+            cv=cv_names[n % len(cv_names)] if cv_names and rng.random() < plan["cv_ratio"] else "",
+            status=rng.choices(statuses, weights)[0],
+            job_advert_id=stable_uuid(plan["seed"], "advert", advert),
+        ))
+    return applications
+
+
+BUILDERS = {
+    User: build_users,
+    JobAdvert: build_adverts,
+    JobApplication: build_applications,
+}
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """Let bulk_create keep the timestamps set on the rows instead of stamping them with now"""
+    fields = [field for field in model._meta.concrete_fields if getattr(field, "auto_now", False)
+              or getattr(field, "auto_now_add", False)]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def insert_chunk(model, plan: dict, start: int, stop: int) -> int:
+    """Build and insert rows start..stop of model; runs in a worker process"""
+    rows = BUILDERS[model](plan, start, stop)
+
+    # Spread creation times evenly over the last --days days, oldest row first
+    step = timedelta(days=plan["days"]) / max(plan["span"], 1)
+    for offset, row in enumerate(rows, start=start):
+        row.created_at = row.updated_at = plan["now"] - step * (plan["span"] - offset)
+    with explicit_timestamps(model):
+        model.objects.bulk_create(rows, batch_size=plan["batch_size"])
+    return len(rows)
+
+
+def make_docx(text: str) -> bytes:
+    namespace = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{namespace}"><w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>',
+        )
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate users, job adverts and applications for load testing with "
+        "chunked bulk inserts spread over worker processes. The same seed and "
+        "sizes always produce the same rows, so run it against an empty database. "
+        "CVs are a small pool of shared files referenced by many applications."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--employers", type=int, default=500, help="How many of the users are employers")
+        parser.add_argument("--adverts", type=int, default=100_000)
+        parser.add_argument("--applications", type=int, default=1_000_000)
+        parser.add_argument("--cv-files", type=int, default=100, help="Distinct CV files to share")
+        parser.add_argument("--cv-ratio", type=float, default=1.0, help="Share of applications with a CV")
+        parser.add_argument("--days", type=int, default=365, help="Spread creation times over this many days")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="generated", help="Prefix of generated email addresses")
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--chunk-size", type=int, default=20_000)
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--skip-index", action="store_true", help="Do not rebuild the search index")
+
+    def handle(self, *args, **options):
+        jobseekers = options["users"] - options["employers"]
+        if options["employers"] < 1 or jobseekers < 1:
+            raise CommandError("Generate at least one employer and one jobseeker.")
+        if options["applications"] > options["adverts"] * jobseekers:
+            raise CommandError("Not enough adverts and jobseekers for that many distinct applications.")
+
+        workers = options["workers"]
+        if connection.vendor == "sqlite" and workers > 1:
+            self.stderr.write("SQLite allows a single writer; generating in this process.")
+            workers = 1
+
+        plan = {
+            "seed": options["seed"],
+            "prefix": options["prefix"],
+            "users": options["users"],
+            "employers": options["employers"],
+            "adverts": options["adverts"],
+            "cv_ratio": options["cv_ratio"],
+            "cv_names": self.create_cv_files(options["cv_files"], random.Random(options["seed"])),
+            "password_hash": make_password(PASSWORD),
+            "now": timezone.now(),
+            "days": options["days"],
+            "batch_size": options["batch_size"],
+        }
+
+        for model, total in (
+            (User, options["users"]),
+            (JobAdvert, options["adverts"]),
+            (JobApplication, options["applications"]),
+        ):
+            started = time.perf_counter()
+            self.generate(model, total, {**plan, "span": total}, options["chunk_size"], workers)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{model.__name__:<15} {total:>10} rows in {elapsed:6.1f}s "
+                f"({total / elapsed if elapsed else 0:,.0f} rows/sec)"
+            )
+
+        self.finish(plan["cv_names"], options["skip_index"])
+        self.stdout.write(self.style.SUCCESS(f"Generated data with seed {options['seed']}; "
+                                             f"every user's password is '{PASSWORD}'."))
+
+    def generate(self, model, total: int, plan: dict, chunk_size: int, workers: int):
+        chunks = [(start, min(total, start + chunk_size)) for start in range(0, total, chunk_size)]
+        if workers == 1:
+            for start, stop in chunks:
+                insert_chunk(model, plan, start, stop)
+            return
+
+        # Workers must open their own connections rather than inherit ours
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            futures = [pool.submit(insert_chunk, model, plan, start, stop) for start, stop in chunks]
+            for future in futures:
+                future.result()
+
+    def create_cv_files(self, total: int, rng: random.Random) -> list[str]:
+        storage = JobApplication._meta.get_field("cv").storage
+        names = []
+        for n in range(total):
+            text = f"Curriculum vitae {n}. Skills: {', '.join(rng.sample(SKILLS, 4))}. {' '.join(rng.sample(TOOLS, 5))}"
+            names.append(storage.save(f"cv-{n}.docx", ContentFile(make_docx(text))))
+        return names
+
+    def finish(self, cv_names: list[str], skip_index: bool):
+        references = dict(
+            JobApplication.objects.filter(cv__in=cv_names).values_list("cv").annotate(total=Count("pk")).order_by()
+        )
+        storage = JobApplication._meta.get_field("cv").storage
+        for name in cv_names:
+            CVBlob.objects.update_or_create(
+                name=name, defaults={"size": storage.size(name), "ref_count": references.get(name, 0)}
+            )
+
+        reconcile_applicant_counters()
+        sync_all_advert_skills()
+        if not skip_index:
+            get_search_backend().rebuild()
+        bump_generation()
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from application_tracking.imports import (
+    IMPORT_BATCH_SIZE, IMPORT_FORMATS, InvalidImportFile, detect_format, import_adverts, read_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import job adverts from a CSV or JSON feed on behalf of an employer. "
+        "Rows are validated like the create advert form; invalid rows are "
+        "reported and skipped while the rest are inserted in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--owner", required=True, help="Email of the employer who owns the adverts")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        owner = User.objects.filter(email=options["owner"], role="employer").first()
+        if owner is None:
+            raise CommandError(f"No employer with the email {options['owner']}.")
+
+        path = Path(options["path"])
+        try:
+            rows = read_rows(path.read_bytes(), options["format"] or detect_format(path.name))
+        except (OSError, InvalidImportFile) as error:
+            raise CommandError(str(error))
+
+        report = import_adverts(rows, owner, options["batch_size"])
+        for error in report["errors"]:
+            messages = "; ".join(
+                f"{field}: {' '.join(message['message'] for message in field_errors)}"
+                for field, field_errors in error["errors"].items()
+            )
+            self.stderr.write(f"Row {error['row']}: {messages}")
+        self.stdout.write(self.style.SUCCESS(f"Imported {report['created']} of {report['total']} adverts."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from application_tracking.listing_cache import listing_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss/eviction statistics for the home and search listing cache"
+
+    def handle(self, *args, **options):
+        for name, value in listing_cache_stats().items():
+            self.stdout.write(f"{name:<12} {value}")
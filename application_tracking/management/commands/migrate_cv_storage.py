@@ -0,0 +1,54 @@
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+
+from application_tracking.models import CVBlob, JobApplication
+
+
+class Command(BaseCommand):
+    help = (
+        "Move CVs uploaded before content-addressed storage into it. Each legacy "
+        "file under MEDIA_ROOT is hashed, stored once per distinct content and "
+        "the application is pointed at the shared blob."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--keep-originals", action="store_true",
+                            help="Leave the legacy files in place after moving them")
+
+    def handle(self, *args, **options):
+        storage = JobApplication._meta.get_field("cv").storage
+        legacy_storage = FileSystemStorage()
+        moved = missing = 0
+
+        last_id = None
+        while True:
+            batch = JobApplication.objects.exclude(cv="").order_by("pk")
+            if last_id is not None:
+                batch = batch.filter(pk__gt=last_id)
+            batch = list(batch.values_list("pk", "cv")[:options["batch_size"]])
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            for application_id, name in batch:
+                if storage.owns(name):
+                    continue
+                if not legacy_storage.exists(name):
+                    missing += 1
+                    self.stderr.write(f"Missing file for application {application_id}: {name}")
+                    continue
+
+                with legacy_storage.open(name) as legacy_file:
+                    new_name = storage.save(name, legacy_file)
+
+                JobApplication.objects.filter(pk=application_id).update(cv=new_name)
+                CVBlob.add_reference(new_name, storage.size(new_name))
+                if not options["keep_originals"]:
+                    legacy_storage.delete(name)
+                moved += 1
+
+        blobs = CVBlob.objects.count()
+        self.stdout.write(
+            self.style.SUCCESS(f"Moved {moved} CVs into {blobs} content-addressed blobs, {missing} missing.")
+        )
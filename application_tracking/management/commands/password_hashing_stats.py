@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.hashing import hashing_stats
+
+
+class Command(BaseCommand):
+    help = "Show how many password hashes ran or were shed, and their mean queue wait and hashing time"
+
+    def handle(self, *args, **options):
+        for name, value in hashing_stats().items():
+            self.stdout.write(f"{name:<12} {value}")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from application_tracking.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the job advert search index from scratch"
+
+    def handle(self, *args, **options):
+        total = get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} adverts."))
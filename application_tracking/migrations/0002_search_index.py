@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('advert', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='application_tracking.jobadvert')),
+                ('length', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('frequency', models.PositiveIntegerField()),
+                ('document_length', models.PositiveIntegerField()),
+                ('advert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_postings', to='application_tracking.jobadvert')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('term', 'advert'), name='unique_search_posting')],
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:09
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+STATUS_COUNTER_FIELDS = {
+    "APPLIED": "applied_count",
+    "REJECTED": "rejected_count",
+    "INTERVIEW": "interview_count",
+}
+
+
+def backfill_counters(apps, schema_editor):
+    JobAdvert = apps.get_model("application_tracking", "JobAdvert")
+    JobApplication = apps.get_model("application_tracking", "JobApplication")
+
+    counters = {}
+    rows = (
+        JobApplication.objects.values_list("job_advert_id", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for advert_id, status, total in rows:
+        advert_counters = counters.setdefault(advert_id, {"applicant_count": 0})
+        advert_counters["applicant_count"] += total
+        if status in STATUS_COUNTER_FIELDS:
+            field = STATUS_COUNTER_FIELDS[status]
+            advert_counters[field] = advert_counters.get(field, 0) + total
+
+    for advert_id, values in counters.items():
+        JobAdvert.objects.filter(pk=advert_id).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0002_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobadvert',
+            name='applicant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobadvert',
+            name='applied_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobadvert',
+            name='interview_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobadvert',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0003_applicant_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='jobapplication',
+            options={'ordering': ('-created_at',)},
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(fields=['created_at', 'id'], name='jobadvert_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['created_at', 'id'], name='jobapplication_created_id_idx'),
+        ),
+    ]
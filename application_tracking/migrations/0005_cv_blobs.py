@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:19
+
+import common.storage
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0004_keyset_pagination'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVBlob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='cv',
+            field=models.FileField(storage=common.storage.cv_storage, upload_to=''),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0005_cv_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVDocument',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='cv_document', serialize=False, to='application_tracking.jobapplication')),
+                ('status', models.CharField(choices=[('PENDING', 'PENDING'), ('DONE', 'DONE'), ('FAILED', 'FAILED')], default='PENDING', max_length=20)),
+                ('text', models.TextField(blank=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('extracted_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ApplicantTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='application_tracking.jobapplication')),
+                ('job_advert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applicant_terms', to='application_tracking.jobadvert')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job_advert', 'term', 'application'), name='unique_applicant_term')],
+            },
+        ),
+    ]
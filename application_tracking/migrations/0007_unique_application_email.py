@@ -0,0 +1,96 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:29
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Case, Count, F, IntegerField, Value, When
+from django.db.models.functions import Lower, Trim
+
+BATCH_SIZE = 1000
+
+STATUS_COUNTER_FIELDS = {
+    "APPLIED": "applied_count",
+    "REJECTED": "rejected_count",
+    "INTERVIEW": "interview_count",
+}
+
+
+def normalize_emails(apps, schema_editor):
+    JobApplication = apps.get_model("application_tracking", "JobApplication")
+
+    last_id = None
+    while True:
+        batch = JobApplication.objects.order_by("pk")
+        if last_id is not None:
+            batch = batch.filter(pk__gt=last_id)
+        ids = list(batch.values_list("pk", flat=True)[:BATCH_SIZE])
+        if not ids:
+            break
+        last_id = ids[-1]
+        JobApplication.objects.filter(pk__in=ids).update(email=Lower(Trim("email")))
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    """
+    Keep one application per advert and email: the one already decided on,
+    otherwise the earliest. Counters and CV references of the removed
+    applications are corrected since signals do not run here.
+    """
+    JobAdvert = apps.get_model("application_tracking", "JobAdvert")
+    JobApplication = apps.get_model("application_tracking", "JobApplication")
+    CVBlob = apps.get_model("application_tracking", "CVBlob")
+
+    duplicates = list(
+        JobApplication.objects.values_list("job_advert_id", "email")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    undecided_last = Case(When(status="APPLIED", then=Value(1)), default=Value(0), output_field=IntegerField())
+
+    removed = []
+    for advert_id, email, _ in duplicates:
+        applications = list(
+            JobApplication.objects.filter(job_advert_id=advert_id, email=email)
+            .order_by(undecided_last, "created_at", "pk")
+            .values_list("pk", "cv")
+        )
+        removed.extend(applications[1:])
+
+    for start in range(0, len(removed), BATCH_SIZE):
+        JobApplication.objects.filter(pk__in=[pk for pk, _ in removed[start:start + BATCH_SIZE]]).delete()
+
+    for name, total in Counter(cv for _, cv in removed if cv).items():
+        CVBlob.objects.filter(name=name).update(
+            ref_count=Case(When(ref_count__gte=total, then=F("ref_count") - total), default=Value(0))
+        )
+
+    for advert_id in {advert_id for advert_id, _, _ in duplicates}:
+        counters = dict.fromkeys(["applicant_count", *STATUS_COUNTER_FIELDS.values()], 0)
+        rows = (
+            JobApplication.objects.filter(job_advert_id=advert_id)
+            .values_list("status")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        for status, total in rows:
+            counters["applicant_count"] += total
+            if status in STATUS_COUNTER_FIELDS:
+                counters[STATUS_COUNTER_FIELDS[status]] += total
+        JobAdvert.objects.filter(pk=advert_id).update(**counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0006_cv_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='jobapplication',
+            constraint=models.UniqueConstraint(fields=('job_advert', 'email'), name='unique_application_per_email'),
+        ),
+    ]
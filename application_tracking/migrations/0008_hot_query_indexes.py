@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0007_unique_application_email'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(fields=['is_published', 'created_at', 'id'], name='jobadvert_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(fields=['deadline', 'is_published'], name='jobadvert_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(fields=['created_by', 'created_at', 'id'], name='jobadvert_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['email', 'created_at', 'id'], name='jobapplication_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job_advert', 'created_at', 'id'], name='jobapplication_advert_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job_advert', 'status'], name='jobapplication_status_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.4 on 2026-10-18 18:59
+
+import common.storage
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0008_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJobAdvert',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('title', models.CharField(max_length=150)),
+                ('company_name', models.CharField(max_length=150)),
+                ('employment_type', models.CharField(choices=[('Full Time', 'Full Time'), ('Part Time', 'Part Time'), ('Contract', 'Contract')], max_length=50)),
+                ('experience_level', models.CharField(choices=[('Entry Level', 'Entry Level'), ('Mid Level', 'Mid Level'), ('Senior', 'Senior')], max_length=50)),
+                ('description', models.CharField(max_length=255)),
+                ('job_type', models.CharField(choices=[('Onsite', 'Onsite'), ('Hybrid', 'Hybrid'), ('Remote', 'Remote')], max_length=50)),
+                ('location', models.CharField(blank=True, max_length=255, null=True)),
+                ('is_published', models.BooleanField()),
+                ('deadline', models.DateField()),
+                ('skills', models.CharField(max_length=255)),
+                ('applicant_count', models.PositiveIntegerField(default=0)),
+                ('applied_count', models.PositiveIntegerField(default=0)),
+                ('rejected_count', models.PositiveIntegerField(default=0)),
+                ('interview_count', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_adverts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedJobApplication',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('name', models.CharField(max_length=50)),
+                ('email', models.EmailField(max_length=254)),
+                ('portfolio_url', models.URLField()),
+                ('cv', models.FileField(storage=common.storage.cv_storage, upload_to='')),
+                ('status', models.CharField(choices=[('APPLIED', 'APPLIED'), ('REJECTED', 'REJECTED'), ('INTERVIEW', 'INTERVIEW')], max_length=20)),
+                ('job_advert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applications', to='application_tracking.archivedjobadvert')),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobadvert',
+            index=models.Index(fields=['created_by', 'created_at', 'id'], name='archivedadvert_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobapplication',
+            index=models.Index(fields=['email', 'created_at', 'id'], name='archivedapplication_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobapplication',
+            index=models.Index(fields=['job_advert', 'created_at', 'id'], name='archivedapplication_advert_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.4 on 2026-10-18 19:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0009_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AdvertSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('advert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='advert_skills', to='application_tracking.jobadvert')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='advert_skills', to='application_tracking.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobadvert',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='adverts', through='application_tracking.AdvertSkill', to='application_tracking.skill'),
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=64, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='application_tracking.skill')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='advertskill',
+            constraint=models.UniqueConstraint(fields=('skill', 'advert'), name='unique_advert_skill'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.1.4 on 2026-10-18 19:40
+
+import re
+
+from django.db import migrations
+
+
+SKILL_SEPARATOR = re.compile(r"[,;\n]")
+MAX_SKILL_LENGTH = 64
+BATCH_SIZE = 1000
+
+# The aliases as of this migration; later ones are added by their own migrations
+ALIASES = {
+    "golang": "go",
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "nodejs": "node.js",
+    "node": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "csharp": "c#",
+    "c sharp": "c#",
+}
+
+
+def parse_skills(text):
+    names = (" ".join(name.lower().split())[:MAX_SKILL_LENGTH] for name in SKILL_SEPARATOR.split(text or ""))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def skill_ids(Skill, names):
+    """The id of the Skill named each of names, creating missing ones"""
+    ids = dict(Skill.objects.filter(name__in=names).values_list("name", "id"))
+    missing = set(names) - ids.keys()
+    if missing:
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        ids.update(Skill.objects.filter(name__in=missing).values_list("name", "id"))
+    return ids
+
+
+def backfill_skills(apps, schema_editor):
+    JobAdvert = apps.get_model("application_tracking", "JobAdvert")
+    Skill = apps.get_model("application_tracking", "Skill")
+    SkillAlias = apps.get_model("application_tracking", "SkillAlias")
+    AdvertSkill = apps.get_model("application_tracking", "AdvertSkill")
+
+    canonical_ids = skill_ids(Skill, set(ALIASES.values()))
+    SkillAlias.objects.bulk_create(
+        [SkillAlias(alias=alias, skill_id=canonical_ids[name]) for alias, name in ALIASES.items()],
+        ignore_conflicts=True,
+    )
+
+    adverts = JobAdvert.objects.order_by("pk").only("pk", "skills")
+    last_pk = None
+    while True:
+        batch = list((adverts.filter(pk__gt=last_pk) if last_pk else adverts)[:BATCH_SIZE])
+        if not batch:
+            return
+        parsed = {advert.pk: [ALIASES.get(name, name) for name in parse_skills(advert.skills)] for advert in batch}
+        ids = skill_ids(Skill, {name for names in parsed.values() for name in names})
+        pairs = {(advert_id, ids[name]) for advert_id, names in parsed.items() for name in names}
+        AdvertSkill.objects.bulk_create(
+            [AdvertSkill(advert_id=advert_id, skill_id=skill_id) for advert_id, skill_id in pairs],
+            ignore_conflicts=True,
+        )
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+    # Each batch of 1000 adverts commits on its own instead of the whole
+    # table being linked in one long transaction
+    atomic = False
+
+    dependencies = [
+        ('application_tracking', '0010_skills'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
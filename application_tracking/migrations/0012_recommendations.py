@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 19:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0011_backfill_skills'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(fields=['updated_at'], name='jobadvert_updated_idx'),
+        ),
+    ]
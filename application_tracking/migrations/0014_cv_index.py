@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('application_tracking', '0013_saved_searches'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['cv'], name='jobapplication_cv_idx'),
+        ),
+    ]
@@ -1,37 +1,66 @@
 from django.db import models
+from django.db.models import Case, Count, F, When
 from django.urls import reverse
 from django.utils import timezone
-from django.db.models import Q
 
 from accounts.models import User
 from common.models import BaseModel
+from common.storage import cv_storage
 
-from .enums import (ApplicationStatus, EmploymentType, ExperienceLevel,
+from .enums import (ApplicationStatus, CVExtractionStatus, EmploymentType, ExperienceLevel,
                     LocationTypeChoice)
 
 
+STATUS_COUNTER_FIELDS = {
+    ApplicationStatus.APPLIED: "applied_count",
+    ApplicationStatus.REJECTED: "rejected_count",
+    ApplicationStatus.INTERVIEW: "interview_count",
+}
+
+COUNTER_FIELDS = ["applicant_count", *STATUS_COUNTER_FIELDS.values()]
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def count_applicants(advert_ids) -> dict:
+    """Map each advert id to its counter values, computed with one grouped query"""
+    counters = {advert_id: dict.fromkeys(COUNTER_FIELDS, 0) for advert_id in advert_ids}
+    rows = (
+        JobApplication.objects.filter(job_advert_id__in=advert_ids)
+        .values_list("job_advert_id", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for advert_id, status, total in rows:
+        counters[advert_id]["applicant_count"] += total
+        if status in STATUS_COUNTER_FIELDS:
+            counters[advert_id][STATUS_COUNTER_FIELDS[status]] += total
+    return counters
+
+
 class JobAdvertQuerySet(models.QuerySet):
 
     def active(self):
         return self.filter(is_published=True, deadline__gte=timezone.now().date())
 
 
-    def search(self, keyword, location):
+    def search(self, keyword, location, filters=None):
+        from .search import get_search_backend
+
+        return get_search_backend().search(keyword, location, filters)
 
-        query = Q()
+    async def asearch(self, keyword, location, filters=None):
+        from .search import get_search_backend
 
-        if keyword:
-            query &= (
-                Q(title__icontains=keyword)
-                | Q(company_name__icontains=keyword)
-                | Q(description__icontains=keyword)
-                | Q(skills__icontains=keyword)
-            )
+        return await get_search_backend().asearch(keyword, location, filters)
 
-        if location:
-            query &= Q(location__icontains=location)
+    def matching(self, keyword, location):
+        """Active adverts matching keyword and location, unranked"""
+        from .search import get_search_backend
 
-        return self.active().filter(query)
+        return get_search_backend().matching_adverts(keyword, location)
 
 
 class JobAdvert(BaseModel):
@@ -45,12 +74,31 @@ class JobAdvert(BaseModel):
     is_published = models.BooleanField(default=True)
     deadline = models.DateField()
     skills = models.CharField(max_length=255)
+    # Canonical skills parsed from skills, kept in sync by sync_advert_skills
+    skill_tags = models.ManyToManyField("Skill", through="AdvertSkill", related_name="adverts", blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
 
+    # Denormalized from JobApplication, see reconcile_applicant_counters
+    applicant_count = models.PositiveIntegerField(default=0)
+    applied_count = models.PositiveIntegerField(default=0)
+    rejected_count = models.PositiveIntegerField(default=0)
+    interview_count = models.PositiveIntegerField(default=0)
+
     objects = JobAdvertQuerySet.as_manager()
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            # Backs keyset pagination on (created_at, id)
+            models.Index(fields=["created_at", "id"], name="jobadvert_created_id_idx"),
+            # active(): newest published adverts first, and counting the unexpired ones
+            models.Index(fields=["is_published", "created_at", "id"], name="jobadvert_published_idx"),
+            models.Index(fields=["deadline", "is_published"], name="jobadvert_deadline_idx"),
+            # my_jobs: an employer's adverts, newest first
+            models.Index(fields=["created_by", "created_at", "id"], name="jobadvert_owner_created_idx"),
+            # Recommendations reload the adverts changed since their last refresh
+            models.Index(fields=["updated_at"], name="jobadvert_updated_idx"),
+        ]
 
     
     def publish_advert(self) -> None:
@@ -59,18 +107,279 @@ class JobAdvert(BaseModel):
 
     @property
     def total_applicants(self):
-        return self.applications.count()
+        return self.applicant_count
+
+    def record_application(self, status: str = ApplicationStatus.APPLIED) -> None:
+        counter = STATUS_COUNTER_FIELDS[status]
+        JobAdvert.objects.filter(pk=self.pk).update(
+            applicant_count=F("applicant_count") + 1,
+            **{counter: F(counter) + 1},
+        )
+
+    def record_status_change(self, old_status: str, new_status: str, count: int = 1) -> None:
+        if old_status == new_status or not count:
+            return
+        old_counter = STATUS_COUNTER_FIELDS[old_status]
+        new_counter = STATUS_COUNTER_FIELDS[new_status]
+        # Never go below zero if the counters drifted; reconciliation fixes them later
+        decrement = Case(When(**{f"{old_counter}__gte": count}, then=F(old_counter) - count), default=0)
+        JobAdvert.objects.filter(pk=self.pk).update(
+            **{old_counter: decrement, new_counter: F(new_counter) + count}
+        )
+
+    def count_applicants(self) -> dict:
+        """Counter values computed from the applications table"""
+        return count_applicants([self.pk])[self.pk]
     
     def get_absolute_url(self):
         return reverse("job_advert", kwargs={"advert_id": self.id})
+
+    def skill_names(self) -> list[str]:
+        from .skills import parse_skills
+
+        return parse_skills(self.skills)
     
 
 class JobApplication(BaseModel):
     name = models.CharField(max_length=50)
     email = models.EmailField()
     portfolio_url = models.URLField()
-    cv = models.FileField()
+    cv = models.FileField(storage=cv_storage)
     status = models.CharField(max_length=20, choices=ApplicationStatus.choices, 
                               default=ApplicationStatus.APPLIED)
     job_advert = models.ForeignKey(JobAdvert, related_name="applications", on_delete=models.CASCADE)
 
+    class Meta:
+        ordering = ("-created_at",)
+        constraints = [
+            models.UniqueConstraint(fields=["job_advert", "email"], name="unique_application_per_email"),
+        ]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="jobapplication_created_id_idx"),
+            # my_applications: a jobseeker's applications, newest first
+            models.Index(fields=["email", "created_at", "id"], name="jobapplication_email_idx"),
+            # advert_applications: an advert's applications, newest first
+            models.Index(fields=["job_advert", "created_at", "id"], name="jobapplication_advert_idx"),
+            # bulk decisions and applicant counters group an advert's applications by status
+            models.Index(fields=["job_advert", "status"], name="jobapplication_status_idx"),
+            # CV extraction reuses the text of another application with the same stored file
+            models.Index(fields=["cv"], name="jobapplication_cv_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Duplicates are detected by the unique constraint, so compare emails case-insensitively
+        self.email = normalize_email(self.email)
+        super().save(*args, **kwargs)
+
+
+
+class CVBlob(BaseModel):
+    """
+    One stored CV file, shared by every application that uploaded the same
+    content. ref_count is the number of applications, live or archived,
+    whose cv points at it.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def add_reference(cls, name: str, size: int) -> None:
+        blob, _ = cls.objects.get_or_create(name=name, defaults={"size": size})
+        cls.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+
+    @classmethod
+    def track(cls, name: str, size: int) -> None:
+        """Record a stored file nothing references yet, so garbage collection can find it"""
+        cls.objects.get_or_create(name=name, defaults={"size": size})
+
+    @classmethod
+    def remove_reference(cls, name: str) -> None:
+        cls.objects.filter(name=name, ref_count__gt=0).update(ref_count=F("ref_count") - 1)
+
+
+class CVDocument(models.Model):
+    """Text extracted from an application's CV"""
+
+    application = models.OneToOneField(JobApplication, primary_key=True, related_name="cv_document",
+                                       on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=CVExtractionStatus.choices,
+                              default=CVExtractionStatus.PENDING)
+    text = models.TextField(blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
+
+
+class ApplicantTerm(models.Model):
+    """Terms found in an applicant's CV, for filtering an advert's applicants by keyword"""
+
+    job_advert = models.ForeignKey(JobAdvert, related_name="applicant_terms", on_delete=models.CASCADE)
+    application = models.ForeignKey(JobApplication, related_name="terms", on_delete=models.CASCADE)
+    term = models.CharField(max_length=64)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job_advert", "term", "application"],
+                                    name="unique_applicant_term"),
+        ]
+
+
+class Skill(models.Model):
+    """A canonical skill name: lowercase, single spaced, never an alias"""
+
+    name = models.CharField(max_length=64, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Another spelling of a skill, e.g. golang for go"""
+
+    alias = models.CharField(max_length=64, unique=True)
+    skill = models.ForeignKey(Skill, related_name="aliases", on_delete=models.CASCADE)
+
+
+class AdvertSkill(models.Model):
+    advert = models.ForeignKey(JobAdvert, related_name="advert_skills", on_delete=models.CASCADE)
+    skill = models.ForeignKey(Skill, related_name="advert_skills", on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            # Also the index behind skill filters: the adverts of one skill
+            models.UniqueConstraint(fields=["skill", "advert"], name="unique_advert_skill"),
+        ]
+
+
+class SavedSearch(BaseModel):
+    """
+    A search a user is alerted about. query is the search's query string,
+    keyword, location and facets, as the search page takes it.
+    """
+
+    user = models.ForeignKey(User, related_name="saved_searches", on_delete=models.CASCADE)
+    query = models.CharField(max_length=1000)
+    keyword = models.CharField(max_length=255, blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    filters = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+        constraints = [
+            models.UniqueConstraint(fields=["user", "query"], name="unique_saved_search"),
+        ]
+
+    def get_absolute_url(self):
+        return f"{reverse('search')}?{self.query}"
+
+
+class SavedSearchTerm(models.Model):
+    """The keyword terms of a saved search, looked up by the terms of a new advert"""
+
+    term = models.CharField(max_length=64)
+    saved_search = models.ForeignKey(SavedSearch, related_name="terms", on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["term", "saved_search"], name="unique_saved_search_term"),
+        ]
+
+
+class SavedSearchMatch(models.Model):
+    """An advert that matched a saved search, pending until sent in a digest"""
+
+    saved_search = models.ForeignKey(SavedSearch, related_name="matches", on_delete=models.CASCADE)
+    advert = models.ForeignKey(JobAdvert, related_name="saved_search_matches", on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # An advert is alerted once per saved search, however often it is edited
+            models.UniqueConstraint(fields=["saved_search", "advert"], name="unique_saved_search_match"),
+        ]
+        indexes = [
+            # Digests: the pending matches, per saved search
+            models.Index(fields=["notified_at", "saved_search"], name="savedsearchmatch_pending_idx"),
+        ]
+
+
+class SearchDocument(models.Model):
+    advert = models.OneToOneField(JobAdvert, primary_key=True, related_name="search_document",
+                                  on_delete=models.CASCADE)
+    length = models.PositiveIntegerField()
+
+
+class SearchPosting(models.Model):
+    term = models.CharField(max_length=64)
+    advert = models.ForeignKey(JobAdvert, related_name="search_postings", on_delete=models.CASCADE)
+    frequency = models.PositiveIntegerField()
+    document_length = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["term", "advert"], name="unique_search_posting"),
+        ]
+
+
+class ArchivedJobAdvert(models.Model):
+    """
+    A JobAdvert moved out of the hot table once its deadline is past the
+    retention window, see archive_expired_adverts. Rows keep their original
+    ids and timestamps and are read-only history.
+    """
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    title = models.CharField(max_length=150)
+    company_name = models.CharField(max_length=150)
+    employment_type = models.CharField(max_length=50, choices=EmploymentType)
+    experience_level = models.CharField(max_length=50, choices=ExperienceLevel)
+    # Not unique: a live advert may reuse the description of an archived one
+    description = models.CharField(max_length=255)
+    job_type = models.CharField(max_length=50, choices=LocationTypeChoice)
+    location = models.CharField(max_length=255, null=True, blank=True)
+    is_published = models.BooleanField()
+    deadline = models.DateField()
+    skills = models.CharField(max_length=255)
+    created_by = models.ForeignKey(User, related_name="archived_adverts", on_delete=models.CASCADE)
+    applicant_count = models.PositiveIntegerField(default=0)
+    applied_count = models.PositiveIntegerField(default=0)
+    rejected_count = models.PositiveIntegerField(default=0)
+    interview_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = [
+            # Job history: an employer's archived adverts, newest first
+            models.Index(fields=["created_by", "created_at", "id"], name="archivedadvert_owner_idx"),
+        ]
+
+    @property
+    def total_applicants(self):
+        return self.applicant_count
+
+
+class ArchivedJobApplication(models.Model):
+    """A JobApplication archived together with its advert"""
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    name = models.CharField(max_length=50)
+    email = models.EmailField()
+    portfolio_url = models.URLField()
+    cv = models.FileField(storage=cv_storage)
+    status = models.CharField(max_length=20, choices=ApplicationStatus.choices)
+    job_advert = models.ForeignKey(ArchivedJobAdvert, related_name="applications", on_delete=models.CASCADE)
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = [
+            # Application history: a jobseeker's archived applications, newest first
+            models.Index(fields=["email", "created_at", "id"], name="archivedapplication_email_idx"),
+            models.Index(fields=["job_advert", "created_at", "id"], name="archivedapplication_advert_idx"),
+        ]
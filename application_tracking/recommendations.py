@@ -0,0 +1,262 @@
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from .models import JobAdvert, JobApplication, normalize_email
+from .search import tokenize
+from .skills import canonical_skills, load_aliases
+
+logger = logging.getLogger(__name__)
+
+SKILL_WEIGHT = 1.0
+TITLE_WEIGHT = 0.5
+# Changes are read back this far before the last refresh, so a save that
+# committed after the refresh started is still picked up
+CHANGE_OVERLAP = timedelta(seconds=30)
+# Recent applications a jobseeker's profile is built from
+PROFILE_APPLICATIONS = 50
+# Extra adverts ranked in case some were deleted since the last refresh
+DELETED_SLACK = 10
+LOAD_CHUNK_SIZE = 2000
+
+_matrix = None
+_building = False
+_build_lock = threading.Lock()
+
+
+def advert_features(title: str, skills: str, aliases: dict[str, str]) -> dict[tuple, float]:
+    features = {("title", term): TITLE_WEIGHT for term in tokenize(title)}
+    features.update({("skill", name): SKILL_WEIGHT for name in canonical_skills(skills, aliases)})
+    return features
+
+
+def fetch_adverts(adverts, aliases: dict[str, str]) -> list[tuple]:
+    """
+    (id, features, active until, updated_at) for a queryset of adverts.
+    Skills are read from the skills text and resolved with aliases, the same
+    way sync_advert_skills links them, without reading the link table.
+    """
+    rows = adverts.order_by().values_list("id", "title", "skills", "is_published", "deadline", "updated_at")
+    return [
+        (advert_id, advert_features(title, skills, aliases), deadline.toordinal() if is_published else -1, updated_at)
+        for advert_id, title, skills, is_published, deadline, updated_at in rows.iterator(chunk_size=LOAD_CHUNK_SIZE)
+    ]
+
+
+class AdvertMatrix:
+    """
+    Adverts as the rows of a sparse matrix of skill and title features, kept
+    in NumPy arrays by column: for each feature, the rows that have it and
+    their weights. Rows are L2 normalized, so scoring a profile against every
+    advert is one weighted bincount over the profile's columns.
+
+    A changed advert gets a new row and its old row is masked out. Dead rows
+    are dropped when the matrix is rebuilt, see start_build.
+    """
+
+    def __init__(self):
+        self.advert_ids = []
+        self.rows = {}
+        self.versions = {}
+        # Deadline of each row as a date ordinal, -1 for dead rows
+        self.active_until = np.empty(0, dtype=np.int32)
+        self.columns = {}
+        self.aliases = {}
+        self.watermark = None
+        self.built_at = time.monotonic()
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def dead_rows(self) -> int:
+        return len(self.advert_ids) - len(self.rows)
+
+    def needs_rebuild(self) -> bool:
+        expired = time.monotonic() - self.built_at >= settings.RECOMMENDATIONS_REBUILD_INTERVAL
+        return expired or self.dead_rows > len(self.rows)
+
+    def refresh(self) -> None:
+        """
+        Load the adverts changed since the last refresh, or every active
+        advert the first time. Runs at most once per
+        RECOMMENDATIONS_REFRESH_INTERVAL seconds.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self.watermark and now - self.checked_at < settings.RECOMMENDATIONS_REFRESH_INTERVAL:
+                return
+            started = timezone.now()
+            if self.watermark is None:
+                adverts = JobAdvert.objects.active()
+            else:
+                adverts = JobAdvert.objects.filter(updated_at__gte=self.watermark - CHANGE_OVERLAP)
+            self.aliases = load_aliases()
+            self.upsert(fetch_adverts(adverts, self.aliases))
+            self.watermark, self.checked_at = started, now
+
+    def upsert(self, adverts) -> int:
+        """Add or replace the rows of (id, features, active until, updated_at). Returns the rows added"""
+        entries = defaultdict(lambda: ([], []))
+        dead, active_until = [], []
+        for advert_id, features, until, version in adverts:
+            if self.versions.get(advert_id) == version:
+                continue
+            self.versions[advert_id] = version
+            if advert_id in self.rows:
+                dead.append(self.rows.pop(advert_id))
+            if until < 0:
+                continue
+
+            row = len(self.advert_ids)
+            self.advert_ids.append(advert_id)
+            self.rows[advert_id] = row
+            active_until.append(until)
+            norm = math.sqrt(sum(weight * weight for weight in features.values())) or 1.0
+            for feature, weight in features.items():
+                rows, weights = entries[feature]
+                rows.append(row)
+                weights.append(weight / norm)
+
+        self.active_until = np.concatenate([self.active_until, np.array(active_until, dtype=np.int32)])
+        self.active_until[dead] = -1
+        for feature, (rows, weights) in entries.items():
+            rows, weights = np.array(rows, dtype=np.int32), np.array(weights, dtype=np.float32)
+            if feature in self.columns:
+                old_rows, old_weights = self.columns[feature]
+                rows, weights = np.concatenate([old_rows, rows]), np.concatenate([old_weights, weights])
+            self.columns[feature] = (rows, weights)
+        return len(active_until)
+
+    def scores(self, profile: dict[tuple, float]) -> np.ndarray:
+        """The dot product of profile with every row"""
+        columns = [(self.columns[feature], weight) for feature, weight in profile.items() if feature in self.columns]
+        if not columns:
+            return np.zeros(len(self.advert_ids))
+        rows = np.concatenate([rows for (rows, _), _ in columns])
+        weights = np.concatenate([weights * weight for (_, weights), weight in columns])
+        return np.bincount(rows, weights=weights, minlength=len(self.advert_ids))
+
+    def top(self, profile: dict[tuple, float], k: int, today, exclude=()) -> list[tuple]:
+        """(advert id, score) of the k best scoring adverts open on today, best first"""
+        with self.lock:
+            scores = self.scores(profile)
+            scores[self.active_until < today.toordinal()] = 0
+            scores[[self.rows[advert_id] for advert_id in exclude if advert_id in self.rows]] = 0
+
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(scores[candidates], -k)[-k:]]
+            ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self.advert_ids[row], float(scores[row])) for row in ranked]
+
+
+def build_matrix(background: bool = False) -> None:
+    """Build a fresh matrix and swap it in for the current one"""
+    global _matrix, _building
+    try:
+        fresh = AdvertMatrix()
+        fresh.refresh()
+        _matrix = fresh
+    except Exception:
+        logger.exception("Building the recommendations matrix failed")
+    finally:
+        with _build_lock:
+            _building = False
+        if background:
+            connections.close_all()
+
+
+def start_build() -> None:
+    """
+    Build a new matrix unless one is being built already. It is built on a
+    background thread when RECOMMENDATIONS_BUILD_IN_BACKGROUND is set, so no
+    request waits for it.
+    """
+    global _building
+    with _build_lock:
+        if _building:
+            return
+        _building = True
+    if not settings.RECOMMENDATIONS_BUILD_IN_BACKGROUND:
+        build_matrix()
+        return
+    threading.Thread(target=build_matrix, args=(True,), name="recommendations-build", daemon=True).start()
+
+
+def get_matrix() -> AdvertMatrix | None:
+    """
+    This process's matrix, refreshed with the latest advert changes, or
+    None until the first build is ready. It is rebuilt every
+    RECOMMENDATIONS_REBUILD_INTERVAL seconds, or once most of its rows are
+    dead, while requests keep using the old one.
+    """
+    matrix = _matrix
+    if matrix is None or matrix.needs_rebuild():
+        start_build()
+        matrix = _matrix
+    if matrix is not None:
+        matrix.refresh()
+    return matrix
+
+
+def reset_matrix() -> None:
+    global _matrix, _building, _build_lock
+    _matrix, _building, _build_lock = None, False, threading.Lock()
+
+
+# A forked worker must not share the matrix, and its locks, with its parent.
+# A build running in the parent does not exist in the child either
+os.register_at_fork(after_in_child=reset_matrix)
+
+
+def build_profile(user, declared_skills: str, aliases: dict[str, str]) -> tuple[Counter, set]:
+    """
+    A jobseeker's feature weights, from their declared skills or else from
+    the adverts they applied to recently, and the adverts they applied to.
+    """
+    applications = (
+        JobApplication.objects.filter(email=normalize_email(user.email)).order_by("-created_at")
+        .values_list("job_advert_id", "job_advert__title", "job_advert__skills")[:PROFILE_APPLICATIONS]
+    )
+    applied = {advert_id: (title, skills) for advert_id, title, skills in applications}
+
+    profile = Counter()
+    if declared_skills.strip():
+        # A declared skill also counts when it appears in a title, e.g. python in Python Developer
+        profile.update(advert_features(declared_skills, declared_skills, aliases))
+    else:
+        for title, skills in applied.values():
+            profile.update(advert_features(title, skills, aliases))
+    return profile, set(applied)
+
+
+def recommend_adverts(user, declared_skills: str = "", limit: int | None = None) -> list[JobAdvert]:
+    """
+    The open adverts closest to a jobseeker's profile, each with its score.
+    Empty until this process has built its matrix.
+    """
+    limit = limit or settings.RECOMMENDATIONS_LIMIT
+    matrix = get_matrix()
+    if matrix is None:
+        return []
+    profile, applied = build_profile(user, declared_skills, matrix.aliases)
+    if not profile:
+        return []
+
+    ranked = matrix.top(profile, limit + DELETED_SLACK, timezone.now().date(), exclude=applied)
+    adverts = JobAdvert.objects.in_bulk([advert_id for advert_id, _ in ranked])
+    recommended = []
+    for advert_id, score in ranked:
+        if advert_id in adverts:
+            adverts[advert_id].score = score
+            recommended.append(adverts[advert_id])
+    return recommended[:limit]
@@ -0,0 +1,172 @@
+from collections import defaultdict
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from common.tasks import send_email_batch
+
+from .facets import FACET_FIELDS
+from .models import JobAdvert, SavedSearch, SavedSearchMatch, SavedSearchTerm
+from .search import INDEXED_FIELDS, tokenize
+from .skills import canonical_skills, load_aliases
+
+# Indexed for saved searches without a keyword, which any advert may match
+ANY_TERM = ""
+# Adverts whose terms are looked up in one query
+MATCH_BATCH_SIZE = 100
+# Users whose digests are built and handed to send_email_batch at once
+DIGEST_BATCH_SIZE = 100
+DIGEST_ADVERTS_PER_SEARCH = 10
+# Saving an advert without touching these cannot change what it matches
+MATCHED_FIELDS = INDEXED_FIELDS | {"location", "is_published", "deadline", *FACET_FIELDS}
+
+
+class SavedSearchLimitReached(Exception):
+    pass
+
+
+def search_terms(keyword: str) -> list[str]:
+    """The terms a saved search is indexed by; search matches adverts having any of them"""
+    return list(dict.fromkeys(tokenize(keyword))) or [ANY_TERM]
+
+
+def create_saved_search(user, keyword: str, location: str, filters: dict) -> tuple[SavedSearch, bool]:
+    """The user's saved search for keyword, location and facet filters, and whether it is new"""
+    keyword, location = (keyword or "").strip(), (location or "").strip()
+    query = urlencode([
+        *[(name, value) for name, value in (("keyword", keyword), ("location", location)) if value],
+        *[(field, value) for field, values in filters.items() for value in values],
+    ])
+    existing = SavedSearch.objects.filter(user=user, query=query).first()
+    if existing:
+        return existing, False
+    if SavedSearch.objects.filter(user=user).count() >= settings.SAVED_SEARCH_LIMIT:
+        raise SavedSearchLimitReached
+
+    try:
+        with transaction.atomic():
+            saved_search = SavedSearch.objects.create(
+                user=user, query=query, keyword=keyword, location=location, filters=filters
+            )
+            SavedSearchTerm.objects.bulk_create(
+                SavedSearchTerm(term=term, saved_search=saved_search) for term in search_terms(keyword)
+            )
+    except IntegrityError:
+        # Saved twice at once, e.g. a double submit
+        return SavedSearch.objects.get(user=user, query=query), False
+    return saved_search, True
+
+
+def advert_terms(advert: JobAdvert) -> set[str]:
+    return {term for field in INDEXED_FIELDS for term in tokenize(getattr(advert, field))}
+
+
+def matches_filters(saved_search: SavedSearch, advert: JobAdvert, skills: set[str], aliases: dict) -> bool:
+    """Whether the advert passes the location and facets of a saved search its terms matched"""
+    if saved_search.location.lower() not in (advert.location or "").lower():
+        return False
+    for field, values in saved_search.filters.items():
+        if field == "skill":
+            if any(aliases.get(name, name) not in skills for name in values):
+                return False
+        elif getattr(advert, field) not in values:
+            return False
+    return True
+
+
+def match_adverts(adverts) -> int:
+    """
+    Record which saved searches each open advert matches, for the next
+    digest. Candidates come from the term index, so only the saved searches
+    sharing a term with an advert are checked, never every saved search.
+    Returns the number of matches recorded.
+    """
+    today = timezone.now().date()
+    adverts = [advert for advert in adverts if advert.is_published and advert.deadline >= today]
+    aliases = load_aliases() if adverts else {}
+    matches = []
+    for start in range(0, len(adverts), MATCH_BATCH_SIZE):
+        batch = {advert: advert_terms(advert) | {ANY_TERM} for advert in adverts[start:start + MATCH_BATCH_SIZE]}
+        saved_ids = defaultdict(set)
+        terms = SavedSearchTerm.objects.filter(term__in=set().union(*batch.values()))
+        for term, saved_search_id in terms.values_list("term", "saved_search_id"):
+            saved_ids[term].add(saved_search_id)
+        saved_searches = SavedSearch.objects.in_bulk(set().union(*saved_ids.values()))
+
+        for advert, terms in batch.items():
+            skills = set(canonical_skills(advert.skills, aliases))
+            candidates = set().union(*(saved_ids[term] for term in terms))
+            matches.extend(
+                SavedSearchMatch(saved_search_id=saved_search_id, advert=advert)
+                for saved_search_id in candidates
+                if matches_filters(saved_searches[saved_search_id], advert, skills, aliases)
+            )
+    SavedSearchMatch.objects.bulk_create(matches, ignore_conflicts=True)
+    return len(matches)
+
+
+def build_digest(user, matches: list[SavedSearchMatch]) -> dict:
+    """The send_email_batch item of one user's digest"""
+    searches = defaultdict(list)
+    for match in matches:
+        searches[match.saved_search].append(match.advert)
+    return {
+        "subject": f"{len(matches)} new {'job matches' if len(matches) == 1 else 'jobs match'} your saved searches",
+        "email_to": [user.email],
+        "html_template": "emails/saved_search_digest.html",
+        "context": {
+            "searches": [
+                {
+                    "url": saved_search.get_absolute_url(),
+                    "keyword": saved_search.keyword,
+                    "location": saved_search.location,
+                    "more": max(0, len(adverts) - DIGEST_ADVERTS_PER_SEARCH),
+                    "adverts": [
+                        {"title": advert.title, "company_name": advert.company_name,
+                         "url": advert.get_absolute_url()}
+                        for advert in adverts[:DIGEST_ADVERTS_PER_SEARCH]
+                    ],
+                }
+                for saved_search, adverts in searches.items()
+            ],
+        },
+    }
+
+
+def send_digests(batch_size: int = DIGEST_BATCH_SIZE) -> int:
+    """
+    Send every user with pending matches one digest of them all, queuing
+    batch_size users' emails per send_email_batch task, and mark the
+    matches notified. Returns the number of digests queued.
+    """
+    pending = SavedSearchMatch.objects.filter(notified_at__isnull=True)
+    today = timezone.now().date()
+    sent = 0
+    last_user_id = None
+    while True:
+        users = pending.order_by("saved_search__user_id").values_list("saved_search__user_id", flat=True).distinct()
+        if last_user_id is not None:
+            users = users.filter(saved_search__user_id__gt=last_user_id)
+        user_ids = list(users[:batch_size])
+        if not user_ids:
+            return sent
+        last_user_id = user_ids[-1]
+
+        matches = list(
+            pending.filter(saved_search__user_id__in=user_ids)
+            .select_related("saved_search__user", "advert").order_by("saved_search__created_at", "-created_at")
+        )
+        by_user = defaultdict(list)
+        for match in matches:
+            # Adverts closed since they matched are marked notified without being sent
+            if match.advert.is_published and match.advert.deadline >= today:
+                by_user[match.saved_search.user].append(match)
+
+        # Marked before sending: a digest that fails is dropped rather than sent twice
+        SavedSearchMatch.objects.filter(pk__in=[match.pk for match in matches]).update(notified_at=timezone.now())
+        emails = [build_digest(user, user_matches) for user, user_matches in by_user.items()]
+        if emails:
+            send_email_batch.delay(emails)
+        sent += len(emails)
@@ -0,0 +1,318 @@
+import math
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Case, Count, FloatField, Max, Q, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from common.cache import FailSafeCache
+
+from .facets import filter_adverts
+from .models import JobAdvert, SearchDocument, SearchPosting
+from .skills import adverts_with_skill
+
+DEFAULT_SEARCH_BACKEND = "application_tracking.search.InvertedIndexSearchBackend"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+MAX_TERM_LENGTH = 64
+
+STOP_WORDS = frozenset(
+    [
+        "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+        "is", "it", "of", "on", "or", "the", "to", "with", "we", "you", "our",
+    ]
+)
+
+# How much a single occurrence of a term counts towards its frequency,
+# per advert field. Matches in the title outrank matches in the description.
+FIELD_WEIGHTS = {
+    "title": 3,
+    "skills": 2,
+    "company_name": 2,
+    "description": 1,
+}
+
+INDEXED_FIELDS = frozenset(FIELD_WEIGHTS)
+
+# BM25 tuning constants
+K1 = 1.2
+B = 0.75
+
+STATS_CACHE_KEY = "search:index-stats"
+STATS_CACHE_TIMEOUT = 5 * 60
+
+index_stats = FailSafeCache(cache, "Search stats", "counting them from the database")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into lowercase terms, dropping stop words"""
+    if not text:
+        return []
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def get_search_backend():
+    backend_path = getattr(settings, "SEARCH_BACKEND", DEFAULT_SEARCH_BACKEND)
+    return import_string(backend_path)()
+
+
+class DatabaseSearchBackend:
+    """
+    Substring matching with icontains. Needs no index but scans the whole
+    advert table for every keyword search. Skills match whole, through the
+    skill table.
+    """
+
+    def search(self, keyword, location, filters=None):
+        return filter_adverts(self.matching_adverts(keyword, location), filters or {})
+
+    def matching_adverts(self, keyword, location):
+        query = Q()
+
+        if keyword:
+            query &= (
+                Q(title__icontains=keyword)
+                | Q(company_name__icontains=keyword)
+                | Q(description__icontains=keyword)
+                | Q(pk__in=adverts_with_skill(keyword))
+            )
+
+        if location:
+            query &= Q(location__icontains=location)
+
+        return JobAdvert.objects.active().filter(query)
+
+    async def asearch(self, keyword, location, filters=None):
+        # Building the queryset runs no queries
+        return self.search(keyword, location, filters)
+
+    def index(self, advert: JobAdvert) -> None:
+        pass
+
+    def index_many(self, adverts) -> None:
+        pass
+
+    def remove(self, advert: JobAdvert) -> None:
+        pass
+
+    def rebuild(self) -> int:
+        return 0
+
+
+class SearchResults:
+    """
+    Ranked hits from the inverted index. Scores are summed by the database
+    and adverts are only fetched for the slice being displayed, so a
+    Paginator can page through the hits without loading every match.
+    """
+
+    def __init__(self, ranked_postings):
+        self.ranked_postings = ranked_postings
+
+    def count(self) -> int:
+        return self.ranked_postings.count()
+
+    async def acount(self) -> int:
+        return await self.ranked_postings.acount()
+
+    async def aslice(self, start: int, stop: int) -> list[JobAdvert]:
+        ids = [row["advert_id"] async for row in self.ranked_postings[start:stop]]
+        adverts = await JobAdvert.objects.ain_bulk(ids)
+        return [adverts[advert_id] for advert_id in ids if advert_id in adverts]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            ids = [row["advert_id"] for row in self.ranked_postings[index]]
+            adverts = JobAdvert.objects.in_bulk(ids)
+            return [adverts[advert_id] for advert_id in ids if advert_id in adverts]
+        return self[index:index + 1][0]
+
+
+class InvertedIndexSearchBackend:
+    """
+    Ranks adverts with BM25 over posting lists stored in SearchPosting.
+    Only the postings of the query terms are read, so the cost of a search
+    depends on how common its terms are rather than on the number of adverts.
+    """
+
+    batch_size = 1000
+
+    def build_postings(self, advert: JobAdvert) -> tuple[list[SearchPosting], int]:
+        frequencies = Counter()
+        length = 0
+        for field, weight in FIELD_WEIGHTS.items():
+            tokens = tokenize(getattr(advert, field))
+            length += len(tokens)
+            for token in tokens:
+                frequencies[token] += weight
+
+        postings = [
+            SearchPosting(
+                term=term,
+                advert_id=advert.pk,
+                frequency=frequency,
+                document_length=length,
+            )
+            for term, frequency in frequencies.items()
+        ]
+        return postings, length
+
+    def index(self, advert: JobAdvert) -> None:
+        postings, length = self.build_postings(advert)
+        with transaction.atomic():
+            SearchPosting.objects.filter(advert_id=advert.pk).delete()
+            SearchPosting.objects.bulk_create(postings)
+            SearchDocument.objects.update_or_create(
+                advert_id=advert.pk, defaults={"length": length}
+            )
+
+    def index_many(self, adverts) -> None:
+        """Index adverts that are not in the index yet, e.g. straight after bulk_create"""
+        postings, documents = [], []
+        for advert in adverts:
+            advert_postings, length = self.build_postings(advert)
+            postings.extend(advert_postings)
+            documents.append(SearchDocument(advert_id=advert.pk, length=length))
+        with transaction.atomic():
+            SearchPosting.objects.bulk_create(postings, batch_size=self.batch_size)
+            SearchDocument.objects.bulk_create(documents, batch_size=self.batch_size)
+
+    def remove(self, advert: JobAdvert) -> None:
+        # Postings and the document row cascade with the advert; this is for
+        # callers that want an advert out of the index while it still exists.
+        SearchPosting.objects.filter(advert_id=advert.pk).delete()
+        SearchDocument.objects.filter(advert_id=advert.pk).delete()
+
+    def rebuild(self) -> int:
+        """Drop the whole index and re-index every advert. Returns the advert count"""
+        total = 0
+        with transaction.atomic():
+            SearchPosting.objects.all().delete()
+            SearchDocument.objects.all().delete()
+
+            postings, documents = [], []
+            for advert in JobAdvert.objects.order_by().iterator(chunk_size=self.batch_size):
+                advert_postings, length = self.build_postings(advert)
+                postings.extend(advert_postings)
+                documents.append(SearchDocument(advert_id=advert.pk, length=length))
+                total += 1
+
+                if len(documents) >= self.batch_size:
+                    SearchPosting.objects.bulk_create(postings, batch_size=self.batch_size)
+                    SearchDocument.objects.bulk_create(documents)
+                    postings, documents = [], []
+
+            SearchPosting.objects.bulk_create(postings, batch_size=self.batch_size)
+            SearchDocument.objects.bulk_create(documents)
+
+        index_stats.delete(STATS_CACHE_KEY)
+        return total
+
+    def get_stats(self) -> tuple[int, float]:
+        """Document count and average document length, cached for a few minutes"""
+        stats = index_stats.get(STATS_CACHE_KEY)
+        if stats is None:
+            aggregate = SearchDocument.objects.aggregate(total=Count("advert_id"), avg_length=Avg("length"))
+            stats = (aggregate["total"], float(aggregate["avg_length"] or 0))
+            index_stats.set(STATS_CACHE_KEY, stats, STATS_CACHE_TIMEOUT)
+        return stats
+
+    async def aget_stats(self) -> tuple[int, float]:
+        stats = await index_stats.aget(STATS_CACHE_KEY)
+        if stats is None:
+            aggregate = await SearchDocument.objects.aaggregate(total=Count("advert_id"), avg_length=Avg("length"))
+            stats = (aggregate["total"], float(aggregate["avg_length"] or 0))
+            await index_stats.aset(STATS_CACHE_KEY, stats, STATS_CACHE_TIMEOUT)
+        return stats
+
+    def matching_postings(self, terms: list[str], location, filters=None):
+        postings = SearchPosting.objects.filter(
+            term__in=terms,
+            advert__is_published=True,
+            advert__deadline__gte=timezone.now().date(),
+        )
+        if location:
+            postings = postings.filter(advert__location__icontains=location)
+        return filter_adverts(postings, filters or {}, prefix="advert__")
+
+    def matching_adverts(self, keyword, location):
+        """Every active advert the search would rank, unranked and unfiltered by facets"""
+        terms = list(dict.fromkeys(tokenize(keyword)))
+        if not terms:
+            if keyword:
+                return JobAdvert.objects.none()
+            return DatabaseSearchBackend().matching_adverts(keyword, location)
+        advert_ids = self.matching_postings(terms, location).values("advert_id")
+        return JobAdvert.objects.active().filter(pk__in=advert_ids)
+
+    def document_frequencies(self, terms: list[str]):
+        return (
+            SearchPosting.objects.filter(term__in=terms)
+            .values("term")
+            .annotate(df=Count("id"))
+            .values_list("term", "df")
+        )
+
+    def rank(self, postings, document_frequencies: dict, stats: tuple[int, float]) -> SearchResults:
+        if not document_frequencies:
+            return SearchResults(postings.none().values("advert_id"))
+
+        total_documents, avg_length = stats
+        total_documents = max(total_documents, max(document_frequencies.values()))
+        avg_length = avg_length or 1.0
+
+        idf = Case(
+            *[
+                When(term=term, then=Value(math.log(1 + (total_documents - df + 0.5) / (df + 0.5))))
+                for term, df in document_frequencies.items()
+            ],
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+        frequency = Cast("frequency", FloatField())
+        norm = Value(K1 * (1 - B)) + Value(K1 * B / avg_length) * Cast("document_length", FloatField())
+        score = idf * frequency * Value(K1 + 1) / (frequency + norm)
+
+        ranked_postings = (
+            postings.values("advert_id")
+            .annotate(score=Sum(score), created_at=Max("advert__created_at"))
+            .order_by("-score", "-created_at")
+        )
+        return SearchResults(ranked_postings)
+
+    def search(self, keyword, location, filters=None):
+        terms = list(dict.fromkeys(tokenize(keyword)))
+        if not terms:
+            if keyword:
+                return JobAdvert.objects.none()
+            return DatabaseSearchBackend().search(keyword, location, filters)
+
+        document_frequencies = dict(self.document_frequencies(terms))
+        stats = self.get_stats() if document_frequencies else (0, 0.0)
+        return self.rank(self.matching_postings(terms, location, filters), document_frequencies, stats)
+
+    async def asearch(self, keyword, location, filters=None):
+        terms = list(dict.fromkeys(tokenize(keyword)))
+        if not terms:
+            if keyword:
+                return JobAdvert.objects.none()
+            return DatabaseSearchBackend().search(keyword, location, filters)
+
+        document_frequencies = {term: df async for term, df in self.document_frequencies(terms)}
+        stats = await self.aget_stats() if document_frequencies else (0, 0.0)
+        return self.rank(self.matching_postings(terms, location, filters), document_frequencies, stats)
@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.storage import ContentAddressedStorage
+
+from .listing_cache import bump_generation
+from .models import ArchivedJobApplication, CVBlob, JobAdvert, JobApplication
+from .saved_searches import MATCHED_FIELDS
+from .search import INDEXED_FIELDS, get_search_backend
+from .skills import sync_advert_skills
+from .tasks import match_saved_searches
+
+
+@receiver(post_save, sender=JobAdvert)
+def index_job_advert(sender, instance: JobAdvert, created, update_fields=None, **kwargs):
+    if update_fields and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    get_search_backend().index(instance)
+
+
+@receiver(post_save, sender=JobAdvert)
+def link_job_advert_skills(sender, instance: JobAdvert, created, update_fields=None, **kwargs):
+    if update_fields and "skills" not in update_fields:
+        return
+    sync_advert_skills([instance], created=created)
+
+
+@receiver(post_save, sender=JobAdvert)
+def match_job_advert_to_saved_searches(sender, instance: JobAdvert, created, update_fields=None, **kwargs):
+    if update_fields and not MATCHED_FIELDS.intersection(update_fields):
+        return
+    transaction.on_commit(lambda: match_saved_searches.delay([str(instance.pk)]))
+
+
+@receiver(post_delete, sender=JobAdvert)
+def remove_job_advert_from_index(sender, instance: JobAdvert, **kwargs):
+    get_search_backend().remove(instance)
+
+
+@receiver(post_save, sender=JobAdvert)
+@receiver(post_delete, sender=JobAdvert)
+def invalidate_listing_cache(sender, instance: JobAdvert, **kwargs):
+    # Bump again once the change is visible to other connections, so a page
+    # cached by a concurrent request in between cannot outlive it.
+    bump_generation()
+    transaction.on_commit(bump_generation)
+
+
+@receiver(post_save, sender=JobApplication)
+def add_cv_reference(sender, instance: JobApplication, created, **kwargs):
+    storage = instance.cv.storage
+    if created and isinstance(storage, ContentAddressedStorage) and storage.owns(instance.cv.name):
+        CVBlob.add_reference(instance.cv.name, instance.cv.size)
+
+
+@receiver(post_delete, sender=JobApplication)
+@receiver(post_delete, sender=ArchivedJobApplication)
+def remove_cv_reference(sender, instance: JobApplication | ArchivedJobApplication, **kwargs):
+    if instance.cv.name:
+        CVBlob.remove_reference(instance.cv.name)
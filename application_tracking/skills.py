@@ -0,0 +1,87 @@
+import re
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import AdvertSkill, JobAdvert, Skill, SkillAlias
+
+SKILL_SEPARATOR = re.compile(r"[,;\n]")
+MAX_SKILL_LENGTH = 64
+SKILL_SYNC_BATCH_SIZE = 1000
+
+
+def normalize_skill(name: str | None) -> str:
+    return " ".join((name or "").lower().split())[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(text: str | None) -> list[str]:
+    """The distinct normalized skills of a comma separated list, in order"""
+    names = (normalize_skill(name) for name in SKILL_SEPARATOR.split(text or ""))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def canonical_skill_ids(names) -> dict[str, int]:
+    """
+    Map each normalized name to the id of its canonical Skill, resolving
+    aliases and creating missing skills, in a fixed number of queries.
+    """
+    if not names:
+        return {}
+    aliases = dict(SkillAlias.objects.filter(alias__in=names).values_list("alias", "skill__name"))
+    canonical = {name: aliases.get(name, name) for name in names}
+
+    skill_ids = dict(Skill.objects.filter(name__in=set(canonical.values())).values_list("name", "id"))
+    missing = set(canonical.values()) - skill_ids.keys()
+    if missing:
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        skill_ids.update(Skill.objects.filter(name__in=missing).values_list("name", "id"))
+    return {name: skill_ids[canonical[name]] for name in names}
+
+
+def sync_advert_skills(adverts, created: bool = False) -> int:
+    """
+    Replace the skill links of adverts with the canonical skills parsed
+    from their skills text. Adverts that were just created have no links to
+    delete. Returns the number of links written.
+    """
+    parsed = {advert.pk: parse_skills(advert.skills) for advert in adverts}
+    skill_ids = canonical_skill_ids({name for names in parsed.values() for name in names})
+    pairs = {(advert_id, skill_ids[name]) for advert_id, names in parsed.items() for name in names}
+    links = [AdvertSkill(advert_id=advert_id, skill_id=skill_id) for advert_id, skill_id in pairs]
+    if created:
+        AdvertSkill.objects.bulk_create(links, batch_size=SKILL_SYNC_BATCH_SIZE)
+    else:
+        with transaction.atomic():
+            AdvertSkill.objects.filter(advert_id__in=parsed).delete()
+            AdvertSkill.objects.bulk_create(links, batch_size=SKILL_SYNC_BATCH_SIZE)
+    return len(links)
+
+
+def sync_all_advert_skills(batch_size: int = SKILL_SYNC_BATCH_SIZE) -> int:
+    """Re-link every advert, batch_size adverts per transaction. Returns the advert count"""
+    adverts = JobAdvert.objects.order_by("pk").only("pk", "skills")
+    total, last_pk = 0, None
+    while True:
+        batch = list((adverts.filter(pk__gt=last_pk) if last_pk else adverts)[:batch_size])
+        if not batch:
+            return total
+        sync_advert_skills(batch)
+        total += len(batch)
+        last_pk = batch[-1].pk
+
+
+def adverts_with_skill(name: str):
+    """Ids of the adverts linked to a skill or to the skill an alias points at, for pk__in"""
+    name = normalize_skill(name)
+    skills = Skill.objects.filter(Q(name=name) | Q(aliases__alias=name)).values("id")
+    return AdvertSkill.objects.filter(skill__in=skills).values("advert_id")
+
+
+def load_aliases() -> dict[str, str]:
+    """Every alias with the name of its canonical skill"""
+    return dict(SkillAlias.objects.values_list("alias", "skill__name"))
+
+
+def canonical_skills(text: str | None, aliases: dict[str, str]) -> list[str]:
+    """The canonical names of the skills in a comma separated list"""
+    return list(dict.fromkeys(aliases.get(name, name) for name in parse_skills(text)))
@@ -0,0 +1,161 @@
+import logging
+import time
+
+from celery import shared_task
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from accounts.models import User
+from common.tasks import send_email
+
+from . import archive, saved_searches
+from .cv_text import extract_application_cv, record_throughput
+from .imports import InvalidImportFile, import_adverts, read_rows
+from .models import COUNTER_FIELDS, CVBlob, JobAdvert, JobApplication, count_applicants
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_applicant_counters(batch_size: int = 500) -> int:
+    """
+    Recompute the denormalized applicant counters on JobAdvert from the
+    applications table and fix any that drifted. Returns the number of adverts corrected.
+    """
+    corrected = 0
+    last_id = None
+    while True:
+        # Lock the batch so concurrent applications wait instead of having
+        # their increments overwritten by the recomputed values.
+        with transaction.atomic():
+            adverts = JobAdvert.objects.order_by("pk").only("pk", *COUNTER_FIELDS)
+            if last_id is not None:
+                adverts = adverts.filter(pk__gt=last_id)
+            adverts = list(adverts.select_for_update()[:batch_size])
+            if not adverts:
+                break
+            last_id = adverts[-1].pk
+
+            counters = count_applicants([advert.pk for advert in adverts])
+            stale = []
+            for advert in adverts:
+                expected = counters[advert.pk]
+                if any(getattr(advert, field) != value for field, value in expected.items()):
+                    for field, value in expected.items():
+                        setattr(advert, field, value)
+                    stale.append(advert)
+
+            JobAdvert.objects.bulk_update(stale, COUNTER_FIELDS)
+            corrected += len(stale)
+
+    if corrected:
+        logger.warning("Corrected applicant counters on %s adverts", corrected)
+    return corrected
+
+
+@shared_task
+def collect_unreferenced_cvs(batch_size: int = 500) -> int:
+    """
+    Delete CV blobs no application references any more. Blobs whose file was
+    written or re-uploaded within CV_BLOB_GRACE_PERIOD seconds are kept, since
+    an application referencing them may not have been committed yet.
+    Returns the number of blobs removed.
+    """
+    storage = JobApplication._meta.get_field("cv").storage
+    cutoff = time.time() - getattr(settings, "CV_BLOB_GRACE_PERIOD", 60 * 60)
+    removed = 0
+    last_id = None
+
+    while True:
+        candidates = CVBlob.objects.filter(ref_count=0).order_by("pk")
+        if last_id is not None:
+            candidates = candidates.filter(pk__gt=last_id)
+        candidate_ids = list(candidates.values_list("pk", flat=True)[:batch_size])
+        if not candidate_ids:
+            break
+        last_id = candidate_ids[-1]
+
+        for blob_id in candidate_ids:
+            with transaction.atomic():
+                blob = CVBlob.objects.select_for_update().filter(pk=blob_id, ref_count=0).first()
+                if blob is None:
+                    continue
+                if storage.exists(blob.name):
+                    if storage.get_modified_time(blob.name).timestamp() > cutoff:
+                        continue
+                    storage.delete(blob.name)
+                blob.delete()
+                removed += 1
+
+    if removed:
+        logger.info("Removed %s unreferenced CV blobs", removed)
+    return removed
+
+
+@shared_task
+def archive_expired_adverts(batch_size: int = archive.ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Move adverts past their deadline plus ARCHIVE_RETENTION_DAYS, and their
+    applications, into the archive tables. Returns the number of adverts archived.
+    """
+    adverts, applications = archive.archive_expired_adverts(batch_size)
+    if adverts:
+        logger.info("Archived %s adverts and %s applications", adverts, applications)
+    return adverts
+
+
+@shared_task(bind=True)
+def extract_cv_text(self, application_id) -> str | None:
+    """
+    Extract the text of an application's CV for keyword filtering. Routed to
+    the cv_extraction queue so slow documents never hold up emails.
+    """
+    application = JobApplication.objects.filter(pk=application_id).only("pk", "job_advert_id", "cv").first()
+    if application is None:
+        return None
+
+    started = time.perf_counter()
+    document = extract_application_cv(application)
+    record_throughput(self.request.hostname or "local", 1, time.perf_counter() - started)
+    if document is None:
+        return None
+    if document.error:
+        logger.info("Could not extract CV of application %s: %s", application_id, document.error)
+    return document.status
+
+
+@shared_task
+def import_adverts_file(name: str, owner_id, import_format: str) -> dict:
+    """Import an uploaded advert feed too large to handle in the request, then email the report"""
+    owner = User.objects.get(pk=owner_id)
+    try:
+        with default_storage.open(name) as feed:
+            report = import_adverts(read_rows(feed.read(), import_format), owner)
+    except InvalidImportFile as error:
+        report = {"total": 0, "created": 0, "errors": [{"row": 0, "errors": {"file": [{"message": str(error)}]}}]}
+    finally:
+        default_storage.delete(name)
+
+    send_email(
+        "Your job advert import has finished",
+        [owner.email],
+        "emails/advert_import_report.html",
+        {"report": report},
+    )
+    return report
+
+
+@shared_task
+def match_saved_searches(advert_ids: list[str]) -> int:
+    """Record the saved searches that new or changed adverts match, for the next digest"""
+    return saved_searches.match_adverts(JobAdvert.objects.filter(pk__in=advert_ids))
+
+
+@shared_task
+def send_saved_search_digests() -> int:
+    """Email every user one digest of the adverts that matched their saved searches"""
+    sent = saved_searches.send_digests()
+    if sent:
+        logger.info("Queued %s saved search digests", sent)
+    return sent
@@ -13,7 +13,7 @@ class JobAdvertFactory(factory.django.DjangoModelFactory):
 
     title = fake.job()
     company_name = fake.company()
-    description = fake.sentence()
+    description = factory.Sequence(lambda n: f"{fake.sentence()} {n}")
     skills = "Python, Django"
     deadline = fake.date()
 
@@ -24,5 +24,6 @@ class JobApplicationFactory(factory.django.DjangoModelFactory):
 
     
     name = fake.name()
+    email = factory.Sequence(lambda n: f"applicant{n}@example.com")
     portfolio_url = fake.url()
     cv = fake.file_path()
@@ -0,0 +1,148 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from application_tracking.archive import dependents
+from application_tracking.cv_text import store_cv_text
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import (AdvertSkill, ApplicantTerm, ArchivedJobAdvert, ArchivedJobApplication, CVBlob,
+                                         CVDocument, JobAdvert, JobApplication, SavedSearchMatch, SearchDocument,
+                                         SearchPosting)
+from application_tracking.tasks import archive_expired_adverts
+
+from .factories import JobAdvertFactory, JobApplicationFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.ARCHIVE_RETENTION_DAYS = 30
+    return tmp_path
+
+
+def days_ago(days: int):
+    return timezone.now().date() - timedelta(days=days)
+
+
+def test_archive_moves_old_adverts_and_their_applications(user_instance):
+    old = JobAdvertFactory(created_by=user_instance, title="Old Kotlin Job", deadline=days_ago(31))
+    recently_closed = JobAdvertFactory(created_by=user_instance, deadline=days_ago(29))
+    application = JobApplicationFactory(job_advert=old, email="old@example.com", status=ApplicationStatus.INTERVIEW,
+                                        cv=SimpleUploadedFile("cv.pdf", b"%PDF-1.4 cv"))
+    JobApplicationFactory(job_advert=recently_closed)
+    store_cv_text(application, "kotlin", ["kotlin"])
+    old.record_application(ApplicationStatus.INTERVIEW)
+
+    assert archive_expired_adverts() == 1
+
+    assert list(JobAdvert.objects.all()) == [recently_closed]
+    assert JobApplication.objects.get().job_advert == recently_closed
+    assert not SearchPosting.objects.filter(advert_id=old.pk).exists()
+    assert not ApplicantTerm.objects.exists()
+    assert not CVDocument.objects.exists()
+
+    archived = ArchivedJobAdvert.objects.get()
+    assert (archived.pk, archived.title, archived.created_at) == (old.pk, "Old Kotlin Job", old.created_at)
+    assert (archived.created_by, archived.total_applicants, archived.interview_count) == (user_instance, 1, 1)
+    archived_application = ArchivedJobApplication.objects.get()
+    assert archived_application.pk == application.pk
+    assert archived_application.job_advert == archived
+    assert archived_application.status == ApplicationStatus.INTERVIEW
+    assert archived_application.created_at == application.created_at
+
+    # The archived application still holds its CV
+    assert CVBlob.objects.get(name=application.cv.name).ref_count == 1
+    archived_application.delete()
+    assert CVBlob.objects.get(name=application.cv.name).ref_count == 0
+
+
+def test_archive_deletes_every_dependent_of_adverts_and_applications():
+    assert dependents(JobAdvert) == {
+        CVDocument: ["application__job_advert__pk"],
+        ApplicantTerm: ["application__job_advert__pk", "job_advert__pk"],
+        AdvertSkill: ["advert__pk"],
+        SavedSearchMatch: ["advert__pk"],
+        SearchDocument: ["advert__pk"],
+        SearchPosting: ["advert__pk"],
+    }
+
+
+def test_archive_runs_in_batches(user_instance, django_assert_max_num_queries):
+    for _ in range(5):
+        JobApplicationFactory.create_batch(2, job_advert=JobAdvertFactory(created_by=user_instance,
+                                                                          deadline=days_ago(40)))
+
+    # Three batches and a final empty one, each a fixed number of statements
+    # however many applications the adverts have
+    with django_assert_max_num_queries(45):
+        assert archive_expired_adverts(batch_size=2) == 5
+
+    assert not JobAdvert.objects.exists() and not JobApplication.objects.exists()
+    assert ArchivedJobAdvert.objects.count() == 5
+    assert ArchivedJobApplication.objects.count() == 10
+
+
+def test_archived_descriptions_can_be_reused(user_instance):
+    old = JobAdvertFactory(created_by=user_instance, deadline=days_ago(40))
+    archive_expired_adverts()
+
+    JobAdvertFactory(created_by=user_instance, description=old.description)
+
+
+def test_job_history(employer_client):
+    client, employer = employer_client
+    advert = JobAdvertFactory(created_by=employer, title="Archived Role", deadline=days_ago(40))
+    JobApplicationFactory(job_advert=advert, name="Old Applicant")
+    JobAdvertFactory(created_by=User.objects.create(email="other@example.com", role="employer"),
+                     title="Someone Else's Role", deadline=days_ago(40))
+    archive_expired_adverts()
+
+    response = client.get(reverse("job_history"))
+    assert response.status_code == 200
+    assert [job.title for job in response.context["my_jobs"]] == ["Archived Role"]
+
+    response = client.get(reverse("archived_advert_applications", kwargs={"advert_id": advert.pk}))
+    assert response.status_code == 200
+    assert [application.name for application in response.context["applications"]] == ["Old Applicant"]
+
+
+def test_archived_applications_are_only_visible_to_the_owner(employer_client, user_instance):
+    client, _ = employer_client
+    advert = JobAdvertFactory(created_by=user_instance, deadline=days_ago(40))
+    archive_expired_adverts()
+
+    response = client.get(reverse("archived_advert_applications", kwargs={"advert_id": advert.pk}))
+    assert response.status_code == 403
+
+
+def test_application_history(authenticate_user_client):
+    client, user = authenticate_user_client
+    old = JobAdvertFactory(created_by=user, title="Archived Role", deadline=days_ago(40))
+    current = JobAdvertFactory(created_by=user, title="Current Role", deadline=days_ago(-10))
+    JobApplicationFactory(job_advert=old, email=user.email.upper())
+    JobApplicationFactory(job_advert=current, email=user.email)
+    archive_expired_adverts()
+
+    response = client.get(reverse("application_history"))
+    assert [application.job_advert.title for application in response.context["my_applications"]] == ["Archived Role"]
+
+    response = client.get(reverse("my_applications"))
+    assert [application.job_advert.title for application in response.context["my_applications"]] == ["Current Role"]
+
+
+def test_archive_command(user_instance):
+    JobAdvertFactory(created_by=user_instance, deadline=days_ago(40))
+    out = io.StringIO()
+
+    call_command("archive_adverts", stdout=out)
+
+    assert "Archived 1 adverts and 0 applications" in out.getvalue()
+    assert ArchivedJobAdvert.objects.count() == 1
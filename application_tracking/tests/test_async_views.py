@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+
+from application_tracking import views
+
+from .factories import JobAdvertFactory, JobApplicationFactory, fake
+
+# AsyncClient runs requests through the ASGI handler, whose ORM calls use
+# other threads than the test's, so the rows must be committed
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture(autouse=True)
+def eager_tasks(settings):
+    # Committed advert saves queue saved search matching
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+
+@pytest.mark.parametrize("view", [views.home, views.search, views.get_advert, views.my_applications])
+def test_read_heavy_views_are_async(view):
+    assert asyncio.iscoroutinefunction(view)
+
+
+def get(client: AsyncClient, url, data=None):
+    return async_to_sync(client.get)(url, data)
+
+
+def test_home_and_search_under_asgi(user_instance):
+    JobAdvertFactory(created_by=user_instance, title="Elixir Developer", deadline=fake.future_date())
+    JobAdvertFactory(created_by=user_instance, title="Accountant", deadline=fake.future_date())
+    client = AsyncClient()
+
+    response = get(client, reverse("home"))
+    assert response.status_code == 200
+    assert response.content.count(b'class="job-card"') == 2
+
+    response = get(client, reverse("search"), {"keyword": "elixir"})
+    assert response.status_code == 200
+    assert b"Elixir Developer" in response.content
+    assert b"Accountant" not in response.content
+
+    # Served from the listing cache the second time
+    assert get(client, reverse("search"), {"keyword": "elixir"}).content == response.content
+
+
+def test_get_advert_under_asgi(user_instance):
+    advert = JobAdvertFactory(created_by=user_instance, title="Scala Engineer")
+    client = AsyncClient()
+
+    response = get(client, reverse("job_advert", kwargs={"advert_id": advert.id}))
+    assert response.status_code == 200
+    assert b"Scala Engineer" in response.content
+
+    response = get(client, reverse("job_advert", kwargs={"advert_id": user_instance.id}))
+    assert response.status_code == 404
+
+
+def test_my_applications_under_asgi(user_instance):
+    advert = JobAdvertFactory(created_by=user_instance, title="Clojure Engineer")
+    JobApplicationFactory(job_advert=advert, email=user_instance.email)
+    client = AsyncClient()
+
+    response = get(client, reverse("my_applications"))
+    assert response.status_code == 302
+
+    async_to_sync(client.aforce_login)(user_instance)
+    response = get(client, reverse("my_applications"))
+    assert response.status_code == 200
+    assert b"Clojure Engineer" in response.content
+    assert response.context["user"] == user_instance
+
+
+def test_query_budget_middleware_counts_async_queries(user_instance, settings):
+    settings.QUERY_BUDGET_ENABLED = True
+    advert = JobAdvertFactory(created_by=user_instance)
+
+    response = get(AsyncClient(), reverse("job_advert", kwargs={"advert_id": advert.id}))
+    assert response["X-Query-Count"] == "1"
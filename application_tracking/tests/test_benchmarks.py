@@ -0,0 +1,72 @@
+import asyncio
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from application_tracking.management.commands.benchmark_servers import run_load
+from common.benchmark import find_regressions
+
+pytestmark = pytest.mark.django_db
+
+
+def test_find_regressions():
+    baseline = {"home": {"p50_ms": 10, "p95_ms": 20, "queries": 2}}
+
+    assert find_regressions(baseline, {"home": {"p50_ms": 11, "p95_ms": 21, "queries": 2}}, 0.2) == []
+    assert find_regressions(baseline, {"home": {"p50_ms": 13, "p95_ms": 20, "queries": 3}}, 0.2) == [
+        "home: p50_ms 10 -> 13",
+        "home: queries 2 -> 3",
+    ]
+
+
+def test_benchmark_views_saves_and_compares_baselines(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    call_command("benchmark_views", scale=20, repeat=2, warmup=0, save=str(baseline), stdout=io.StringIO())
+
+    results = json.loads(baseline.read_text())
+    assert results["scale"] == 20
+    assert set(results["views"]) == {
+        "home", "search", "get_advert", "apply", "my_jobs", "my_applications", "advert_applications", "decide"
+    }
+    assert all(summary["queries"] >= 0 and summary["runs"] == 2 for summary in results["views"].values())
+
+    results["views"]["decide"]["queries"] = 0
+    baseline.write_text(json.dumps(results))
+    with pytest.raises(CommandError, match="decide: queries 0 ->"):
+        call_command("benchmark_views", scale=20, repeat=2, warmup=0, views=["decide"],
+                     compare=str(baseline), stdout=io.StringIO())
+
+
+def test_server_load_generator_counts_failures():
+    async def serve(reader, writer):
+        request_line = await reader.readline()
+        while await reader.readline() not in (b"\r\n", b""):
+            pass
+        status = b"200 OK" if b"/ok" in request_line else b"500 Internal Server Error"
+        writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 0\r\n\r\n")
+        await writer.drain()
+        writer.close()
+
+    async def load():
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await run_load(port, ["/ok", "/ok", "/broken"], concurrency=4, total=30, seed=1,
+                                  client_delay=0.001)
+
+    summary = asyncio.run(load())
+    assert summary["runs"] == 30
+    assert 0 < summary["failures"] < 30
+    assert summary["requests_per_second"] > 0
+
+
+def test_benchmark_sessions_reports_queries_per_request(tmp_path):
+    results_path = tmp_path / "sessions.json"
+    call_command("benchmark_sessions", sessions=5, repeat=10, save=str(results_path), stdout=io.StringIO())
+
+    results = json.loads(results_path.read_text())
+    assert results["db"]["read"]["queries_per_request"] == 1
+    assert results["redis"]["read"]["queries_per_request"] == 0
+    assert results["redis"]["write"]["runs"] == 10
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+
+from application_tracking.models import CVBlob, JobApplication
+from application_tracking.tasks import collect_unreferenced_cvs
+
+from .factories import JobAdvertFactory, JobApplicationFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def apply_with_cv(advert, email, content=b"%PDF-1.4 same cv"):
+    return JobApplicationFactory(
+        job_advert=advert, email=email, cv=SimpleUploadedFile("my cv.pdf", content)
+    )
+
+
+def test_identical_cvs_are_stored_once(user_instance, media_root):
+    first = apply_with_cv(JobAdvertFactory(created_by=user_instance), "a@example.com")
+    second = apply_with_cv(JobAdvertFactory(created_by=user_instance), "a@example.com")
+
+    assert first.cv.name == second.cv.name
+    assert first.cv.name.startswith("cv/") and first.cv.name.endswith(".pdf")
+    assert first.cv.read() == b"%PDF-1.4 same cv"
+
+    stored_files = [name for _, _, names in os.walk(media_root / "cv") for name in names]
+    assert len(stored_files) == 1
+    assert CVBlob.objects.get(name=first.cv.name).ref_count == 2
+
+
+def test_unreferenced_cvs_are_collected(user_instance, settings):
+    settings.CV_BLOB_GRACE_PERIOD = 0
+    application = apply_with_cv(JobAdvertFactory(created_by=user_instance), "a@example.com")
+    name, storage = application.cv.name, application.cv.storage
+
+    assert collect_unreferenced_cvs() == 0
+    application.delete()
+    assert CVBlob.objects.get(name=name).ref_count == 0
+
+    assert collect_unreferenced_cvs() == 1
+    assert not storage.exists(name)
+    assert not CVBlob.objects.exists()
+
+
+def test_recently_uploaded_blobs_survive_collection(user_instance):
+    application = apply_with_cv(JobAdvertFactory(created_by=user_instance), "a@example.com")
+    application.delete()
+
+    assert collect_unreferenced_cvs() == 0
+    assert application.cv.storage.exists(application.cv.name)
+
+
+def test_migrate_cv_storage_moves_legacy_files(user_instance):
+    legacy_storage = FileSystemStorage()
+    advert = JobAdvertFactory(created_by=user_instance)
+    for email in ("a@example.com", "b@example.com"):
+        legacy_name = legacy_storage.save("resume.pdf", ContentFile(b"legacy cv"))
+        JobApplicationFactory(job_advert=advert, email=email, cv=legacy_name)
+
+    call_command("migrate_cv_storage")
+
+    names = set(JobApplication.objects.values_list("cv", flat=True))
+    assert len(names) == 1
+    [name] = names
+    assert name.startswith("cv/")
+    assert CVBlob.objects.get(name=name).ref_count == 2
+    assert not legacy_storage.exists("resume.pdf")
@@ -0,0 +1,113 @@
+import io
+import zipfile
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+
+from application_tracking.cv_text import UnsupportedDocument, extract_cv, extraction_stats
+from application_tracking.enums import CVExtractionStatus
+from application_tracking.models import ApplicantTerm, CVDocument
+from application_tracking.tasks import extract_cv_text
+
+from .factories import JobAdvertFactory, JobApplicationFactory, fake
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def make_docx(*paragraphs: str) -> bytes:
+    namespace = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t>{paragraph}</w:t></w:r></w:p>" for paragraph in paragraphs)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", f'<w:document xmlns:w="{namespace}"><w:body>{body}</w:body></w:document>')
+    return buffer.getvalue()
+
+
+def apply_with_cv(advert, filename, content):
+    return JobApplicationFactory(
+        job_advert=advert, email=fake.email(), cv=SimpleUploadedFile(filename, content)
+    )
+
+
+def test_extract_docx(tmp_path):
+    path = tmp_path / "cv.docx"
+    path.write_bytes(make_docx("Senior  Python developer", "Django and PostgreSQL"))
+
+    text, terms = extract_cv(str(path))
+
+    assert text == "Senior Python developer Django and PostgreSQL"
+    assert terms == ["senior", "python", "developer", "django", "postgresql"]
+
+
+def test_extract_rejects_unknown_and_corrupt_files(tmp_path):
+    (tmp_path / "cv.txt").write_text("plain text")
+    (tmp_path / "cv.docx").write_bytes(b"not a zip")
+
+    with pytest.raises(UnsupportedDocument):
+        extract_cv(str(tmp_path / "cv.txt"))
+    with pytest.raises(UnsupportedDocument):
+        extract_cv(str(tmp_path / "cv.docx"))
+
+
+def test_extract_cv_text_task(user_instance):
+    advert = JobAdvertFactory(created_by=user_instance)
+    application = apply_with_cv(advert, "cv.docx", make_docx("Python developer"))
+
+    assert extract_cv_text(application.pk) == CVExtractionStatus.DONE
+
+    assert CVDocument.objects.get(application=application).text == "Python developer"
+    assert set(ApplicantTerm.objects.filter(application=application).values_list("term", flat=True)) == {
+        "python", "developer"
+    }
+    [stats] = extraction_stats()
+    assert stats["documents"] == 1
+
+
+def test_unreadable_cv_is_marked_failed(user_instance):
+    application = apply_with_cv(JobAdvertFactory(created_by=user_instance), "cv.pdf", b"not a pdf")
+
+    assert extract_cv_text(application.pk) == CVExtractionStatus.FAILED
+    assert CVDocument.objects.get(application=application).error
+
+
+def test_filter_applicants_by_cv_keyword(employer_client):
+    client, employer = employer_client
+    advert = JobAdvertFactory(created_by=employer)
+    python_dev = apply_with_cv(advert, "a.docx", make_docx("Python and Django developer"))
+    java_dev = apply_with_cv(advert, "b.docx", make_docx("Java developer"))
+    for application in (python_dev, java_dev):
+        extract_cv_text(application.pk)
+
+    url = reverse("advert_applications", kwargs={"advert_id": advert.id})
+    response = client.get(url, {"keyword": "django python"})
+    assert list(response.context["applications"]) == [python_dev]
+
+    response = client.get(url, {"keyword": "developer"})
+    assert set(response.context["applications"]) == {python_dev, java_dev}
+
+    response = client.get(url)
+    assert len(response.context["applications"]) == 2
+
+
+def test_backfill_cv_text(user_instance):
+    advert = JobAdvertFactory(created_by=user_instance)
+    applications = [
+        apply_with_cv(advert, "a.docx", make_docx("Kotlin engineer")),
+        apply_with_cv(advert, "b.docx", make_docx("Kotlin engineer")),
+        apply_with_cv(advert, "c.docx", make_docx("Rust engineer")),
+    ]
+    out = io.StringIO()
+
+    call_command("backfill_cv_text", workers=1, batch_size=2, stdout=out)
+
+    assert CVDocument.objects.filter(status=CVExtractionStatus.DONE).count() == len(applications)
+    assert ApplicantTerm.objects.filter(term="kotlin").count() == 2
+    assert "Extracted 2 CVs (0 failed)" in out.getvalue()
@@ -0,0 +1,88 @@
+import socketserver
+import threading
+
+import pytest
+
+from common.tasks import get_email_template, send_email, send_email_batch
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough of SMTP for smtplib to deliver messages"""
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost stand-in")
+        while line := self.rfile.readline():
+            command = line.decode().strip().upper()
+            if command.startswith("DATA"):
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() != b".\r\n":
+                    pass
+                self.server.messages += 1
+                self.reply("250 OK")
+            elif command.startswith("QUIT"):
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class StandInSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.connections = 0
+        self.messages = 0
+
+
+@pytest.fixture
+def smtp_server(settings):
+    server = StandInSMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+    settings.EMAIL_HOST, settings.EMAIL_PORT = server.server_address
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def rejection_email(n: int) -> dict:
+    return {
+        "subject": "Application Outcome",
+        "email_to": [f"applicant{n}@example.com"],
+        "html_template": "emails/job_application_update.html",
+        "context": {"applicant_name": f"Applicant {n}", "job_title": "Developer", "company_name": "Acme"},
+    }
+
+
+def test_send_email_batch_reuses_one_connection(smtp_server):
+    result = send_email_batch([rejection_email(n) for n in range(25)], batch_size=10)
+
+    assert result["sent"] == 25
+    assert len(result["batch_timings_ms"]) == 3
+    assert smtp_server.messages == 25
+    assert smtp_server.connections == 1
+
+
+def test_send_email_does_not_print_the_rendered_html(smtp_server, capsys):
+    send_email(**rejection_email(1))
+
+    assert smtp_server.messages == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_email_templates_are_compiled_once(mailoutbox):
+    get_email_template.cache_clear()
+
+    send_email_batch([rejection_email(n) for n in range(5)])
+
+    assert len(mailoutbox) == 5
+    assert get_email_template.cache_info().misses == 1
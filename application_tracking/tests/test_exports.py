@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import os
+import tracemalloc
+
+import pytest
+from django.urls import reverse
+
+from application_tracking.exports import EXPORT_CHUNK_SIZE, EXPORT_FIELDS
+from application_tracking.models import JobApplication
+
+from .factories import JobAdvertFactory, JobApplicationFactory
+
+pytestmark = pytest.mark.django_db
+
+# Set EXPORT_MEMORY_TEST_ROWS=1000000 to check memory stays flat at full scale
+MEMORY_TEST_ROWS = int(os.environ.get("EXPORT_MEMORY_TEST_ROWS", 30_000))
+
+
+def export_url(advert, export_format):
+    return reverse("export_applications", kwargs={"advert_id": advert.id}) + f"?format={export_format}"
+
+
+def create_applications(advert, total: int, batch_size: int = 5000):
+    for start in range(0, total, batch_size):
+        JobApplication.objects.bulk_create(
+            JobApplication(job_advert=advert, name=f"Applicant {n}", email=f"applicant{n}@example.com",
+                           portfolio_url="https://example.com", cv="cv/cv.pdf")
+            for n in range(start, min(total, start + batch_size))
+        )
+
+
+def stream_peak_memory(client, url) -> tuple[int, int]:
+    """Bytes streamed and peak memory allocated while streaming them"""
+    response = client.get(url)
+    tracemalloc.start()
+    try:
+        streamed = sum(len(chunk) for chunk in response.streaming_content)
+        return streamed, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_export_csv(employer_client, django_assert_num_queries):
+    client, employer = employer_client
+    advert = JobAdvertFactory(created_by=employer)
+    applications = JobApplicationFactory.create_batch(3, job_advert=advert)
+    JobApplicationFactory(job_advert=JobAdvertFactory(created_by=employer))
+
+    response = client.get(export_url(advert, "csv"))
+    assert response["Content-Type"] == "text/csv"
+    assert response["Content-Disposition"] == f'attachment; filename="applications-{advert.id}.csv"'
+
+    content = iter(response.streaming_content)
+    # The header goes out before the first query runs
+    with django_assert_num_queries(0):
+        header = next(content)
+    rows = list(csv.DictReader(io.StringIO((header + b"".join(content)).decode())))
+
+    assert list(rows[0]) == EXPORT_FIELDS
+    assert [row["email"] for row in rows] == [a.email for a in sorted(applications, key=lambda a: a.created_at,
+                                                                        reverse=True)]
+
+
+def test_export_csv_quotes_formulas(employer_client):
+    client, employer = employer_client
+    advert = JobAdvertFactory(created_by=employer)
+    for name in ["=HYPERLINK(\"http://example.com\")", "+1", "-1", "@SUM(A1)", "Ada Lovelace"]:
+        JobApplicationFactory(job_advert=advert, name=name)
+
+    response = client.get(export_url(advert, "csv"))
+    rows = csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode()))
+
+    assert sorted(row["name"] for row in rows) == [
+        "'+1", "'-1", "'=HYPERLINK(\"http://example.com\")", "'@SUM(A1)", "Ada Lovelace",
+    ]
+
+    # NDJSON is not opened in spreadsheets, so names are exported as they are
+    response = client.get(export_url(advert, "ndjson"))
+    names = [json.loads(line)["name"] for line in b"".join(response.streaming_content).decode().splitlines()]
+    assert "=HYPERLINK(\"http://example.com\")" in names
+
+
+def test_export_ndjson_spans_chunks(employer_client):
+    client, employer = employer_client
+    advert = JobAdvertFactory(created_by=employer)
+    create_applications(advert, EXPORT_CHUNK_SIZE + 5)
+
+    response = client.get(export_url(advert, "ndjson"))
+    rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    assert len(rows) == EXPORT_CHUNK_SIZE + 5
+    assert len({row["id"] for row in rows}) == len(rows)
+
+
+def test_export_is_limited_to_the_advert_owner(employer_client, user_instance):
+    client, _ = employer_client
+    advert = JobAdvertFactory(created_by=user_instance)
+
+    assert client.get(export_url(advert, "csv")).status_code == 403
+
+
+def test_export_memory_is_flat(employer_client):
+    client, employer = employer_client
+    small, large = JobAdvertFactory(created_by=employer), JobAdvertFactory(created_by=employer)
+    create_applications(small, 3 * EXPORT_CHUNK_SIZE)
+    create_applications(large, MEMORY_TEST_ROWS)
+
+    small_bytes, small_peak = stream_peak_memory(client, export_url(small, "csv"))
+    large_bytes, large_peak = stream_peak_memory(client, export_url(large, "csv"))
+
+    assert large_bytes > small_bytes * (MEMORY_TEST_ROWS // (3 * EXPORT_CHUNK_SIZE) - 1)
+    # Memory is bounded by the chunk size, not by the number of rows
+    assert large_peak < small_peak * 1.2
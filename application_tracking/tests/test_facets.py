@@ -0,0 +1,110 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test.client import Client
+from django.urls import reverse
+
+from application_tracking.facets import afacet_rows, count_facets
+
+from .factories import JobAdvertFactory, fake
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def adverts(user_instance):
+    def advert(title, employment_type, job_type, location):
+        return JobAdvertFactory(created_by=user_instance, title=title, employment_type=employment_type,
+                                experience_level="Senior", job_type=job_type, location=location,
+                                deadline=fake.future_date())
+
+    return [
+        advert("Elixir Developer", "Full Time", "Remote", "Lagos"),
+        advert("Elixir Contractor", "Contract", "Remote", "Berlin"),
+        advert("Elixir Intern", "Part Time", "Onsite", "Lagos"),
+        advert("Go Developer", "Full Time", "Onsite", "Lagos"),
+    ]
+
+
+def facet_counts(response) -> dict:
+    return {facet["field"]: {option["value"]: option["count"] for option in facet["values"]}
+            for facet in response.context["facets"]}
+
+
+def titles(response) -> set:
+    return {title for title in ("Elixir Developer", "Elixir Contractor", "Elixir Intern", "Go Developer")
+            if f"<h3>{title}</h3>".encode() in response.content}
+
+
+def test_facet_counts_leave_out_their_own_filter():
+    rows = [
+        ("Full Time", "Senior", "Remote", "Lagos", 2),
+        ("Contract", "Senior", "Remote", "Berlin", 1),
+        ("Full Time", "Senior", "Onsite", "Lagos", 3),
+    ]
+
+    counts = count_facets(rows, {"employment_type": ["Full Time"], "job_type": ["Remote"]})
+
+    # Other employment types stay countable within the Remote adverts
+    assert counts["employment_type"] == {"Full Time": 2, "Contract": 1}
+    assert counts["job_type"] == {"Remote": 2, "Onsite": 3}
+    assert counts["location"] == {"Lagos": 2}
+
+
+@pytest.mark.parametrize("backend", [
+    "application_tracking.search.InvertedIndexSearchBackend",
+    "application_tracking.search.DatabaseSearchBackend",
+])
+def test_search_narrowed_by_facets(client: Client, adverts, settings, backend):
+    settings.SEARCH_BACKEND = backend
+
+    response = client.get(reverse("search"), {"keyword": "elixir", "employment_type": ["Full Time", "Contract"],
+                                              "job_type": "Remote"})
+
+    assert titles(response) == {"Elixir Developer", "Elixir Contractor"}
+    counts = facet_counts(response)
+    assert counts["employment_type"] == {"Full Time": 1, "Contract": 1}
+    # The Onsite advert is part time, so the employment filter leaves it out
+    assert counts["job_type"] == {"Remote": 2}
+    assert counts["location"] == {"Lagos": 1, "Berlin": 1}
+
+
+def test_unknown_facet_values_are_ignored(client: Client, adverts):
+    response = client.get(reverse("search"), {"employment_type": "Volunteer"})
+
+    assert len(titles(response)) == 4
+
+
+def test_facet_links_toggle_values(client: Client, adverts):
+    response = client.get(reverse("search"), {"keyword": "elixir", "job_type": "Remote", "page": "1"})
+
+    job_types = {option["value"]: option for option in response.context["facets"][2]["values"]}
+    assert job_types["Remote"]["selected"]
+    assert job_types["Remote"]["url"] == f"{reverse('search')}?keyword=elixir"
+    assert job_types["Onsite"]["url"] == f"{reverse('search')}?keyword=elixir&job_type=Remote&job_type=Onsite"
+
+
+def test_facet_counts_are_one_cached_grouped_query(adverts, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        rows = async_to_sync(afacet_rows)("elixir", None)
+    assert sum(row[-1] for row in rows) == 3
+
+    with django_assert_num_queries(0):
+        assert async_to_sync(afacet_rows)("Elixir ", None) == rows
+
+
+def test_advert_changes_invalidate_facet_counts(client: Client, adverts):
+    client.get(reverse("home"))
+
+    adverts[0].job_type = "Hybrid"
+    adverts[0].save()
+
+    assert facet_counts(client.get(reverse("home")))["job_type"] == {"Onsite": 2, "Remote": 1, "Hybrid": 1}
+
+
+def test_pagination_keeps_the_facet_selection(client: Client, user_instance):
+    JobAdvertFactory.create_batch(11, created_by=user_instance, employment_type="Contract",
+                                  deadline=fake.future_date())
+
+    response = client.get(reverse("search"), {"employment_type": "Contract"})
+
+    assert b"?page=2&employment_type=Contract" in response.content
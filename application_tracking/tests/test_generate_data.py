@@ -0,0 +1,64 @@
+import io
+from datetime import datetime, timezone
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Sum
+
+from accounts.models import User
+from application_tracking.management.commands.generate_data import explicit_timestamps, stable_uuid
+from application_tracking.models import CVBlob, JobAdvert, JobApplication
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+def generate(**options):
+    defaults = {"users": 30, "employers": 5, "adverts": 40, "applications": 300, "cv_files": 4,
+                "chunk_size": 64, "workers": 1, "stdout": io.StringIO()}
+    call_command("generate_data", **{**defaults, **options})
+
+
+def test_generate_data():
+    generate(seed=7)
+
+    assert User.objects.filter(role="employer").count() == 5
+    assert User.objects.filter(role="jobseeker").count() == 25
+    assert JobAdvert.objects.count() == 40
+    assert JobApplication.objects.count() == 300
+    assert JobAdvert.objects.aggregate(total=Sum("applicant_count"))["total"] == 300
+    assert CVBlob.objects.count() == 4
+    assert CVBlob.objects.aggregate(total=Sum("ref_count"))["total"] == 300
+    assert JobAdvert.objects.filter(search_document__isnull=False).count() == 40
+    oldest, newest = JobApplication.objects.order_by("created_at").values_list("created_at", flat=True)[::299]
+    assert (newest - oldest).days >= 360
+
+
+def test_generate_data_is_deterministic():
+    generate(seed=7)
+    first = list(JobApplication.objects.order_by("pk").values_list("pk", "email", "status", "job_advert_id"))
+    titles = list(JobAdvert.objects.order_by("pk").values_list("title", "description"))
+    JobApplication.objects.all().delete()
+    JobAdvert.objects.all().delete()
+    User.objects.all().delete()
+
+    generate(seed=7)
+
+    assert list(JobApplication.objects.order_by("pk").values_list("pk", "email", "status", "job_advert_id")) == first
+    assert list(JobAdvert.objects.order_by("pk").values_list("title", "description")) == titles
+    assert JobAdvert.objects.filter(pk=stable_uuid(7, "advert", 0)).exists()
+
+
+def test_rows_keep_their_generated_timestamps():
+    created_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    with explicit_timestamps(User):
+        User.objects.bulk_create([User(email="old@example.com", created_at=created_at, updated_at=created_at)])
+
+    assert User.objects.values_list("created_at", "updated_at").get() == (created_at, created_at)
+    # Rows saved afterwards are stamped as usual
+    assert User._meta.get_field("created_at").auto_now_add and User._meta.get_field("updated_at").auto_now
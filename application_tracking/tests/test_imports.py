@@ -0,0 +1,166 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+
+from application_tracking.imports import InvalidImportFile, import_adverts, read_rows
+from application_tracking.models import JobAdvert
+from application_tracking.search import InvertedIndexSearchBackend
+
+from .factories import JobAdvertFactory, fake
+
+pytestmark = pytest.mark.django_db
+
+
+def advert_row(n: int, **overrides) -> dict:
+    return {
+        "title": f"Imported Engineer {n}",
+        "company_name": "Feed Corp",
+        "employment_type": "Full Time",
+        "experience_level": "Mid Level",
+        "job_type": "Remote",
+        "location": "Lagos",
+        "description": f"Imported advert number {n}",
+        "skills": "Python, Kotlin",
+        "deadline": fake.future_date().isoformat(),
+        **overrides,
+    }
+
+
+def as_csv(rows: list[dict]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def test_read_rows():
+    rows = [advert_row(1), advert_row(2)]
+    assert read_rows(as_csv(rows), "csv") == rows
+    assert read_rows(json.dumps(rows).encode(), "json") == rows
+
+    with pytest.raises(InvalidImportFile):
+        read_rows(b'{"title": "not a list"}', "json")
+    with pytest.raises(InvalidImportFile):
+        read_rows(b"[{", "json")
+
+
+def test_import_reports_invalid_rows_and_keeps_the_rest(employer_client, django_assert_max_num_queries):
+    _, employer = employer_client
+    existing = JobAdvertFactory(created_by=employer)
+    rows = [advert_row(n) for n in range(10)]
+    rows[2]["employment_type"] = "Forever"
+    rows[4]["description"] = existing.description
+    rows[6]["description"] = rows[5]["description"]
+    del rows[8]["title"]
+
+    # Validation, duplicate check, insert, indexing and skill linking per
+    # batch, not per row
+    with django_assert_max_num_queries(24):
+        report = import_adverts(rows, employer, batch_size=5)
+
+    assert report["total"] == 10
+    assert report["created"] == 6
+    assert [error["row"] for error in report["errors"]] == [3, 5, 7, 9]
+    assert "employment_type" in report["errors"][0]["errors"]
+    assert report["errors"][1]["errors"]["description"][0]["code"] == "unique"
+    assert report["errors"][2]["errors"]["description"][0]["code"] == "unique"
+    assert "title" in report["errors"][3]["errors"]
+
+    imported = JobAdvert.objects.filter(company_name="Feed Corp")
+    assert imported.count() == 6
+    assert all(advert.created_by_id == employer.pk and advert.is_published for advert in imported)
+
+
+def test_imported_adverts_are_searchable(employer_client):
+    _, employer = employer_client
+    import_adverts([advert_row(1, title="Haskell Engineer"), advert_row(2)], employer)
+
+    results = InvertedIndexSearchBackend().search("haskell", None)
+    assert [advert.title for advert in results] == ["Haskell Engineer"]
+
+
+def test_import_command(employer_client, tmp_path):
+    _, employer = employer_client
+    feed = tmp_path / "adverts.json"
+    feed.write_text(json.dumps([advert_row(1), advert_row(2, deadline="soon")]))
+    out, err = io.StringIO(), io.StringIO()
+
+    call_command("import_adverts", str(feed), owner=employer.email, stdout=out, stderr=err)
+
+    assert "Imported 1 of 2 adverts." in out.getvalue()
+    assert "Row 2: deadline" in err.getvalue()
+    assert JobAdvert.objects.filter(created_by=employer).count() == 1
+
+
+def test_upload_small_feed_imports_inline(employer_client):
+    client, employer = employer_client
+    upload = SimpleUploadedFile("adverts.csv", as_csv([advert_row(1), advert_row(2, job_type="Moon")]))
+
+    response = client.post(reverse("import_adverts"), {"file": upload})
+
+    assert response.status_code == 200
+    assert response.context["report"]["created"] == 1
+    assert response.context["report"]["errors"][0]["row"] == 2
+    assert JobAdvert.objects.filter(created_by=employer).count() == 1
+
+
+def test_upload_rejects_unknown_file_types(employer_client):
+    client, _ = employer_client
+    response = client.post(reverse("import_adverts"), {"file": SimpleUploadedFile("adverts.xlsx", b"data")})
+
+    assert response.status_code == 200
+    assert response.context["import_form"].errors["file"]
+    assert not JobAdvert.objects.exists()
+
+
+def test_upload_rejects_files_that_are_not_utf8(employer_client):
+    client, _ = employer_client
+    upload = SimpleUploadedFile("adverts.csv", "title,location\nIngénieur,Paris\n".encode("latin-1"))
+
+    response = client.post(reverse("import_adverts"), {"file": upload})
+
+    assert response.status_code == 200
+    assert response.context["import_form"].errors["file"] == ["The file must be UTF-8 encoded."]
+    assert not JobAdvert.objects.exists()
+
+
+def test_background_import_reports_files_that_are_not_utf8(employer_client, settings, tmp_path,
+                                                          django_capture_on_commit_callbacks):
+    client, employer = employer_client
+    settings.MEDIA_ROOT = tmp_path
+    settings.ADVERT_IMPORT_SYNC_MAX_BYTES = 10
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    upload = SimpleUploadedFile("adverts.csv", b"\x89PNG\r\n\x1a\n\xff\xfe binary data")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(reverse("import_adverts"), {"file": upload})
+
+    assert mail.outbox[0].to == [employer.email]
+    assert "The file must be UTF-8 encoded." in mail.outbox[0].alternatives[0][0]
+    assert not list((tmp_path / "imports").iterdir())
+
+
+def test_upload_large_feed_is_imported_in_the_background(employer_client, settings, tmp_path,
+                                                         django_capture_on_commit_callbacks):
+    client, employer = employer_client
+    settings.MEDIA_ROOT = tmp_path
+    settings.ADVERT_IMPORT_SYNC_MAX_BYTES = 10
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    upload = SimpleUploadedFile("adverts.json", json.dumps([advert_row(1), advert_row(2)]).encode())
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(reverse("import_adverts"), {"file": upload})
+
+    assert response.status_code == 302
+    assert JobAdvert.objects.filter(created_by=employer).count() == 2
+    assert mail.outbox[0].to == [employer.email]
+    assert "2 of 2 adverts were created" in mail.outbox[0].alternatives[0][0]
+    # The uploaded feed is removed once imported
+    assert not list((tmp_path / "imports").iterdir())
@@ -4,11 +4,13 @@ from django.test.client import Client
 from django.urls import reverse
 
 from accounts.tests.factories import UserFactory
+from application_tracking import views
 from application_tracking.models import JobAdvert, JobApplication
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from .factories import JobAdvertFactory, JobApplicationFactory, fake
 from application_tracking.enums import ApplicationStatus
+from application_tracking.tasks import reconcile_applicant_counters
 
 pytestmark = pytest.mark.django_db
 
@@ -105,12 +107,44 @@ def test_edit_advert(authenticate_user_client):
     assert advert.company_name == request_data["company_name"]
 
 
+def test_edit_advert_keeps_counters_changed_while_editing(authenticate_user_client, monkeypatch):
+    client, user = authenticate_user_client
+    advert: JobAdvert = JobAdvertFactory(created_by=user)
+    load_advert = views.get_object_or_404
+
+    def get_object_or_404(*args, **kwargs):
+        loaded = load_advert(*args, **kwargs)
+        # Someone applies after the edit loaded the advert
+        advert.record_application(ApplicationStatus.APPLIED)
+        return loaded
+
+    monkeypatch.setattr(views, "get_object_or_404", get_object_or_404)
+    url = reverse("update_advert", kwargs={"advert_id": advert.id})
+    request_data = {
+        "title": "Updated",
+        "company_name": "Ridwanray",
+        "employment_type": "Contract",
+        "experience_level": "Senior",
+        "job_type": "Remote",
+        "deadline": "2025-02-01",
+        "skills": "Python, Django",
+        "description": "Sample",
+    }
+
+    response = client.post(url, request_data)
+    assert response.status_code == 302
+
+    advert.refresh_from_db()
+    assert advert.title == "Updated"
+    assert advert.applicant_count == 1
+    assert advert.applied_count == 1
+
+
 def test_get_my_applications(authenticate_user_client):
     client, user = authenticate_user_client
-    JobApplicationFactory.create_batch(5, email=user.email, job_advert = JobAdvertFactory(
-        created_by = UserFactory()
-    ))
-    JobApplicationFactory.create_batch(10, email="randomuser@gmail.com", job_advert = JobAdvertFactory(
+    for advert in JobAdvertFactory.create_batch(5, created_by=UserFactory()):
+        JobApplicationFactory(email=user.email, job_advert=advert)
+    JobApplicationFactory.create_batch(10, job_advert = JobAdvertFactory(
         created_by = UserFactory()
     ))
     url = reverse("my_applications")
@@ -216,13 +250,81 @@ def test_decide_application_unauthorised(authenticate_user_client):
     assert job_application.status == "APPLIED"
 
 
+def test_bulk_decide_selected_applications(authenticate_user_client):
+    client, user = authenticate_user_client
+    advert = JobAdvertFactory(created_by=user, applicant_count=3, applied_count=3)
+    selected = JobApplicationFactory.create_batch(2, job_advert=advert)
+    other = JobApplicationFactory(job_advert=advert, email=fake.email())
+
+    url = reverse("bulk_decide", kwargs={"advert_id": advert.id})
+    response = client.post(url, {"status": "INTERVIEW", "applications": [a.id for a in selected]})
+    assert response.status_code == 302
+
+    assert set(advert.applications.filter(status="INTERVIEW")) == set(selected)
+    other.refresh_from_db()
+    assert other.status == ApplicationStatus.APPLIED
+    advert.refresh_from_db()
+    assert (advert.applied_count, advert.interview_count) == (1, 2)
+
+
+def test_bulk_reject_all_applied(authenticate_user_client, mailoutbox, settings, django_assert_max_num_queries):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    client, user = authenticate_user_client
+    advert = JobAdvertFactory(created_by=user, applicant_count=21, applied_count=20, interview_count=1)
+    JobApplicationFactory.create_batch(20, job_advert=advert)
+    JobApplicationFactory(job_advert=advert, email=fake.email(), status=ApplicationStatus.INTERVIEW)
+
+    url = reverse("bulk_decide", kwargs={"advert_id": advert.id})
+    with django_assert_max_num_queries(12):
+        client.post(url, {"status": "REJECTED", "all_applied": "on"})
+
+    assert advert.applications.filter(status="REJECTED").count() == 20
+    assert advert.applications.filter(status="INTERVIEW").count() == 1
+    assert len(mailoutbox) == 20
+    advert.refresh_from_db()
+    assert (advert.applied_count, advert.rejected_count, advert.interview_count) == (0, 20, 1)
+
+
+def test_bulk_decide_unauthorised(authenticate_user_client):
+    client, _ = authenticate_user_client
+    advert = JobAdvertFactory(created_by=UserFactory())
+    job_application = JobApplicationFactory(job_advert=advert, email="random@gmail.com")
+
+    url = reverse("bulk_decide", kwargs={"advert_id": advert.id})
+    response = client.post(url, {"status": "REJECTED", "all_applied": "on"})
+    assert response.status_code == 403
+    job_application.refresh_from_db()
+    assert job_application.status == ApplicationStatus.APPLIED
+
+
+def test_duplicate_application_is_rejected_by_the_database(client, user_instance, settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    client.force_login(UserFactory(role="jobseeker"))
+    advert = JobAdvertFactory(created_by=user_instance)
+    url = reverse("apply_for_job", kwargs={"advert_id": advert.id})
+
+    for email in ["Random@Gmail.com ", "random@gmail.com"]:
+        client.post(url, {
+            "name": "Random name",
+            "email": email,
+            "portfolio_url": "https://docs.djangoproject.com/en/",
+            "cv": SimpleUploadedFile("sample.pdf", b"content"),
+        })
+
+    messages = list(get_messages(client.get(reverse("home")).wsgi_request))
+    assert [message.level_tag for message in messages] == ["success", "error"]
+    assert list(advert.applications.values_list("email", flat=True)) == ["random@gmail.com"]
+    advert.refresh_from_db()
+    assert advert.applicant_count == 1
+
+
 def test_get_applicants_for_an_advert(authenticate_user_client):
     client, user = authenticate_user_client
     advert1 = JobAdvertFactory(created_by=user)
-    JobApplicationFactory.create_batch(5, job_advert=advert1, email="abcabc4@gmail.com")
+    JobApplicationFactory.create_batch(5, job_advert=advert1)
 
     advert2 = JobAdvertFactory(created_by=user)
-    JobApplicationFactory.create_batch(2, job_advert=advert2, email="abcabc4@gmail545.com")
+    JobApplicationFactory.create_batch(2, job_advert=advert2)
 
     url = reverse("advert_applications", kwargs={"advert_id":advert2.id})
 
@@ -232,6 +334,70 @@ def test_get_applicants_for_an_advert(authenticate_user_client):
     assert len(response.context["applications"].object_list) == 2
 
 
-def test_search():
-    # TODO: Assignment
-    ...
\ No newline at end of file
+def test_search(client: Client, user_instance):
+    JobAdvertFactory(created_by=user_instance, title="Django Developer", location="Lagos",
+                     deadline=fake.future_date())
+    JobAdvertFactory(created_by=user_instance, title="Django Developer", location="London",
+                     deadline=fake.future_date())
+    JobAdvertFactory(created_by=user_instance, title="Accountant", skills="Excel",
+                     deadline=fake.future_date())
+    JobAdvertFactory(created_by=user_instance, title="Django Developer", deadline=fake.past_date())
+
+    url = reverse("search")
+    response = client.get(url, {"keyword": "django", "location": "lagos"})
+    assert response.status_code == 200
+
+    paginated_adverts = response.context["job_adverts"]
+    assert paginated_adverts.paginator.count == 1
+    assert paginated_adverts.object_list[0].location == "Lagos"
+
+    response = client.get(url, {"keyword": "django"})
+    assert response.context["job_adverts"].paginator.count == 2
+
+def test_apply_updates_applicant_counters(client: Client, user_instance, settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    advert = JobAdvertFactory(created_by=user_instance, deadline=fake.future_date())
+    client.force_login(UserFactory(role="jobseeker"))
+    url = reverse("apply_for_job", kwargs={"advert_id": advert.id})
+
+    request_data = {
+        "name": "Random name",
+        "email": "random@gmail.com",
+        "portfolio_url": "https://docs.djangoproject.com/en/",
+        "cv": SimpleUploadedFile("sample.pdf", b"content"),
+    }
+    response = client.post(url, request_data)
+    assert response.status_code == 302
+
+    advert.refresh_from_db()
+    assert advert.applicant_count == 1
+    assert advert.applied_count == 1
+    assert advert.total_applicants == 1
+
+
+def test_decide_updates_status_counters(authenticate_user_client):
+    client, user = authenticate_user_client
+    advert = JobAdvertFactory(created_by=user, applicant_count=1, applied_count=1)
+    job_application = JobApplicationFactory(job_advert=advert, email="random@gmail.com")
+
+    url = reverse("decide", kwargs={"job_application_id": job_application.id})
+    client.post(url, {"status": ApplicationStatus.INTERVIEW})
+
+    advert.refresh_from_db()
+    assert advert.applicant_count == 1
+    assert advert.applied_count == 0
+    assert advert.interview_count == 1
+
+
+def test_reconcile_applicant_counters(user_instance):
+    advert = JobAdvertFactory(created_by=user_instance, applicant_count=7, applied_count=7)
+    JobApplicationFactory.create_batch(2, job_advert=advert)
+    JobApplicationFactory(job_advert=advert, email="def@gmail.com", status=ApplicationStatus.REJECTED)
+
+    assert reconcile_applicant_counters() == 1
+
+    advert.refresh_from_db()
+    assert advert.applicant_count == 3
+    assert advert.applied_count == 2
+    assert advert.rejected_count == 1
+    assert reconcile_applicant_counters() == 0
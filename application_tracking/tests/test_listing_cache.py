@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.test.client import Client
+from django.urls import reverse
+from django.utils import timezone
+from redis.exceptions import ConnectionError
+
+from application_tracking import listing_cache
+from application_tracking.listing_cache import listing_cache_key, listing_cache_stats
+
+from .factories import JobAdvertFactory, fake
+
+pytestmark = pytest.mark.django_db
+
+
+def test_repeat_listing_request_hits_cache(client: Client, user_instance, query_budget):
+    JobAdvertFactory.create_batch(3, created_by=user_instance, deadline=fake.future_date())
+    client.get(reverse("home"))
+
+    with query_budget(0):
+        response = client.get(reverse("home"))
+    assert response.status_code == 200
+    assert response.content.count(b'class="job-card"') == 3
+    assert listing_cache_stats()["hits"] == 1
+    assert listing_cache_stats()["misses"] == 1
+
+
+def test_saving_an_advert_invalidates_listing_cache(client: Client, user_instance):
+    advert = JobAdvertFactory(created_by=user_instance, title="Old title", deadline=fake.future_date())
+    client.get(reverse("home"))
+
+    advert.title = "New title"
+    advert.save()
+    response = client.get(reverse("home"))
+    assert b"New title" in response.content
+
+    advert.delete()
+    response = client.get(reverse("home"))
+    assert b"New title" not in response.content
+
+
+def test_search_cache_key_is_normalized(client: Client, user_instance):
+    JobAdvertFactory(created_by=user_instance, title="Python Developer", deadline=fake.future_date())
+    client.get(reverse("search"), {"keyword": "Python "})
+    client.get(reverse("search"), {"keyword": "python", "page": "1"})
+
+    assert listing_cache_stats()["hits"] == 1
+
+
+def test_cache_key_changes_at_date_rollover(monkeypatch):
+    today_key = listing_cache_key("python", "", "page:1")
+    tomorrow = timezone.now() + timedelta(days=1)
+    monkeypatch.setattr(listing_cache.timezone, "now", lambda: tomorrow)
+    assert listing_cache_key("python", "", "page:1") != today_key
+
+
+@pytest.fixture
+def cache_down(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("Redis is down")
+
+    for method in ("get", "set", "add", "incr", "get_or_set", "delete", "delete_many",
+                   "aget", "aset", "aadd", "aincr", "aget_or_set"):
+        monkeypatch.setattr(caches["default"], method, unavailable)
+
+
+def test_listings_are_rendered_without_the_cache_while_it_is_down(client: Client, user_instance, cache_down):
+    JobAdvertFactory(created_by=user_instance, title="Elixir Developer", deadline=fake.future_date())
+    advert = JobAdvertFactory(created_by=user_instance, title="Accountant", deadline=fake.future_date())
+
+    response = client.get(reverse("home"))
+    assert response.status_code == 200
+    assert response.content.count(b'class="job-card"') == 2
+
+    advert.title = "Elixir Accountant"
+    advert.save()
+    response = client.get(reverse("search"), {"keyword": "elixir"})
+    assert response.status_code == 200
+    assert response.content.count(b'class="job-card"') == 2
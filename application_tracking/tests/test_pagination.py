@@ -0,0 +1,51 @@
+import pytest
+from django.test.client import Client
+from django.urls import reverse
+
+from application_tracking.models import JobAdvert
+from common.pagination import CursorPaginator
+
+from .factories import JobAdvertFactory, fake
+
+pytestmark = pytest.mark.django_db
+
+
+def test_cursor_pagination_walks_forward_and_back(user_instance):
+    JobAdvertFactory.create_batch(25, created_by=user_instance)
+    expected = list(JobAdvert.objects.order_by("-created_at", "-pk"))
+    paginator = CursorPaginator(JobAdvert.objects.all(), 10)
+
+    first = paginator.get_page(None)
+    assert list(first) == expected[:10]
+    assert not first.has_previous()
+
+    second = paginator.get_page(first.next_cursor)
+    third = paginator.get_page(second.next_cursor)
+    assert list(second) == expected[10:20]
+    assert list(third) == expected[20:]
+    assert not third.has_next()
+
+    back = paginator.get_page(third.previous_cursor)
+    assert list(back) == expected[10:20]
+    assert list(paginator.get_page(back.previous_cursor)) == expected[:10]
+    assert not paginator.get_page(back.previous_cursor).has_previous()
+
+
+def test_cursor_pagination_ignores_malformed_cursor(user_instance):
+    JobAdvertFactory.create_batch(3, created_by=user_instance)
+    page = CursorPaginator(JobAdvert.objects.all(), 10).get_page("not-a-cursor")
+    assert len(page) == 3
+
+
+def test_home_uses_cursor_pagination(client: Client, user_instance, settings):
+    settings.PAGINATION_MODE = "cursor"
+    JobAdvertFactory.create_batch(15, created_by=user_instance, deadline=fake.future_date())
+
+    response = client.get(reverse("home"))
+    assert response.status_code == 200
+    first_page = response.context["job_adverts"]
+    assert len(first_page.object_list) == 10
+
+    response = client.get(reverse("home"), {"cursor": first_page.next_cursor})
+    assert len(response.context["job_adverts"].object_list) == 5
+    assert not response.context["job_adverts"].has_next()
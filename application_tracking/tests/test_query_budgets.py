@@ -0,0 +1,114 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.test.client import Client
+from django.urls import reverse
+
+from accounts.tests.factories import UserFactory
+from application_tracking.enums import ApplicationStatus
+from application_tracking.models import JobApplication
+from common.query_budget import QueryRecorder
+
+from .factories import JobAdvertFactory, JobApplicationFactory, fake
+
+pytestmark = pytest.mark.django_db
+
+
+def test_home_query_budget(client: Client, user_instance, query_budget):
+    JobAdvertFactory.create_batch(15, created_by=user_instance, deadline=fake.future_date())
+    # The page, its count and the grouped facet counts
+    with query_budget(3):
+        response = client.get(reverse("home"))
+    assert response.status_code == 200
+
+
+def test_search_query_budget(client: Client, user_instance, query_budget):
+    JobAdvertFactory.create_batch(15, created_by=user_instance, title="Python Developer",
+                                  deadline=fake.future_date())
+    with query_budget(6):
+        response = client.get(reverse("search"), {"keyword": "python"})
+    assert response.status_code == 200
+
+
+def test_get_advert_query_budget(client: Client, user_instance, query_budget):
+    advert = JobAdvertFactory(created_by=user_instance)
+    with query_budget(1):
+        response = client.get(reverse("job_advert", kwargs={"advert_id": advert.id}))
+    assert response.status_code == 200
+
+
+def test_my_jobs_query_budget(employer_client, query_budget):
+    client, employer = employer_client
+    for advert in JobAdvertFactory.create_batch(10, created_by=employer):
+        JobApplicationFactory.create_batch(2, job_advert=advert)
+    with query_budget(4):
+        response = client.get(reverse("my_jobs"))
+    assert response.status_code == 200
+
+
+def test_my_applications_query_budget(client: Client, query_budget):
+    jobseeker = UserFactory(role="jobseeker")
+    client.force_login(jobseeker)
+    for advert in JobAdvertFactory.create_batch(10, created_by=UserFactory()):
+        JobApplicationFactory(job_advert=advert, email=jobseeker.email)
+    with query_budget(4):
+        response = client.get(reverse("my_applications"))
+    assert response.status_code == 200
+
+
+def test_advert_applications_query_budget(employer_client, query_budget):
+    client, employer = employer_client
+    advert = JobAdvertFactory(created_by=employer)
+    JobApplicationFactory.create_batch(10, job_advert=advert)
+    with query_budget(5):
+        response = client.get(reverse("advert_applications", kwargs={"advert_id": advert.id}))
+    assert response.status_code == 200
+
+
+def test_decide_query_budget(employer_client, query_budget, settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    client, employer = employer_client
+    advert = JobAdvertFactory(created_by=employer, applicant_count=1, applied_count=1)
+    job_application = JobApplicationFactory(job_advert=advert, email=fake.email())
+    with query_budget(8):
+        response = client.post(reverse("decide", kwargs={"job_application_id": job_application.id}),
+                               {"status": ApplicationStatus.REJECTED})
+    assert response.status_code == 302
+
+
+def test_query_recorder_detects_n_plus_one(user_instance):
+    for advert in JobAdvertFactory.create_batch(3, created_by=user_instance):
+        JobApplicationFactory(job_advert=advert, email=fake.email())
+
+    with QueryRecorder() as recorder:
+        titles = [application.job_advert.title for application in JobApplication.objects.all()]
+
+    assert len(titles) == 3
+    repeated = recorder.repeated_shapes(threshold=3)
+    assert len(repeated) == 1
+    [queries] = repeated.values()
+    assert queries[0].location.startswith("application_tracking/tests/test_query_budgets.py")
+
+
+def test_query_budget_middleware_reports_query_count(client: Client, user_instance, settings, caplog):
+    settings.QUERY_BUDGET_ENABLED = True
+    settings.QUERY_BUDGET_MAX_QUERIES = 0
+    JobAdvertFactory(created_by=user_instance, deadline=fake.future_date())
+
+    response = client.get(reverse("home"))
+    assert int(response["X-Query-Count"]) > 0
+    assert "Query budget exceeded for GET /" in caplog.text
+
+
+def test_explain_queries_reports_index_usage(user_instance):
+    advert = JobAdvertFactory(created_by=user_instance)
+    JobApplicationFactory.create_batch(3, job_advert=advert)
+    out = io.StringIO()
+
+    call_command("explain_queries", stdout=out)
+
+    report = dict(line.split(None, 1) for line in out.getvalue().splitlines() if line.startswith(("my_", "cv_")))
+    assert "jobapplication_email_idx" in report["my_applications"]
+    assert "jobadvert_owner_created_idx" in report["my_jobs"]
+    assert "jobapplication_cv_idx" in report["cv_extraction"]
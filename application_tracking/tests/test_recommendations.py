@@ -0,0 +1,173 @@
+from datetime import date
+
+import pytest
+from django.test.client import Client
+from django.urls import reverse
+
+from accounts.models import User
+from application_tracking import recommendations
+from application_tracking.recommendations import AdvertMatrix, get_matrix, recommend_adverts
+
+from .factories import JobAdvertFactory, JobApplicationFactory, fake
+
+pytestmark = pytest.mark.django_db
+
+TODAY = date(2026, 1, 1)
+
+
+@pytest.fixture(autouse=True)
+def fresh_matrix(settings):
+    settings.RECOMMENDATIONS_REFRESH_INTERVAL = 0
+    # Built inline, since a background thread would not see the test's transaction
+    settings.RECOMMENDATIONS_BUILD_IN_BACKGROUND = False
+    recommendations.reset_matrix()
+    yield
+    recommendations.reset_matrix()
+
+
+@pytest.fixture
+def jobseeker(db):
+    return User.objects.create(email="seeker@example.com", role="jobseeker")
+
+
+@pytest.fixture
+def adverts(user_instance):
+    def advert(title, skills):
+        return JobAdvertFactory(created_by=user_instance, title=title, skills=skills, is_published=True,
+                                deadline=fake.future_date())
+
+    return {
+        "backend": advert("Backend Engineer", "Python, Django"),
+        "platform": advert("Platform Engineer", "Golang, K8s"),
+        "data": advert("Data Engineer", "python3, kubernetes"),
+        "frontend": advert("Frontend Developer", "React, TypeScript"),
+    }
+
+
+def titles(recommended) -> list[str]:
+    return [advert.title for advert in recommended]
+
+
+def test_matrix_ranks_by_cosine_similarity():
+    matrix = AdvertMatrix()
+    until = TODAY.toordinal()
+    matrix.upsert([
+        ("a", {("skill", 1): 1.0, ("skill", 2): 1.0}, until, 1),
+        ("b", {("skill", 1): 1.0}, until, 1),
+        ("c", {("skill", 3): 1.0}, until, 1),
+        ("expired", {("skill", 1): 1.0}, until - 1, 1),
+    ])
+
+    assert [advert_id for advert_id, _ in matrix.top({("skill", 1): 1.0}, 5, TODAY)] == ["b", "a"]
+    assert [advert_id for advert_id, _ in matrix.top({("skill", 1): 1.0}, 1, TODAY)] == ["b"]
+    assert matrix.top({("skill", 1): 1.0}, 5, TODAY, exclude={"b"})[0][0] == "a"
+    assert matrix.top({("skill", 4): 1.0}, 5, TODAY) == []
+
+
+def test_changed_adverts_replace_their_row():
+    matrix = AdvertMatrix()
+    until = TODAY.toordinal()
+    matrix.upsert([("a", {("skill", 1): 1.0}, until, 1)])
+
+    assert matrix.upsert([("a", {("skill", 1): 1.0}, until, 1)]) == 0
+    matrix.upsert([("a", {("skill", 2): 1.0}, until, 2)])
+    assert matrix.top({("skill", 1): 1.0}, 5, TODAY) == []
+    assert matrix.top({("skill", 2): 1.0}, 5, TODAY)[0][0] == "a"
+
+    matrix.upsert([("a", {("skill", 2): 1.0}, -1, 3)])
+    assert matrix.top({("skill", 2): 1.0}, 5, TODAY) == []
+    assert matrix.dead_rows == 2
+
+
+def test_recommend_from_declared_skills(jobseeker, adverts):
+    recommended = recommend_adverts(jobseeker, "Python, k8s")
+
+    # Backend and Platform Engineer each have one of the skills, so they tie
+    assert titles(recommended)[0] == "Data Engineer"
+    assert set(titles(recommended)[1:]) == {"Backend Engineer", "Platform Engineer"}
+    assert recommended[0].score > recommended[1].score
+
+
+def test_recommend_from_past_applications(jobseeker, adverts):
+    JobApplicationFactory(job_advert=adverts["platform"], email=jobseeker.email)
+
+    recommended = recommend_adverts(jobseeker)
+
+    # The advert applied to is left out
+    assert titles(recommended) == ["Data Engineer", "Backend Engineer"]
+
+
+def test_no_profile_no_recommendations(jobseeker, adverts):
+    assert recommend_adverts(jobseeker) == []
+
+
+def test_advert_changes_are_loaded_incrementally(jobseeker, adverts, user_instance):
+    matrix = get_matrix()
+    JobAdvertFactory(created_by=user_instance, title="Rust Engineer", skills="Rust", is_published=True,
+                     deadline=fake.future_date())
+    adverts["frontend"].skills = "React, Rust"
+    adverts["frontend"].save()
+    adverts["backend"].is_published = False
+    adverts["backend"].save()
+
+    assert titles(recommend_adverts(jobseeker, "rust")) == ["Rust Engineer", "Frontend Developer"]
+    assert titles(recommend_adverts(jobseeker, "python")) == ["Data Engineer"]
+    assert get_matrix() is matrix and matrix.dead_rows == 2
+
+
+def test_matrix_is_rebuilt_once_most_rows_are_dead(jobseeker, adverts):
+    matrix = get_matrix()
+    for name in ("backend", "platform", "data"):
+        adverts[name].is_published = False
+        adverts[name].save()
+
+    get_matrix()
+    rebuilt = get_matrix()
+    assert rebuilt is not matrix
+    assert rebuilt.dead_rows == 0 and list(rebuilt.rows) == [adverts["frontend"].pk]
+
+
+def test_requests_do_not_wait_for_a_background_build(jobseeker, adverts, settings, monkeypatch):
+    settings.RECOMMENDATIONS_BUILD_IN_BACKGROUND = True
+    builds = []
+
+    class Thread:
+        def __init__(self, target, args, **kwargs):
+            builds.append(lambda: target(*args))
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(recommendations.threading, "Thread", Thread)
+    monkeypatch.setattr(recommendations.connections, "close_all", lambda: None)
+
+    assert recommend_adverts(jobseeker, "react") == []
+    assert recommend_adverts(jobseeker, "react") == []
+    # One build is started however many requests arrive before it is ready
+    assert len(builds) == 1
+
+    builds[0]()
+    assert titles(recommend_adverts(jobseeker, "react")) == ["Frontend Developer"]
+
+
+def test_warm_recommendations_run_a_fixed_number_of_queries(jobseeker, adverts, django_assert_num_queries):
+    recommend_adverts(jobseeker, "python")
+
+    # Aliases, the changed adverts, the applications and the adverts shown
+    with django_assert_num_queries(4):
+        recommend_adverts(jobseeker, "python")
+
+
+def test_recommended_jobs_view(client: Client, jobseeker, adverts):
+    client.force_login(jobseeker)
+
+    response = client.get(reverse("recommended_jobs"), {"skills": "react"})
+
+    assert titles(response.context["job_adverts"]) == ["Frontend Developer"]
+    assert b"Frontend Developer" in response.content
+
+
+def test_recommended_jobs_are_for_jobseekers(employer_client):
+    client, _ = employer_client
+
+    assert client.get(reverse("recommended_jobs")).status_code == 302
@@ -0,0 +1,157 @@
+import pytest
+from django.core import mail
+from django.test.client import Client
+from django.urls import reverse
+
+from accounts.models import User
+from application_tracking.models import SavedSearch, SavedSearchMatch
+from application_tracking.saved_searches import (SavedSearchLimitReached, create_saved_search, match_adverts,
+                                                  send_digests)
+
+from .factories import JobAdvertFactory, fake
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def jobseeker(db):
+    return User.objects.create(email="seeker@example.com", role="jobseeker")
+
+
+@pytest.fixture
+def advert(user_instance):
+    def advert(title, skills="Python", location="Lagos", employment_type="Full Time", **kwargs):
+        kwargs.setdefault("deadline", fake.future_date())
+        return JobAdvertFactory(created_by=user_instance, title=title, skills=skills, location=location,
+                                employment_type=employment_type, is_published=True, **kwargs)
+
+    return advert
+
+
+def matched(saved_search: SavedSearch) -> set:
+    return set(SavedSearchMatch.objects.filter(saved_search=saved_search).values_list("advert__title", flat=True))
+
+
+def test_saving_a_search_twice_keeps_one(jobseeker):
+    saved_search, created = create_saved_search(jobseeker, " Python ", "", {"employment_type": ["Full Time"]})
+    again, created_again = create_saved_search(jobseeker, "Python", None, {"employment_type": ["Full Time"]})
+
+    assert created and not created_again
+    assert again == saved_search
+    assert saved_search.query == "keyword=Python&employment_type=Full+Time"
+    assert set(saved_search.terms.values_list("term", flat=True)) == {"python"}
+
+
+def test_saved_searches_are_limited(jobseeker, settings):
+    settings.SAVED_SEARCH_LIMIT = 2
+    create_saved_search(jobseeker, "python", "", {})
+    create_saved_search(jobseeker, "django", "", {})
+
+    with pytest.raises(SavedSearchLimitReached):
+        create_saved_search(jobseeker, "rust", "", {})
+    # Saving an existing search again is not a new one
+    assert create_saved_search(jobseeker, "python", "", {})[1] is False
+
+
+def test_match_adverts(jobseeker, advert):
+    keyword, _ = create_saved_search(jobseeker, "python engineer", "", {})
+    located, _ = create_saved_search(jobseeker, "", "abuja", {})
+    faceted, _ = create_saved_search(jobseeker, "engineer", "", {"employment_type": ["Contract"]})
+    skilled, _ = create_saved_search(jobseeker, "", "", {"skill": ["kubernetes"]})
+
+    match_adverts([
+        advert("Backend Engineer"),
+        advert("Data Analyst", skills="SQL", location="Abuja, Nigeria"),
+        advert("Platform Engineer", skills="Golang, K8s", employment_type="Contract"),
+        advert("Closed Engineer", deadline=fake.past_date()),
+    ])
+
+    assert matched(keyword) == {"Backend Engineer", "Platform Engineer"}
+    assert matched(located) == {"Data Analyst"}
+    assert matched(faceted) == {"Platform Engineer"}
+    assert matched(skilled) == {"Platform Engineer"}
+
+
+def test_matching_again_records_nothing_new(jobseeker, advert):
+    saved_search, _ = create_saved_search(jobseeker, "engineer", "", {})
+    adverts = [advert("Backend Engineer")]
+    match_adverts(adverts)
+    match_adverts(adverts)
+
+    assert SavedSearchMatch.objects.filter(saved_search=saved_search).count() == 1
+
+
+def test_matching_queries_do_not_grow_with_saved_searches(jobseeker, advert, django_assert_num_queries):
+    create_saved_search(jobseeker, "engineer", "", {})
+    for n in range(30):
+        user = User.objects.create(email=f"seeker{n}@example.com", role="jobseeker")
+        create_saved_search(user, f"unrelated{n}", "", {})
+    adverts = [advert(f"Engineer {n}") for n in range(5)]
+
+    # Aliases, the terms, the saved searches they index and the insert
+    with django_assert_num_queries(4):
+        assert match_adverts(adverts) == 5
+
+
+def test_saved_adverts_are_matched_on_commit(jobseeker, advert, settings, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    saved_search, _ = create_saved_search(jobseeker, "rust", "", {})
+
+    with django_capture_on_commit_callbacks(execute=True):
+        rust = advert("Rust Engineer", skills="Rust")
+
+    assert matched(saved_search) == {"Rust Engineer"}
+
+    # Saves that cannot change what the advert matches are not matched again
+    SavedSearchMatch.objects.all().delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        rust.save(update_fields=["updated_at"])
+    assert matched(saved_search) == set()
+
+
+def test_one_digest_per_user(jobseeker, advert, user_instance, settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    other = User.objects.create(email="other@example.com", role="jobseeker")
+    create_saved_search(jobseeker, "python", "", {})
+    create_saved_search(jobseeker, "engineer", "", {})
+    create_saved_search(other, "engineer", "", {})
+    closed = advert("Closing Engineer")
+    match_adverts([advert("Python Engineer"), advert("Python Developer"), closed])
+    closed.is_published = False
+    closed.save()
+
+    assert send_digests(batch_size=1) == 2
+
+    digests = {message.to[0]: message for message in mail.outbox}
+    assert set(digests) == {"seeker@example.com", "other@example.com"}
+    assert digests["seeker@example.com"].subject == "3 new jobs match your saved searches"
+    html = digests["seeker@example.com"].alternatives[0][0]
+    assert "Python Developer" in html and "Closing Engineer" not in html
+    assert not SavedSearchMatch.objects.filter(notified_at__isnull=True).exists()
+    assert send_digests() == 0
+
+
+def test_save_search_view(client: Client, jobseeker):
+    client.force_login(jobseeker)
+
+    response = client.post(f"{reverse('save_search')}?keyword=python&skill=Django")
+
+    assert response.status_code == 302
+    saved_search = SavedSearch.objects.get(user=jobseeker)
+    assert saved_search.filters == {"skill": ["django"]}
+    response = client.get(reverse("saved_searches"))
+    assert b"python" in response.content
+
+    client.post(reverse("delete_saved_search", args=[saved_search.pk]))
+    assert not SavedSearch.objects.exists()
+
+
+def test_saved_searches_are_private(client: Client, jobseeker):
+    saved_search, _ = create_saved_search(jobseeker, "python", "", {})
+    other = User.objects.create(email="other@example.com", role="jobseeker")
+    client.force_login(other)
+
+    response = client.post(reverse("delete_saved_search", args=[saved_search.pk]))
+
+    assert response.status_code == 404
+    assert SavedSearch.objects.filter(pk=saved_search.pk).exists()
@@ -0,0 +1,57 @@
+import pytest
+from django.core.management import call_command
+
+from application_tracking.models import SearchPosting
+from application_tracking.search import (DatabaseSearchBackend,
+                                         InvertedIndexSearchBackend, tokenize)
+
+from .factories import JobAdvertFactory, fake
+
+pytestmark = pytest.mark.django_db
+
+
+def test_tokenize():
+    assert tokenize("Senior C++ and Python Engineer, Node") == ["senior", "c++", "python", "engineer", "node"]
+    assert tokenize(None) == []
+
+
+def test_advert_is_indexed_on_save_and_removed_on_delete(user_instance):
+    advert = JobAdvertFactory(created_by=user_instance, title="Kotlin Developer")
+    assert SearchPosting.objects.filter(advert=advert, term="kotlin").exists()
+
+    advert.title = "Golang Developer"
+    advert.save()
+    assert not SearchPosting.objects.filter(advert=advert, term="kotlin").exists()
+    assert SearchPosting.objects.filter(advert=advert, term="golang").exists()
+
+    advert.delete()
+    assert not SearchPosting.objects.exists()
+
+
+def test_results_are_ranked_by_relevance(user_instance):
+    description_match = JobAdvertFactory(created_by=user_instance, title="Engineer", skills="Java",
+                                         description="We also use rust", deadline=fake.future_date())
+    title_match = JobAdvertFactory(created_by=user_instance, title="Rust Engineer", skills="Rust",
+                                   deadline=fake.future_date())
+    JobAdvertFactory(created_by=user_instance, title="Accountant", skills="Excel",
+                     deadline=fake.future_date())
+
+    results = InvertedIndexSearchBackend().search("rust", None)
+    assert len(results) == 2
+    assert [advert.pk for advert in results[0:2]] == [title_match.pk, description_match.pk]
+
+
+def test_search_matches_whole_terms_only(user_instance):
+    JobAdvertFactory(created_by=user_instance, title="Java Developer", deadline=fake.future_date())
+    JobAdvertFactory(created_by=user_instance, title="JavaScript Developer", deadline=fake.future_date())
+
+    assert len(InvertedIndexSearchBackend().search("java", None)) == 1
+    assert DatabaseSearchBackend().search("java", None).count() == 2
+
+
+def test_rebuild_search_index(user_instance):
+    JobAdvertFactory.create_batch(3, created_by=user_instance, title="Data Analyst")
+    SearchPosting.objects.all().delete()
+
+    call_command("rebuild_search_index")
+    assert SearchPosting.objects.filter(term="analyst").count() == 3
@@ -0,0 +1,114 @@
+import pytest
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from application_tracking.facets import filter_adverts
+from application_tracking.forms import JobAdvertForm
+from application_tracking.models import AdvertSkill, JobAdvert, Skill
+from application_tracking.search import DatabaseSearchBackend
+from application_tracking.skills import parse_skills, sync_all_advert_skills
+
+from .factories import JobAdvertFactory, fake
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def adverts(user_instance):
+    def advert(title, skills):
+        return JobAdvertFactory(created_by=user_instance, title=title, skills=skills, deadline=fake.future_date())
+
+    return [
+        advert("Backend Engineer", "Python, Django"),
+        advert("Compiler Engineer", "cpython-internals, C"),
+        advert("Platform Engineer", "Golang, K8s"),
+        advert("Data Engineer", "python3, kubernetes"),
+    ]
+
+
+def skill_names(advert: JobAdvert) -> set:
+    return set(advert.skill_tags.values_list("name", flat=True))
+
+
+def titles(response) -> set:
+    return {advert.title for advert in response.context["job_adverts"]}
+
+
+def test_parse_skills():
+    assert parse_skills(" Python,DJANGO ;; python\nMachine   Learning, ") == ["python", "django", "machine learning"]
+    assert parse_skills(None) == []
+
+
+def test_advert_form_stores_normalized_skills():
+    form = JobAdvertForm({"skills": "Python,  DJANGO, python"})
+    form.is_valid()
+    assert form.cleaned_data["skills"] == "python, django"
+
+    form = JobAdvertForm({"skills": " , ;"})
+    assert not form.is_valid()
+    assert form.errors["skills"] == ["Enter at least one skill."]
+
+
+def test_adverts_are_linked_to_canonical_skills(adverts):
+    assert skill_names(adverts[2]) == {"go", "kubernetes"}
+    assert skill_names(adverts[3]) == {"python", "kubernetes"}
+    assert Skill.objects.filter(name="python").get().adverts.count() == 2
+
+
+def test_changing_skills_relinks_the_advert(adverts):
+    adverts[0].skills = "Rust"
+    adverts[0].save()
+
+    assert skill_names(adverts[0]) == {"rust"}
+
+
+def test_saves_without_skills_leave_the_links(adverts):
+    with CaptureQueriesContext(connection) as queries:
+        adverts[0].save(update_fields=["title"])
+
+    assert not [query for query in queries if "advertskill" in query["sql"].lower()]
+
+
+@pytest.mark.parametrize("skill, expected", [
+    ("python", {"Backend Engineer", "Data Engineer"}),
+    ("Golang", {"Platform Engineer"}),
+    ("go", {"Platform Engineer"}),
+    ("haskell", set()),
+])
+def test_search_by_skill(client: Client, adverts, skill, expected):
+    response = client.get(reverse("search"), {"skill": skill})
+
+    assert titles(response) == expected
+
+
+def test_several_skills_must_all_match(client: Client, adverts):
+    response = client.get(reverse("search"), {"skill": ["k8s", "Python"]})
+
+    assert titles(response) == {"Data Engineer"}
+    skills = response.context["facets"][-1]["values"]
+    assert [(option["value"], option["count"]) for option in skills] == [("k8s", 1), ("python", 1)]
+    assert skills[1]["url"] == f"{reverse('search')}?skill=k8s"
+
+
+def test_skill_filter_is_an_equality_join():
+    sql = str(filter_adverts(JobAdvert.objects.all(), {"skill": ["python"]}).query)
+
+    assert "LIKE" not in sql.upper()
+
+
+def test_keyword_search_matches_whole_skills(adverts):
+    results = DatabaseSearchBackend().search("python", None)
+
+    assert {advert.title for advert in results} == {"Backend Engineer", "Data Engineer"}
+
+
+def test_backfill_links_every_advert(adverts, django_assert_max_num_queries):
+    AdvertSkill.objects.all().delete()
+
+    # A select and a link sync for each batch of two, and a final empty select
+    with django_assert_max_num_queries(17):
+        assert sync_all_advert_skills(batch_size=2) == 4
+
+    assert AdvertSkill.objects.count() == 8
@@ -4,12 +4,23 @@ from . import views
 urlpatterns = [
     path("", views.home, name="home"),  # <-- Add this for the home page
     path("search/", views.search, name="search"),
+    path("search/save/", views.save_search, name="save_search"),
+    path("saved-searches/", views.saved_searches, name="saved_searches"),
+    path("saved-searches/<uuid:saved_search_id>/delete/", views.delete_saved_search, name="delete_saved_search"),
     path("create/", views.create_advert, name="create_advert"),
+    path("import/", views.upload_adverts, name="import_adverts"),
     path("my-applications/", views.my_applications, name="my_applications"),
+    path("my-applications/history/", views.application_history, name="application_history"),
+    path("recommended/", views.recommended_jobs, name="recommended_jobs"),
     path("my-jobs/", views.my_jobs, name="my_jobs"),
+    path("my-jobs/history/", views.job_history, name="job_history"),
+    path("my-jobs/history/<uuid:advert_id>/applications/", views.archived_advert_applications,
+         name="archived_advert_applications"),
     path("<uuid:advert_id>/", views.get_advert, name="job_advert"),
     path("<uuid:advert_id>/apply/", views.apply, name="apply_for_job"),
     path("<uuid:advert_id>/applications/", views.advert_applications, name="advert_applications"),
+    path("<uuid:advert_id>/applications/decide/", views.bulk_decide, name="bulk_decide"),
+    path("<uuid:advert_id>/applications/export/", views.export_applications, name="export_applications"),
     path("<uuid:job_application_id>/decide/", views.decide, name="decide"),
     path("<uuid:advert_id>/update/", views.update_advert, name="update_advert"),
     path("<uuid:advert_id>/delete/", views.delete_advert, name="delete_advert"),
@@ -1,19 +1,32 @@
+import uuid
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django.http import HttpRequest, HttpResponseForbidden
-from django.shortcuts import get_object_or_404, redirect, render
+from django.http import HttpRequest, HttpResponseForbidden, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.conf import settings
+from django.core.files.storage import default_storage
 from django.utils import timezone
-from django.db.models import Q
+from django.db import IntegrityError, transaction
 from .decorators import employer_required, jobseeker_required
 
 
 from accounts.models import User
 from application_tracking.enums import ApplicationStatus
-from common.tasks import send_email
-
-from .forms import JobAdvertForm, JobApplicationForm
-from .models import JobAdvert, JobApplication
+from common.pagination import apaginate, paginate
+from common.tasks import send_email, send_email_batch
+
+from .cv_text import filter_applicants
+from .exports import CONTENT_TYPES, EXPORTERS, iter_applications
+from .facets import abuild_facets, facet_filters, facet_query
+from .forms import AdvertImportUploadForm, BulkDecisionForm, JobAdvertForm, JobApplicationForm
+from .imports import InvalidImportFile, detect_format, import_adverts, read_rows
+from .listing_cache import arender_listing
+from .models import (ArchivedJobAdvert, ArchivedJobApplication, CVBlob, JobAdvert, JobApplication, SavedSearch,
+                     normalize_email)
+from .recommendations import recommend_adverts
+from .saved_searches import SavedSearchLimitReached, create_saved_search
+from .tasks import extract_cv_text, import_adverts_file
 
 
 @employer_required
@@ -33,39 +46,75 @@ def create_advert(request: HttpRequest):
     }
     return render(request, "create_advert.html", context)
 
+
+
+@employer_required
+def upload_adverts(request: HttpRequest):
+    form = AdvertImportUploadForm(request.POST or None, request.FILES or None)
+    report = None
+    if form.is_valid():
+        upload = form.cleaned_data["file"]
+        import_format = detect_format(upload.name)
+        if upload.size > settings.ADVERT_IMPORT_SYNC_MAX_BYTES:
+            name = default_storage.save(f"imports/{uuid.uuid4()}.{import_format}", upload)
+            transaction.on_commit(lambda: import_adverts_file.delay(name, request.user.pk, import_format))
+            messages.success(request, "Your file is being imported. We will email you a report when it is done.")
+            return redirect("my_jobs")
+
+        try:
+            report = import_adverts(read_rows(upload.read(), import_format), request.user)
+        except InvalidImportFile as error:
+            form.add_error("file", str(error))
+        else:
+            messages.success(request, f"Imported {report['created']} of {report['total']} adverts.")
+
+    return render(request, "import_adverts.html", {"import_form": form, "report": report})
+
   
 
-def home(request: HttpRequest):
-    active_jobs = JobAdvert.objects.active()
-    paginator = Paginator(active_jobs, 10)
-    requested_page = request.GET.get("page")
-    paginated_adverts = paginator.get_page(requested_page)
-    context = {"job_adverts": paginated_adverts}
-    return render(request, "home.html", context)
+async def arender(request: HttpRequest, template_name: str, context: dict):
+    """
+    render() for async views. The user, and with it the session, is loaded
+    through the async API first, so neither the context processors nor the
+    templates touch the database from the event loop.
+    """
+    request.user = await request.auser()
+    return render(request, template_name, context)
+
+
+async def home(request: HttpRequest):
+    listing_html, paginated_adverts = await arender_listing(request, JobAdvert.objects.active)
+    context = {
+        "job_adverts": paginated_adverts,
+        "listing_html": listing_html,
+        "facets": await abuild_facets(request, None, None, {}),
+    }
+    return await arender(request, "home.html", context)
 
 
 
 
-def get_advert(request: HttpRequest, advert_id):
+async def get_advert(request: HttpRequest, advert_id):
     form = JobApplicationForm()
 
-    job_advert = get_object_or_404(JobAdvert, pk=advert_id)
+    job_advert = await aget_object_or_404(JobAdvert, pk=advert_id)
     context = {
         "job_advert": job_advert,
         "application_form": form,
     }
-    return render(request, "advert.html", context)
+    return await arender(request, "advert.html", context)
     
 @login_required
 def update_advert(request: HttpRequest, advert_id):
     advert: JobAdvert = get_object_or_404(JobAdvert, pk=advert_id)
-    if request.user != advert.created_by:
+    if request.user.pk != advert.created_by_id:
         return HttpResponseForbidden("You can only update an advert created by you.")
     
     form = JobAdvertForm(request.POST or None, instance=advert)
     if form.is_valid():
         instance: JobAdvert = form.save(commit=False)
-        instance.save()
+        # Leave the applicant counters alone; applications may have changed them since the advert was loaded
+        instance.save(update_fields=[*form.fields, "updated_at"])
         messages.success(request, "Advert updated successfully.")
         return redirect(instance.get_absolute_url())
     
@@ -79,7 +128,7 @@ def update_advert(request: HttpRequest, advert_id):
 @login_required
 def delete_advert(request: HttpRequest, advert_id):
     advert: JobAdvert = get_object_or_404(JobAdvert, pk=advert_id)
-    if request.user != advert.created_by:
+    if request.user.pk != advert.created_by_id:
         return HttpResponseForbidden("You can only update an advert created by you.")
     
     advert.delete()
@@ -94,14 +143,20 @@ def apply(request: HttpRequest, advert_id):
     if request.method == "POST":
         form = JobApplicationForm(request.POST, request.FILES)
         if form.is_valid():
-            email = form.cleaned_data["email"]
-            if advert.applications.filter(email__iexact=email).exists():
-                messages.error(request, "You have already applied for this position")
-                return redirect("job_advert", advert_id=advert_id)
-
             application: JobApplication = form.save(commit=False)
             application.job_advert = advert
-            application.save()
+            try:
+                with transaction.atomic():
+                    application.save()
+                    advert.record_application(application.status)
+                    transaction.on_commit(lambda: extract_cv_text.delay(application.pk))
+            except IntegrityError:
+                # The CV was stored before the insert failed; let garbage
+                # collection remove it unless another application uses it.
+                if application.cv.storage.owns(application.cv.name):
+                    CVBlob.track(application.cv.name, application.cv.size)
+                messages.error(request, "You have already applied for this position")
+                return redirect("job_advert", advert_id=advert_id)
             messages.success(request, "Application submitted successfully.")
             return redirect("job_advert", advert_id=advert_id)
     else:
@@ -116,28 +171,33 @@ def apply(request: HttpRequest, advert_id):
 
 
 @login_required
-def my_applications(request: HttpRequest):
-    user: User = request.user
-    applications = JobApplication.objects.filter(email=user.email)
-    paginator = Paginator(applications, 10)
-
-    requested_page = request.GET.get("page")
-    paginated_applications = paginator.get_page(requested_page)
+async def my_applications(request: HttpRequest):
+    user: User = await request.auser()
+    applications = JobApplication.objects.filter(email=normalize_email(user.email)).select_related("job_advert")
+    paginated_applications = await apaginate(request, applications, 10)
 
     context = {
         "my_applications": paginated_applications
     }
 
-    return render(request, "my_applications.html", context)
+    return await arender(request, "my_applications.html", context)
+
+
+@jobseeker_required
+def recommended_jobs(request: HttpRequest):
+    skills = request.GET.get("skills", "")
+    context = {
+        "job_adverts": recommend_adverts(request.user, skills),
+        "skills": skills,
+    }
+    return render(request, "recommended_jobs.html", context)
 
 
 @login_required
 def my_jobs(request: HttpRequest):
     user: User = request.user
     jobs = JobAdvert.objects.filter(created_by=user)
-    paginator = Paginator(jobs, 10)
-    requested_page = request.GET.get("page")
-    paginated_jobs = paginator.get_page(requested_page)
+    paginated_jobs = paginate(request, jobs, 10)
 
     context = {
         "my_jobs": paginated_jobs,
@@ -147,64 +207,222 @@ def my_jobs(request: HttpRequest):
     return render(request, "my_jobs.html",  context)
 
 
+@login_required
+def application_history(request: HttpRequest):
+    user: User = request.user
+    applications = ArchivedJobApplication.objects.filter(
+        email=normalize_email(user.email)
+    ).select_related("job_advert")
+    paginated_applications = paginate(request, applications, 10)
+
+    context = {
+        "my_applications": paginated_applications,
+        "retention_days": settings.ARCHIVE_RETENTION_DAYS,
+    }
+
+    return render(request, "application_history.html", context)
+
+
+@login_required
+def job_history(request: HttpRequest):
+    user: User = request.user
+    jobs = ArchivedJobAdvert.objects.filter(created_by=user)
+    paginated_jobs = paginate(request, jobs, 10)
+
+    context = {
+        "my_jobs": paginated_jobs,
+        "retention_days": settings.ARCHIVE_RETENTION_DAYS,
+    }
+
+    return render(request, "job_history.html", context)
+
+
+@login_required
+def archived_advert_applications(request: HttpRequest, advert_id):
+    advert: ArchivedJobAdvert = get_object_or_404(ArchivedJobAdvert, pk=advert_id)
+    if request.user.pk != advert.created_by_id:
+        return HttpResponseForbidden("You can only see applications for an advert created by you.")
+
+    paginated_applications = paginate(request, advert.applications.all(), 10)
+
+    context = {
+        "applications": paginated_applications,
+        "advert": advert,
+    }
+    return render(request, "archived_advert_applications.html", context)
+
+
 @login_required
 def advert_applications(request: HttpRequest, advert_id):
     advert: JobAdvert = get_object_or_404(JobAdvert, pk=advert_id)
-    if request.user != advert.created_by:
+    if request.user.pk != advert.created_by_id:
         return HttpResponseForbidden("You can only see applications for an advert created by you.")
     
-    applications = advert.applications.all()
+    keyword = request.GET.get("keyword")
+    applications = filter_applicants(advert, advert.applications.all(), keyword)
     #applications = JobApplication.objects.filter(job_advert=advert.id)
-    paginator = Paginator(applications, 10)
-    requested_page = request.GET.get("page")
-    paginated_applications = paginator.get_page(requested_page)
+    paginated_applications = paginate(request, applications, 10)
 
     context = {
         "applications": paginated_applications,
-        "advert":advert
+        "advert":advert,
+        "keyword": keyword or "",
     }
     return render(request, "advert_applications.html", context)
     
+@login_required
+def export_applications(request: HttpRequest, advert_id):
+    advert: JobAdvert = get_object_or_404(JobAdvert, pk=advert_id)
+    if request.user.pk != advert.created_by_id:
+        return HttpResponseForbidden("You can only export applications for an advert created by you.")
+
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORTERS:
+        messages.error(request, "Unsupported export format.")
+        return redirect("advert_applications", advert_id=advert.id)
+
+    response = StreamingHttpResponse(
+        EXPORTERS[export_format](iter_applications(advert)), content_type=CONTENT_TYPES[export_format]
+    )
+    response["Content-Disposition"] = f'attachment; filename="applications-{advert.id}.{export_format}"'
+    return response
+
+
+@login_required
+def bulk_decide(request: HttpRequest, advert_id):
+    advert: JobAdvert = get_object_or_404(JobAdvert, pk=advert_id)
+    if request.user.pk != advert.created_by_id:
+        return HttpResponseForbidden("You can only decide on an advert created by you.")
+
+    form = BulkDecisionForm(request.POST or None)
+    if request.method != "POST" or not form.is_valid():
+        messages.error(request, "Select applications and a valid status.")
+        return redirect("advert_applications", advert_id=advert.id)
+
+    status = form.cleaned_data["status"]
+    applications = advert.applications.filter(status=ApplicationStatus.APPLIED)
+    if not form.cleaned_data["all_applied"]:
+        applications = applications.filter(pk__in=form.cleaned_data["applications"])
+
+    with transaction.atomic():
+        # Lock the rows first so the notified applicants are exactly the updated ones
+        decided = list(applications.select_for_update().values_list("pk", "name", "email"))
+        JobApplication.objects.filter(pk__in=[pk for pk, _, _ in decided]).update(
+            status=status, updated_at=timezone.now()
+        )
+        advert.record_status_change(ApplicationStatus.APPLIED, status, count=len(decided))
+    messages.success(request, f"{len(decided)} applications updated to {status}")
+
+    if status == ApplicationStatus.REJECTED and decided:
+        send_email_batch.delay([
+            {
+                "subject": f"Application Outcome for {advert.title}",
+                "email_to": [email],
+                "html_template": "emails/job_application_update.html",
+                "context": {
+                    "applicant_name": name,
+                    "job_title": advert.title,
+                    "company_name": advert.company_name,
+                },
+            }
+            for _, name, email in decided
+        ])
+
+    return redirect("advert_applications", advert_id=advert.id)
+
+
 @login_required
 def decide(request: HttpRequest, job_application_id):
-    job_application: JobApplication = get_object_or_404(JobApplication, pk=job_application_id)
+    job_application: JobApplication = get_object_or_404(
+        JobApplication.objects.select_related("job_advert"), pk=job_application_id
+    )
+    advert: JobAdvert = job_application.job_advert
 
-    if request.user != job_application.job_advert.created_by:
+    if request.user.pk != advert.created_by_id:
         return HttpResponseForbidden("You can only decide on an advert created by you.")
     
     if request.method == "POST":
         status = request.POST.get("status")
-        job_application.status = status
-        job_application.save(update_fields=["status"])
+        if status not in ApplicationStatus.values:
+            messages.error(request, "Invalid application status.")
+            return redirect("advert_applications", advert_id=advert.id)
+
+        with transaction.atomic():
+            old_status = (
+                JobApplication.objects.select_for_update()
+                .values_list("status", flat=True)
+                .get(pk=job_application.pk)
+            )
+            job_application.status = status
+            job_application.save(update_fields=["status"])
+            advert.record_status_change(old_status, status)
         messages.success(request, f"Application status updated to {status}")
 
         if status == ApplicationStatus.REJECTED:
             context = {
                 "applicant_name":job_application.name,
-                "job_title":job_application.job_advert.title,
-                "company_name":job_application.job_advert.company_name,
+                "job_title":advert.title,
+                "company_name":advert.company_name,
             }
             send_email.delay(
-                f"Application Outcome for {job_application.job_advert.title}",
+                f"Application Outcome for {advert.title}",
                 [job_application.email],
                 "emails/job_application_update.html",
                 context
             )
         
-        return redirect("advert_applications", advert_id=job_application.job_advert.id)
+        return redirect("advert_applications", advert_id=advert.id)
 
 
-def search(request: HttpRequest):
+async def search(request: HttpRequest):
     keyword = request.GET.get("keyword")
     location = request.GET.get("location")
-    result = JobAdvert.objects.search(keyword, location)
-    paginator = Paginator(result, 10)
-    requested_page = request.GET.get("page")
-    paginated_adverts = paginator.get_page(requested_page)
+    filters = facet_filters(request.GET)
+    listing_html, paginated_adverts = await arender_listing(
+        request, lambda: JobAdvert.objects.asearch(keyword, location, filters), keyword, location,
+        facet_query(filters),
+    )
+
+    context = {
+        "job_adverts": paginated_adverts,
+        "listing_html": listing_html,
+        "facets": await abuild_facets(request, keyword, location, filters),
+        "can_save_search": True,
+    }
+    return await arender(request, "home.html", context)
 
+
+@jobseeker_required
+def save_search(request: HttpRequest):
+    if request.method != "POST":
+        return redirect("saved_searches")
+    try:
+        _, created = create_saved_search(
+            request.user, request.GET.get("keyword"), request.GET.get("location"), facet_filters(request.GET)
+        )
+    except SavedSearchLimitReached:
+        messages.error(request, f"You can save up to {settings.SAVED_SEARCH_LIMIT} searches.")
+        return redirect("saved_searches")
+    if created:
+        messages.success(request, "Search saved. New jobs matching it will be emailed to you daily.")
+    else:
+        messages.info(request, "You have already saved this search.")
+    return redirect("saved_searches")
+
+
+@jobseeker_required
+def saved_searches(request: HttpRequest):
     context = {
-        "job_adverts": paginated_adverts
+        "saved_searches": SavedSearch.objects.filter(user=request.user),
     }
-    return render(request, "home.html", context)
+    return render(request, "saved_searches.html", context)
+
+
+@jobseeker_required
+def delete_saved_search(request: HttpRequest, saved_search_id):
+    if request.method == "POST":
+        get_object_or_404(SavedSearch, pk=saved_search_id, user=request.user).delete()
+        messages.success(request, "Saved search deleted.")
+    return redirect("saved_searches")
 
 
@@ -0,0 +1,57 @@
+import json
+import statistics
+import time
+
+
+def time_calls(func, repeat: int) -> list[float]:
+    """Call func `repeat` times and return each duration in milliseconds"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def percentile(durations: list[float], pct: float) -> float:
+    ordered = sorted(durations)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(durations: list[float]) -> dict:
+    return {
+        "runs": len(durations),
+        "mean_ms": round(statistics.fmean(durations), 3),
+        "p50_ms": round(percentile(durations, 50), 3),
+        "p95_ms": round(percentile(durations, 95), 3),
+        "max_ms": round(max(durations), 3),
+    }
+
+
+def save_results(path: str, results: dict) -> None:
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> dict:
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def find_regressions(baseline: dict, current: dict, threshold: float, metrics=("p50_ms", "p95_ms")) -> list[str]:
+    """
+    Compare two {name: summary} mappings. A metric regresses when it grew by
+    more than threshold (0.2 = 20%); query counts regress on any increase.
+    """
+    regressions = []
+    for name, summary in current.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in metrics:
+            if previous[metric] and summary[metric] > previous[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {summary[metric]}")
+        if summary.get("queries", 0) > previous.get("queries", 0):
+            regressions.append(f"{name}: queries {previous.get('queries', 0)} -> {summary['queries']}")
+    return regressions
@@ -0,0 +1,97 @@
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class FailSafeCache:
+    """
+    A cache with every error logged and treated as a miss, so a Redis outage
+    falls back to the uncached path instead of failing requests.
+    """
+
+    def __init__(self, cache, name: str, fallback: str):
+        self.cache = cache
+        self.name = name
+        self.fallback = fallback
+
+    def _failed(self, method: str) -> None:
+        logger.warning("%s cache %s failed; %s", self.name, method, self.fallback, exc_info=True)
+
+    def _call(self, method: str, *args, default=None):
+        try:
+            return getattr(self.cache, method)(*args)
+        except Exception:
+            self._failed(method)
+            return default
+
+    async def _acall(self, method: str, *args, default=None):
+        try:
+            return await getattr(self.cache, method)(*args)
+        except Exception:
+            self._failed(method)
+            return default
+
+    def get(self, key, default=None):
+        return self._call("get", key, default, default=default)
+
+    def set(self, key, value, timeout):
+        self._call("set", key, value, timeout)
+
+    def delete(self, key):
+        self._call("delete", key)
+
+    def delete_many(self, keys):
+        self._call("delete_many", keys)
+
+    def __contains__(self, key):
+        return self._call("has_key", key, default=False)
+
+    def get_or_set(self, key, default, timeout):
+        return self._call("get_or_set", key, default, timeout)
+
+    def increment(self, key, delta: int = 1) -> int | None:
+        try:
+            return increment(key, delta, self.cache)
+        except Exception:
+            self._failed("incr")
+            return None
+
+    async def aget(self, key, default=None):
+        return await self._acall("aget", key, default, default=default)
+
+    async def aset(self, key, value, timeout):
+        await self._acall("aset", key, value, timeout)
+
+    async def adelete(self, key):
+        await self._acall("adelete", key)
+
+    async def aget_or_set(self, key, default, timeout):
+        return await self._acall("aget_or_set", key, default, timeout)
+
+    async def aincrement(self, key, delta: int = 1) -> int | None:
+        try:
+            return await aincrement(key, delta, self.cache)
+        except Exception:
+            self._failed("incr")
+            return None
+
+
+def increment(key: str, delta: int = 1, cache=cache) -> int:
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        # incr() refuses missing keys; add() is a no-op if another worker won the race
+        if cache.add(key, delta, timeout=None):
+            return delta
+        return cache.incr(key, delta)
+
+
+async def aincrement(key: str, delta: int = 1, cache=cache) -> int:
+    try:
+        return await cache.aincr(key, delta)
+    except ValueError:
+        if await cache.aadd(key, delta, timeout=None):
+            return delta
+        return await cache.aincr(key, delta)
@@ -0,0 +1,70 @@
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from .query_budget import QueryRecorder
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the queries each request runs and log a warning when a request
+    goes over QUERY_BUDGET_MAX_QUERIES or repeats a query shape at least
+    QUERY_BUDGET_N_PLUS_ONE_THRESHOLD times. Only active when
+    QUERY_BUDGET_ENABLED is set, which defaults to DEBUG.
+
+    Under ASGI it runs async so async views are not pushed into a thread.
+    The async ORM runs queries in the request's thread sensitive thread, so
+    the recorder is installed on that thread's connections.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled():
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self.check_budget(request, response, recorder)
+
+    async def __acall__(self, request):
+        if not self.enabled():
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        await sync_to_async(recorder.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recorder.__exit__)(None, None, None)
+        return self.check_budget(request, response, recorder)
+
+    def enabled(self) -> bool:
+        return getattr(settings, "QUERY_BUDGET_ENABLED", settings.DEBUG)
+
+    def check_budget(self, request, response, recorder: QueryRecorder):
+        max_queries = getattr(settings, "QUERY_BUDGET_MAX_QUERIES", 20)
+        threshold = getattr(settings, "QUERY_BUDGET_N_PLUS_ONE_THRESHOLD", 3)
+        repeated = recorder.repeated_shapes(threshold)
+
+        if len(recorder) > max_queries or repeated:
+            logger.warning(
+                "Query budget exceeded for %s %s\n%s",
+                request.method,
+                request.path,
+                recorder.report(threshold),
+            )
+
+        response["X-Query-Count"] = str(len(recorder))
+        return response
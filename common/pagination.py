@@ -0,0 +1,149 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+
+
+class CursorPage:
+    """
+    A page of results from CursorPaginator. Links to the neighbouring pages
+    are opaque cursor tokens instead of page numbers.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset pagination on (created_at, id), newest first, matching the
+    default ordering of our models. Each page is a single indexed range
+    query of per_page + 1 rows: there is no OFFSET and no COUNT(*), so the
+    cost of a page does not depend on how deep it is.
+
+    The leading created_at <= cursor condition is redundant logically but
+    gives the database a plain range to seek on the (created_at, id) index.
+    """
+
+    NEXT = "n"
+    PREVIOUS = "p"
+
+    def __init__(self, queryset: QuerySet, per_page: int):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def encode_cursor(self, direction: str, obj) -> str:
+        payload = json.dumps([direction, obj.created_at.isoformat(), str(obj.pk)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str):
+        """Return (direction, created_at, pk), or None for a missing or malformed cursor"""
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            direction, created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+            created_at = parse_datetime(created_at)
+            pk = self.queryset.model._meta.pk.to_python(pk)
+        except (ValueError, TypeError, ValidationError):
+            return None
+        if direction not in (self.NEXT, self.PREVIOUS) or created_at is None or pk is None:
+            return None
+        return direction, created_at, pk
+
+    def page_query(self, decoded) -> QuerySet:
+        """The query for per_page + 1 rows of the page a decoded cursor points at"""
+        limit = self.per_page + 1
+        if decoded is None:
+            return self.queryset.order_by("-created_at", "-pk")[:limit]
+
+        direction, created_at, pk = decoded
+        if direction == self.NEXT:
+            return self.queryset.filter(
+                Q(created_at__lte=created_at), Q(created_at__lt=created_at) | Q(pk__lt=pk)
+            ).order_by("-created_at", "-pk")[:limit]
+        return self.queryset.filter(
+            Q(created_at__gte=created_at), Q(created_at__gt=created_at) | Q(pk__gt=pk)
+        ).order_by("created_at", "pk")[:limit]
+
+    def get_page(self, cursor: str | None) -> CursorPage:
+        decoded = self.decode_cursor(cursor)
+        return self._page_from_rows(list(self.page_query(decoded)), decoded)
+
+    async def aget_page(self, cursor: str | None) -> CursorPage:
+        decoded = self.decode_cursor(cursor)
+        return self._page_from_rows([row async for row in self.page_query(decoded)], decoded)
+
+    def _page_from_rows(self, rows: list, decoded) -> CursorPage:
+        has_more = len(rows) > self.per_page
+        if decoded is None:
+            return self._build_page(rows[:self.per_page], has_next=has_more, has_previous=False)
+        if decoded[0] == self.NEXT:
+            return self._build_page(rows[:self.per_page], has_next=has_more, has_previous=True)
+        # Rows before the cursor were fetched oldest first
+        return self._build_page(rows[:self.per_page][::-1], has_next=True, has_previous=has_more)
+
+    def _build_page(self, rows, has_next: bool, has_previous: bool) -> CursorPage:
+        next_cursor = self.encode_cursor(self.NEXT, rows[-1]) if has_next and rows else None
+        previous_cursor = self.encode_cursor(self.PREVIOUS, rows[0]) if has_previous and rows else None
+        return CursorPage(rows, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+
+def paginate(request, object_list, per_page: int = 10):
+    """
+    Paginate a listing using the mode set by PAGINATION_MODE. Ranked search
+    results are not ordered by (created_at, id) and always use page numbers.
+    """
+    if getattr(settings, "PAGINATION_MODE", "offset") == "cursor" and isinstance(object_list, QuerySet):
+        return CursorPaginator(object_list, per_page).get_page(request.GET.get("cursor"))
+    return Paginator(object_list, per_page).get_page(request.GET.get("page"))
+
+
+async def apaginate(request, object_list, per_page: int = 10):
+    """
+    paginate() for async views. object_list is a QuerySet or an object with
+    acount() and aslice(start, stop), like SearchResults; the page's rows
+    are fetched up front so rendering it runs no queries.
+    """
+    if getattr(settings, "PAGINATION_MODE", "offset") == "cursor" and isinstance(object_list, QuerySet):
+        return await CursorPaginator(object_list, per_page).aget_page(request.GET.get("cursor"))
+
+    paginator = Paginator(object_list, per_page)
+    paginator.count = await object_list.acount()
+    try:
+        number = paginator.validate_number(request.GET.get("page"))
+    except PageNotAnInteger:
+        number = 1
+    except EmptyPage:
+        number = paginator.num_pages
+
+    start = (number - 1) * per_page
+    if isinstance(object_list, QuerySet):
+        rows = [row async for row in object_list[start:start + per_page]]
+    else:
+        rows = await object_list.aslice(start, start + per_page)
+    return Page(rows, number, paginator)
@@ -0,0 +1,113 @@
+import re
+import sys
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+IN_CLAUSE_PATTERN = re.compile(r"\(\s*%s(?:\s*,\s*%s)+\s*\)")
+
+# Our own instrumentation is never the interesting frame
+IGNORED_FILES = frozenset([__file__, str(Path(__file__).with_name("middleware.py"))])
+
+
+@dataclass
+class RecordedQuery:
+    sql: str
+    shape: str
+    params: tuple
+    duration_ms: float
+    location: str
+
+
+def query_shape(sql: str) -> str:
+    """SQL with placeholders only; IN lists of any length collapse to one shape"""
+    return IN_CLAUSE_PATTERN.sub("(%s...)", sql)
+
+
+def find_location() -> str:
+    """
+    Where the query came from: the template line being rendered if there is
+    one, otherwise the innermost frame in project code, otherwise the
+    innermost framework frame.
+    """
+    base_dir = str(Path(settings.BASE_DIR))
+    code_location = framework_location = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_name == "render_annotated":
+            node = frame.f_locals.get("self")
+            origin = getattr(node, "origin", None)
+            token = getattr(node, "token", None)
+            if origin is not None and token is not None:
+                return f"{origin.template_name}:{token.lineno}"
+
+        filename = frame.f_code.co_filename
+        if filename not in IGNORED_FILES:
+            location = f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+            if framework_location is None:
+                framework_location = location
+            if code_location is None and filename.startswith(base_dir) and "site-packages" not in filename:
+                code_location = f"{Path(filename).relative_to(base_dir)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return code_location or framework_location or "unknown"
+
+
+class QueryRecorder:
+    """
+    Record every query run on any database connection while active.
+
+        with QueryRecorder() as recorder:
+            client.get(url)
+        recorder.repeated_shapes(threshold=3)
+    """
+
+    def __init__(self):
+        self.queries: list[RecordedQuery] = []
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                RecordedQuery(
+                    sql=sql,
+                    shape=query_shape(sql),
+                    params=tuple(params or ()) if not many else (),
+                    duration_ms=(time.perf_counter() - start) * 1000,
+                    location=find_location(),
+                )
+            )
+
+    def __len__(self):
+        return len(self.queries)
+
+    def repeated_shapes(self, threshold: int) -> dict[str, list[RecordedQuery]]:
+        """Query shapes run at least `threshold` times, the usual sign of an N+1"""
+        by_shape = defaultdict(list)
+        for query in self.queries:
+            by_shape[query.shape].append(query)
+        return {shape: queries for shape, queries in by_shape.items() if len(queries) >= threshold}
+
+    def report(self, threshold: int) -> str:
+        lines = [f"{len(self)} queries"]
+        for shape, queries in self.repeated_shapes(threshold).items():
+            locations = sorted({query.location for query in queries})
+            lines.append(f"  {len(queries)}x {shape}")
+            lines.extend(f"      at {location}" for location in locations)
+        return "\n".join(lines)
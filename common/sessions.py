@@ -0,0 +1,35 @@
+from asgiref.sync import sync_to_async
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.utils import timezone
+
+from .cache import FailSafeCache
+
+SWEEP_BATCH_SIZE = 1000
+
+
+class SessionStore(CachedDBStore):
+    """
+    Sessions read from SESSION_CACHE_ALIAS (Redis) and written through to the
+    database, which serves reads whenever the cache misses or is down.
+    Cached copies expire with the session; clear_expired() sweeps the table.
+    """
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._cache = FailSafeCache(self._cache, "Session", "using the database")
+
+    @classmethod
+    def clear_expired(cls, batch_size: int = SWEEP_BATCH_SIZE) -> int:
+        """Delete expired rows batch_size at a time so the sweep never holds long locks"""
+        model = cls.get_model_class()
+        expired = model.objects.filter(expire_date__lt=timezone.now())
+        swept = 0
+        while True:
+            keys = list(expired.values_list("session_key", flat=True)[:batch_size])
+            if not keys:
+                return swept
+            swept += model.objects.filter(session_key__in=keys).delete()[0]
+
+    @classmethod
+    async def aclear_expired(cls, batch_size: int = SWEEP_BATCH_SIZE) -> int:
+        return await sync_to_async(cls.clear_expired)(batch_size)
@@ -0,0 +1,67 @@
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Store every file under the SHA-256 digest of its content, e.g.
+    cv/ab/cd/abcd...ef.pdf. Uploads are hashed while they are streamed to a
+    temporary file, so identical uploads end up as a single file on disk.
+    Callers are responsible for reference counting before deleting a file.
+    """
+
+    def __init__(self, prefix: str = "", **kwargs):
+        self.prefix = prefix.strip("/")
+        super().__init__(**kwargs)
+
+    def get_available_name(self, name, max_length=None):
+        # Names are derived from content in _save(); an existing file with
+        # the same digest is the same file, never a clash.
+        return name
+
+    def owns(self, name: str) -> bool:
+        """Whether name is a content-addressed name from this storage"""
+        prefix = f"{re.escape(self.prefix)}/" if self.prefix else ""
+        return bool(name) and re.fullmatch(rf"{prefix}[0-9a-f]{{2}}/[0-9a-f]{{2}}/[0-9a-f]{{64}}(\.\w+)?", name) is not None
+
+    def digest_name(self, digest: str, original_name: str) -> str:
+        extension = os.path.splitext(original_name)[1].lower()[:10]
+        parts = [self.prefix, digest[:2], digest[2:4], f"{digest}{extension}"]
+        return "/".join(part for part in parts if part)
+
+    def _save(self, name, content):
+        temp_dir = os.path.join(self.location, self.prefix, "tmp")
+        os.makedirs(temp_dir, exist_ok=True)
+
+        hasher = hashlib.sha256()
+        with tempfile.NamedTemporaryFile(dir=temp_dir, delete=False) as temp_file:
+            if hasattr(content, "seek"):
+                content.seek(0)
+            for chunk in content.chunks():
+                hasher.update(chunk)
+                temp_file.write(chunk)
+
+        final_name = self.digest_name(hasher.hexdigest(), name)
+        final_path = self.path(final_name)
+        if os.path.exists(final_path):
+            os.remove(temp_file.name)
+            # Refresh the mtime so garbage collection leaves a blob that is
+            # being referenced again alone
+            os.utime(final_path)
+            return final_name
+
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(temp_file.name, final_path)
+        if self.file_permissions_mode is not None:
+            os.chmod(final_path, self.file_permissions_mode)
+        return final_name
+
+
+def cv_storage() -> ContentAddressedStorage:
+    return ContentAddressedStorage(prefix="cv")
@@ -1,17 +1,65 @@
+import logging
+import time
+from functools import lru_cache
+from importlib import import_module
+
 from celery import shared_task
-from django.core.mail import EmailMultiAlternatives
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import get_template
 
 EMAIL_FROM = "suhanashaikh358@gmail.com"
+EMAIL_BATCH_SIZE = 100
 
-@shared_task
-def send_email(subject: str, email_to: list[str], html_template, context):
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=64)
+def get_email_template(name: str):
+    """Compiled email template, looked up through the loaders once per process"""
+    return get_template(name)
+
+
+def build_email(subject: str, email_to: list[str], html_template, context, connection=None) -> EmailMultiAlternatives:
     msg = EmailMultiAlternatives(
-        subject=subject, from_email=EMAIL_FROM, to=email_to
+        subject=subject, from_email=EMAIL_FROM, to=email_to, connection=connection
     )
-    html_template = get_template(html_template)
-    html_alternative = html_template.render(context)
-    print("Rendered Email HTML:\n", html_alternative)  # Debug output to console/logs
+    html_alternative = get_email_template(html_template).render(context)
+    logger.debug("Rendered %s for %s", html_template, email_to)
     msg.attach_alternative(html_alternative, "text/html")
+    return msg
 
-    msg.send(fail_silently=False)
+
+@shared_task
+def send_email(subject: str, email_to: list[str], html_template, context):
+    build_email(subject, email_to, html_template, context).send(fail_silently=False)
+
+
+@shared_task
+def send_email_batch(emails: list[dict], batch_size: int = EMAIL_BATCH_SIZE) -> dict:
+    """
+    Send many emails over a single SMTP connection. Each item holds the
+    arguments of send_email: subject, email_to, html_template and context.
+    Returns how many were sent and how long each batch took, in ms.
+    """
+    sent = 0
+    timings = []
+    with get_connection(fail_silently=False) as connection:
+        for start in range(0, len(emails), batch_size):
+            started = time.perf_counter()
+            batch = [build_email(connection=connection, **email) for email in emails[start:start + batch_size]]
+            sent += connection.send_messages(batch) or 0
+            timings.append(round((time.perf_counter() - started) * 1000, 2))
+            logger.info("Sent batch of %s emails in %.1f ms", len(batch), timings[-1])
+
+    return {"sent": sent, "batch_timings_ms": timings}
+
+
+@shared_task
+def clear_expired_sessions() -> int:
+    """Sweep expired sessions from the database; the cached copies expire on their own"""
+    engine = import_module(settings.SESSION_ENGINE)
+    swept = engine.SessionStore.clear_expired()
+    if swept:
+        logger.info("Cleared %s expired sessions", swept)
+    return swept
@@ -1,8 +1,32 @@
+from contextlib import contextmanager
+
 import pytest
 from django.contrib.auth.hashers import make_password
+from django.core.cache import cache, caches
 from django.test.client import Client
+from fakeredis import FakeConnection
 
 from accounts.models import User
+from common.query_budget import QueryRecorder
+
+
+@pytest.fixture(autouse=True)
+def local_cache(settings):
+    """
+    Keep tests off Redis and start every test with empty caches. Sessions
+    go through django-redis to an in-process fake Redis server.
+    """
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "sessions": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+            "KEY_PREFIX": "sessions",
+            "OPTIONS": {"CONNECTION_POOL_KWARGS": {"connection_class": FakeConnection}},
+        },
+    }
+    cache.clear()
+    caches["sessions"].clear()
 
 
 @pytest.fixture
@@ -30,3 +54,32 @@ def authenticate_user_client(
     """Authenticate a client"""
     client.login(email=user_instance.email, password=auth_user_password)
     return client, user_instance
+
+
+@pytest.fixture
+def employer_client(client: Client, db) -> tuple[Client, User]:
+    """A client logged in as a freshly created employer"""
+    employer = User.objects.create(email="employer@example.com", role="employer")
+    client.force_login(employer)
+    return client, employer
+
+
+@pytest.fixture
+def query_budget(db):
+    """
+    Fail the test if the block runs more than max_queries queries or
+    repeats a query shape n_plus_one_threshold times or more.
+    """
+
+    @contextmanager
+    def budget(max_queries: int, n_plus_one_threshold: int = 3):
+        with QueryRecorder() as recorder:
+            yield recorder
+
+        if len(recorder) > max_queries or recorder.repeated_shapes(n_plus_one_threshold):
+            pytest.fail(
+                f"Query budget of {max_queries} exceeded\n{recorder.report(n_plus_one_threshold)}",
+                pytrace=False,
+            )
+
+    return budget
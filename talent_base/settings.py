@@ -55,12 +55,14 @@ AUTH_USER_MODEL = "accounts.User"
 LOGIN_URL = "/auth/login/"
 
 MIDDLEWARE = [
+    'common.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'accounts.middleware.PasswordHashingOverloadedMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -89,17 +91,64 @@ WSGI_APPLICATION = 'talent_base.wsgi.application'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': config("DB_NAME"), 
-        'USER': config("DB_USER"),      
-        'PASSWORD': config("DB_PASSWORD"),  
-        'HOST': config("DB_HOST"),   
-        'PORT': config("DB_PORT"),       
+# Set DB_ENGINE=sqlite to run locally (e.g. benchmarks) without a MySQL server
+DB_ENGINE = config("DB_ENGINE", default="mysql")
+
+if DB_ENGINE == "sqlite":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.mysql',
+            'NAME': config("DB_NAME"), 
+            'USER': config("DB_USER"),      
+            'PASSWORD': config("DB_PASSWORD"),  
+            'HOST': config("DB_HOST"),   
+            'PORT': config("DB_PORT"),       
+        }
     }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": config("REDIS_CACHE_URL", default="redis://localhost:6379/1"),
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        },
+    },
+    "sessions": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": config("REDIS_CACHE_URL", default="redis://localhost:6379/1"),
+        "KEY_PREFIX": "sessions",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        },
+    },
 }
 
+# SESSIONS AND USER SNAPSHOTS
+# Sessions are read from the "sessions" cache and written through to the
+# database, which serves them whenever Redis misses or is down. Expired rows
+# are swept hourly by Celery beat.
+# request.user is built from a cached snapshot of the user (id, email, role,
+# flags) for up to USER_SNAPSHOT_TIMEOUT seconds; saving, deleting or
+# updating a User through the ORM drops its snapshot.
+SESSION_ENGINE = "common.sessions"
+SESSION_CACHE_ALIAS = "sessions"
+USER_SNAPSHOT_TIMEOUT = 15 * 60
+
+# Seconds a rendered page of the home/search listing stays cached
+LISTING_CACHE_TIMEOUT = 5 * 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -120,6 +169,24 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# PASSWORD HASHING
+# At most PASSWORD_HASHING_CONCURRENCY PBKDF2 hashes run at once per process,
+# so an auth storm cannot occupy every request worker. Up to
+# PASSWORD_HASHING_MAX_PENDING more requests wait for a turn; the rest get a
+# 503 asking them to retry after PASSWORD_HASHING_RETRY_AFTER seconds.
+# 0 does not limit hashing.
+PASSWORD_HASHERS = [
+    "accounts.hashing.LimitedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_HASHING_CONCURRENCY = config("PASSWORD_HASHING_CONCURRENCY", default=2, cast=int)
+PASSWORD_HASHING_MAX_PENDING = config("PASSWORD_HASHING_MAX_PENDING", default=8, cast=int)
+PASSWORD_HASHING_RETRY_AFTER = 5
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -144,6 +211,10 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static")
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# CVs are stored once per distinct content; unreferenced ones are only
+# garbage collected after this many seconds
+CV_BLOB_GRACE_PERIOD = 60 * 60
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -165,4 +236,76 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TASK_SERIALIZER = "json"
 
 CELERY_BROKER_URL = "redis://localhost:6379/0"
-CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
\ No newline at end of file
+CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
+
+CELERY_TASK_ROUTES = {
+    "application_tracking.tasks.extract_cv_text": {"queue": "cv_extraction"},
+}
+
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-applicant-counters": {
+        "task": "application_tracking.tasks.reconcile_applicant_counters",
+        "schedule": 60 * 60,
+    },
+    "collect-unreferenced-cvs": {
+        "task": "application_tracking.tasks.collect_unreferenced_cvs",
+        "schedule": 24 * 60 * 60,
+    },
+    "purge-expired-tokens": {
+        "task": "accounts.tasks.purge_expired_tokens",
+        "schedule": 60 * 60,
+    },
+    "clear-expired-sessions": {
+        "task": "common.tasks.clear_expired_sessions",
+        "schedule": 60 * 60,
+    },
+    "archive-expired-adverts": {
+        "task": "application_tracking.tasks.archive_expired_adverts",
+        "schedule": 24 * 60 * 60,
+    },
+    "send-saved-search-digests": {
+        "task": "application_tracking.tasks.send_saved_search_digests",
+        "schedule": 24 * 60 * 60,
+    },
+}
+
+# ARCHIVE
+# Days after its deadline an advert and its applications move to the archive
+# tables, where they stay readable from the job and application history pages.
+ARCHIVE_RETENTION_DAYS = 90
+
+# QUERY BUDGET
+# Log requests that run too many queries or repeat a query shape (N+1).
+QUERY_BUDGET_ENABLED = DEBUG
+QUERY_BUDGET_MAX_QUERIES = 20
+QUERY_BUDGET_N_PLUS_ONE_THRESHOLD = 3
+
+# SEARCH
+# Use "application_tracking.search.DatabaseSearchBackend" for plain icontains matching.
+SEARCH_BACKEND = "application_tracking.search.InvertedIndexSearchBackend"
+
+# PAGINATION
+# "offset" shows numbered pages; "cursor" uses keyset pagination on
+# (created_at, id), which skips the COUNT(*) and stays fast on deep pages.
+PAGINATION_MODE = "offset"
+
+# ADVERT IMPORT
+# Feeds up to this size are imported during the upload request; larger ones
+# are handed to a Celery task that emails the owner a report.
+ADVERT_IMPORT_SYNC_MAX_BYTES = 256 * 1024
+
+# RECOMMENDATIONS
+# Each process keeps the open adverts in memory as skill and title vectors.
+# It reloads the adverts changed since its last check at most every
+# RECOMMENDATIONS_REFRESH_INTERVAL seconds and rebuilds the whole matrix
+# every RECOMMENDATIONS_REBUILD_INTERVAL seconds. Builds run on a background
+# thread; until the first one is ready, no jobs are recommended.
+RECOMMENDATIONS_LIMIT = 10
+RECOMMENDATIONS_REFRESH_INTERVAL = 30
+RECOMMENDATIONS_REBUILD_INTERVAL = 60 * 60
+RECOMMENDATIONS_BUILD_IN_BACKGROUND = True
+
+# SAVED SEARCHES
+# Adverts matching a saved search are collected as they are posted or edited
+# and emailed to each user in one daily digest, see CELERY_BEAT_SCHEDULE.
+SAVED_SEARCH_LIMIT = 20